@@ -0,0 +1,290 @@
+"""
+benchmark.py
+============
+A runnable benchmark suite for the pipeline, so a change that makes part
+generation, validation or export slower (or a change meant to make it
+faster) shows up as a number instead of a feeling.
+
+Every workload is synthetic and parameterised -- nothing is downloaded,
+nothing needs a GPU -- and sized by one knob each:
+
+    sdf_tree         sdf_core smooth-union tree of `depth`, meshed at
+                     `resolution` (sdf_to_mesh)
+    csg_plate        csg_core plate with `holes` drilled holes
+    mesh_checks      mesh_utils.check_watertight + mass_properties on a
+                     sphere of `faces` triangles
+    fk / sweep /     forward_kinematics, sweep_test (root joint),
+    clearance /      static_clearance_check and export_model on `chain`
+    export           and `tree` assemblies of `links` links
+
+Each case records its best wall time over --repeat runs and the peak
+Python-heap allocation (tracemalloc, numpy buffers included) of one extra
+run -- traced separately, because tracing slows the timed runs down.
+
+    python benchmark.py                         # full suite -> stdout
+    python benchmark.py --quick --out base.json # small sizes, save baseline
+    python benchmark.py --compare base.json     # re-run, diff vs baseline
+
+--compare exits non-zero if any case got slower than --threshold times
+its baseline, so it can gate a change. --only runs the cases whose name
+contains any of the given substrings.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import trimesh
+
+import csg_core as csg
+import sdf_core as sdf
+import mesh_utils
+import kinematics as kin
+import physics_validate as pv
+import gazebo_export as ge
+
+
+# ---------------------------------------------------------------------------
+# Synthetic workloads -- each builder returns the zero-argument callable to
+# time; building it (fixtures, assemblies) is not part of the measurement.
+# ---------------------------------------------------------------------------
+
+def _sdf_tree(depth: int):
+    """Binary tree of capsules, each branch smooth-unioned onto its parent
+    -- `depth` levels, 2**depth - 1 capsules."""
+    parts = []
+
+    def grow(base, direction, length, radius, level):
+        tip = base + direction * length
+        parts.append(sdf.sd_capsule(base, tip, radius))
+        if level + 1 < depth:
+            for sign in (-1.0, 1.0):
+                turn = np.array([sign * 0.5, 0.0, 0.0]) if level % 2 == 0 else np.array([0.0, sign * 0.5, 0.0])
+                d = direction + turn
+                grow(tip, d / np.linalg.norm(d), length * 0.7, radius * 0.75, level + 1)
+
+    grow(np.zeros(3), np.array([0.0, 0.0, 1.0]), 0.4, 0.06, 0)
+    fn = parts[0]
+    for part in parts[1:]:
+        fn = sdf.op_smooth_union(fn, part, k=0.03)
+    return fn
+
+
+def bench_sdf_tree(depth: int, resolution: float):
+    fn = _sdf_tree(depth)
+    bounds = ((-0.8, -0.8, -0.2), (0.8, 0.8, 1.4))
+    return lambda: sdf.sdf_to_mesh(fn, bounds, resolution, name=f"tree_d{depth}")
+
+
+def bench_csg_plate(holes: int):
+    side = int(np.ceil(np.sqrt(holes)))
+    pitch = 0.9 / side
+    centres = [(-0.45 + pitch * (i % side + 0.5), -0.45 + pitch * (i // side + 0.5)) for i in range(holes)]
+
+    def run():
+        plate = csg.box((1.0, 1.0, 0.05))
+        drills = [csg.translate(csg.cylinder(0.1, pitch * 0.3, segments=32), (x, y, 0.0))
+                  for x, y in centres]
+        return csg.to_trimesh(csg.subtract(plate, csg.union(*drills)))
+    return run
+
+
+def bench_mesh_checks(faces: int):
+    subdivisions = max(0, int(np.ceil(np.log(faces / 20) / np.log(4))))
+    mesh = trimesh.creation.icosphere(subdivisions=subdivisions, radius=0.1)
+
+    def run():
+        mesh._cache.clear()   # time the checks, not trimesh's memoised answers
+        mesh_utils.check_watertight(mesh, "sphere")
+        return mesh_utils.mass_properties(mesh)
+    return run, len(mesh.faces)
+
+
+def _assembly(shape: str, links: int) -> kin.Assembly:
+    """A `chain` (each link on the last, alternating hinge axes) or a
+    `tree` (binary branching from a base plate) of `links` links."""
+    asm = kin.Assembly(f"{shape}{links}")
+    asm.add_link(kin.Link("base", csg.to_trimesh(csg.box((0.3, 0.3, 0.05)))), is_root=True)
+    segment = csg.to_trimesh(csg.translate(csg.cylinder(0.12, 0.015, segments=24), (0.0, 0.0, 0.07)))
+    for i in range(1, links):
+        if shape == "chain":
+            parent, origin = ("base", (0, 0, 0.025)) if i == 1 else (f"l{i - 1}", (0, 0, 0.14))
+        else:
+            p = (i - 1) // 2
+            parent = "base" if p == 0 else f"l{p}"
+            spread = 0.1 if p == 0 else 0.03
+            origin = ((-1) ** i * spread, 0.0, 0.025 if p == 0 else 0.14)
+        asm.add_link(kin.Link(f"l{i}", segment.copy()))
+        asm.add_joint(kin.Joint(f"j{i}", parent, f"l{i}", "revolute", origin_xyz=origin,
+                                axis=(0, 1, 0) if i % 2 else (1, 0, 0), lower=-0.6, upper=0.6))
+    return asm
+
+
+def _cold(asm: kin.Assembly):
+    """Drop per-link caches so every timed run pays for them again."""
+    for link in asm.links.values():
+        link._sdf_cache = None
+        link._hull_cache = None
+        link._mass_cache = None
+
+
+def bench_fk(shape: str, links: int):
+    asm = _assembly(shape, links)
+    act = {j.name: 0.3 for j in asm.movable_joints()}
+    return lambda: [asm.forward_kinematics(act) for _ in range(100)]
+
+
+def bench_sweep(shape: str, links: int):
+    asm = _assembly(shape, links)
+    root_joint = asm.movable_joints()[0].name
+
+    def run():
+        _cold(asm)
+        return pv.sweep_test(asm, root_joint)
+    return run
+
+
+def bench_clearance(shape: str, links: int):
+    asm = _assembly(shape, links)
+
+    def run():
+        _cold(asm)
+        return pv.static_clearance_check(asm)
+    return run
+
+
+def bench_export(shape: str, links: int):
+    asm = _assembly(shape, links)
+
+    def run():
+        _cold(asm)
+        # A fresh directory per run, removed again -- timing the cleanup
+        # in place of export_model's own rmtree of the previous run's model.
+        with tempfile.TemporaryDirectory(prefix="mda-bench-") as out:
+            ge.export_model(asm, out, validation_cache=False)
+    return run
+
+
+def cases(quick: bool = False) -> list:
+    """[(name, params, builder)] for the whole suite; builder() -> the
+    callable to time (or (callable, extra params))."""
+    depths, resolution = ((3, 4), 0.03) if quick else ((3, 4, 5), 0.02)
+    holes = (4, 16) if quick else (4, 16, 64)
+    faces = (1_280, 20_480) if quick else (1_280, 20_480, 327_680)
+    sizes = (5, 15) if quick else (5, 15, 40)
+    out = []
+    for d in depths:
+        out.append((f"sdf_tree/depth={d}", {"depth": d, "resolution": resolution},
+                    lambda d=d: bench_sdf_tree(d, resolution)))
+    out.append((f"sdf_tree/resolution={resolution / 2:g}", {"depth": depths[0], "resolution": resolution / 2},
+                lambda: bench_sdf_tree(depths[0], resolution / 2)))
+    for h in holes:
+        out.append((f"csg_plate/holes={h}", {"holes": h}, lambda h=h: bench_csg_plate(h)))
+    for f in faces:
+        out.append((f"mesh_checks/faces={f}", {"faces": f}, lambda f=f: bench_mesh_checks(f)))
+    for shape in ("chain", "tree"):
+        for n in sizes:
+            params = {"shape": shape, "links": n}
+            out.append((f"fk/{shape}/links={n}", dict(params, calls=100), lambda s=shape, n=n: bench_fk(s, n)))
+            out.append((f"sweep/{shape}/links={n}", params, lambda s=shape, n=n: bench_sweep(s, n)))
+            out.append((f"clearance/{shape}/links={n}", params, lambda s=shape, n=n: bench_clearance(s, n)))
+            out.append((f"export/{shape}/links={n}", params, lambda s=shape, n=n: bench_export(s, n)))
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Measurement and reporting
+# ---------------------------------------------------------------------------
+
+def measure(fn, repeat: int = 3) -> dict:
+    fn()   # warm-up: lazy imports and first-touch allocations aren't the workload
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"wall_s": min(times), "peak_mb": peak / 2**20}
+
+
+def run_suite(quick=False, repeat=3, only=None, log=print) -> dict:
+    results = {}
+    for name, params, builder in cases(quick):
+        if only and not any(o in name for o in only):
+            continue
+        built = builder()
+        fn, extra = (built if isinstance(built, tuple) else (built, None))
+        if extra is not None:
+            params = dict(params, actual_faces=extra)
+        res = dict(measure(fn, repeat), params=params)
+        results[name] = res
+        log(f"{name:32s} {res['wall_s'] * 1e3:10.1f} ms {res['peak_mb']:9.1f} MB")
+    return {"meta": _environment(quick, repeat), "results": results}
+
+
+def _environment(quick: bool, repeat: int) -> dict:
+    return {"python": platform.python_version(), "numpy": np.__version__,
+            "trimesh": trimesh.__version__, "platform": platform.platform(),
+            "cpus": os.cpu_count(), "quick": quick, "repeat": repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def compare(baseline: dict, current: dict, threshold: float = 1.25, log=print) -> list:
+    """Print current vs baseline per case; return the names of cases whose
+    wall time grew by more than `threshold`x."""
+    regressed = []
+    log(f"{'case':32s} {'base ms':>10s} {'now ms':>10s} {'ratio':>7s} {'base MB':>9s} {'now MB':>9s}")
+    for name, now in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            log(f"{name:32s} {'-':>10s} {now['wall_s'] * 1e3:10.1f}      (new)")
+            continue
+        ratio = now["wall_s"] / base["wall_s"] if base["wall_s"] > 0 else float("inf")
+        flag = "  SLOWER" if ratio > threshold else ("  faster" if ratio < 1 / threshold else "")
+        log(f"{name:32s} {base['wall_s'] * 1e3:10.1f} {now['wall_s'] * 1e3:10.1f} {ratio:7.2f} "
+            f"{base['peak_mb']:9.1f} {now['peak_mb']:9.1f}{flag}")
+        if ratio > threshold:
+            regressed.append(name)
+    return regressed
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0],
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--quick", action="store_true", help="smaller sizes (seconds, not minutes)")
+    ap.add_argument("--repeat", type=int, default=3, help="timed runs per case (best is kept)")
+    ap.add_argument("--only", nargs="*", help="run only cases whose name contains one of these")
+    ap.add_argument("--out", help="write results as a JSON baseline to this path")
+    ap.add_argument("--compare", help="baseline JSON to compare against")
+    ap.add_argument("--threshold", type=float, default=1.25,
+                    help="slowdown ratio that counts as a regression in --compare (default 1.25)")
+    args = ap.parse_args(argv)
+
+    current = run_suite(args.quick, args.repeat, args.only)
+    if args.out:
+        with open(args.out, "w") as fh:
+            json.dump(current, fh, indent=2)
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        print()
+        regressed = compare(baseline, current, args.threshold)
+        if regressed:
+            print(f"\n{len(regressed)} case(s) slower than {args.threshold}x baseline: {', '.join(regressed)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -30,6 +30,8 @@ import numpy as np
 import trimesh
 import manifold3d as m3d
 
+import profiling
+
 
 class CSGError(RuntimeError):
     pass
@@ -92,6 +94,7 @@ def polygon_revolve(points_2d, segments=96, revolve_degrees=360.0):
     return _check(man, "polygon_revolve")
 
 
+@profiling.profiled()
 def hull(*manifolds):
     """Convex hull of one or more manifolds -- occasionally the fastest
     correct way to build a simplified COLLISION geometry for a visually
@@ -102,10 +105,20 @@ def hull(*manifolds):
     return _check(m3d.Manifold.batch_hull(list(manifolds)), "hull")
 
 
+def split_by_plane(man, normal, offset):
+    """Cut a manifold in two along the plane normal . x == offset -> (the
+    part on the side `normal` points to, the rest). Both halves come back
+    closed (the cut face is capped) -- e.g. mesh_utils.fit_collision_proxy
+    splits a part this way into pieces whose hulls fit it more tightly."""
+    above, below = man.split_by_plane(tuple(float(c) for c in normal), float(offset))
+    return _check(above, "split_by_plane"), _check(below, "split_by_plane")
+
+
 # ---------------------------------------------------------------------------
 # Boolean combinators
 # ---------------------------------------------------------------------------
 
+@profiling.profiled()
 def union(*manifolds):
     out = manifolds[0]
     for m in manifolds[1:]:
@@ -113,11 +126,13 @@ def union(*manifolds):
     return _check(out, "union")
 
 
+@profiling.profiled()
 def subtract(a, b):
     """a with b's volume removed."""
     return _check(a - b, "subtract")
 
 
+@profiling.profiled()
 def intersect(a, b):
     return _check(a ^ b, "intersect")
 
@@ -146,6 +161,7 @@ def place(man, xyz=(0, 0, 0), rot_deg=(0, 0, 0)):
 # and interop with the sdf_core.py organic pipeline)
 # ---------------------------------------------------------------------------
 
+@profiling.profiled()
 def to_trimesh(man) -> trimesh.Trimesh:
     mesh = man.to_mesh()
     verts = np.asarray(mesh.vert_properties)[:, :3]
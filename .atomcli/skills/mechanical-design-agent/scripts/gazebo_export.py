@@ -12,7 +12,8 @@ and write it out as a standard Gazebo model directory:
             <link_a>.stl
             <link_b>.stl
             ...
-        VALIDATION.txt        (physics_validate.full_report output)
+        VALIDATION.txt        (physics_validate.full_report output + per-link cost)
+        cost_report.json      (the same per-link cost, machine-readable)
 
 This directory is "plug and play": drop it in ~/.gazebo/models/ (or add its
 parent to GAZEBO_MODEL_PATH) and `<include><uri>model://model_name</uri>
@@ -37,14 +38,24 @@ and raises GazeboExportError rather than writing a model a physics engine
 will choke on.
 """
 from __future__ import annotations
+import hashlib
+import io
+import json
 import os
 import shutil
+import struct
+import threading
+import time
 import xml.etree.ElementTree as ET
-import xml.dom.minidom as minidom
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
+import trimesh
 
 import kinematics as kin
 import mesh_utils
 import physics_validate as pv
+import profiling
 
 
 class GazeboExportError(RuntimeError):
@@ -60,9 +71,47 @@ _JOINT_TYPE_MAP = {
 }
 
 
+def _escape(data: str) -> str:
+    return data.replace("&", "&amp;").replace("<", "&lt;").replace('"', "&quot;").replace(">", "&gt;")
+
+
+def _write_pretty(elem, fh, indent: str = "") -> None:
+    """Stream `elem` to `fh` as indented XML in one pass over the tree --
+    exactly what minidom's toprettyxml(indent="  ") makes of
+    ET.tostring(elem) (the same escaping, text-only elements on one line,
+    childless ones self-closed, an empty text counting as none), without
+    serialising the tree to a string and parsing it back first. Like
+    minidom's parser, namespace declarations go before other attributes."""
+    fh.write(f"{indent}<{elem.tag}")
+    for name, value in sorted(elem.attrib.items(), key=lambda kv: not kv[0].startswith("xmlns")):
+        fh.write(f' {name}="{_escape(value)}"')
+    children = list(elem)
+    if not children:
+        if elem.text:
+            fh.write(f">{_escape(elem.text)}</{elem.tag}>\n")
+        else:
+            fh.write("/>\n")
+        return
+    fh.write(">\n")
+    inner = indent + "  "
+    if elem.text:
+        fh.write(f"{_escape(inner + elem.text)}\n")
+    for child in children:
+        _write_pretty(child, fh, inner)
+        if child.tail:
+            fh.write(f"{_escape(inner + child.tail)}\n")
+    fh.write(f"{indent}</{elem.tag}>\n")
+
+
+def _write_document(elem, fh) -> None:
+    fh.write('<?xml version="1.0" ?>\n')
+    _write_pretty(elem, fh)
+
+
 def _pretty(elem) -> str:
-    rough = ET.tostring(elem, encoding="unicode")
-    return minidom.parseString(rough).toprettyxml(indent="  ")
+    buf = io.StringIO()
+    _write_document(elem, buf)
+    return buf.getvalue()
 
 
 def _add_inertial(link_elem, mass_props: dict):
@@ -88,22 +137,133 @@ def _add_geometry(parent_elem, mesh_uri: str, scale=(1, 1, 1)):
     ET.SubElement(mesh_el, "scale").text = f"{scale[0]} {scale[1]} {scale[2]}"
 
 
-def _add_link(model_elem, link: kin.Link, model_name: str):
+# Per-link limits export_model(budgets=...) checks LinkCost against by
+# default; pass a dict to override any of them (None disables one).
+DEFAULT_BUDGETS = {
+    "triangles": 200_000,             # visual triangles, as exported
+    "mesh_bytes": 16 * 2**20,         # mesh files written for the link
+    "collision_triangles": 20_000,    # triangles the contact solver sees
+    "contact_cost": 20_000,           # see LinkCost
+}
+
+
+@dataclass
+class LinkCost:
+    """What one link will cost the simulator, as exported. `contact_cost`
+    is a rough count of the features a narrow phase walks per contact
+    query: 1 for an SDF primitive, the vertex count of each convex hull
+    (support-function scans), the triangle count of a collision mesh.
+    `mesh_bytes` is estimated from the mesh sizes (exact for STL) and is
+    0 for a link sharing another's files (see mesh_utils.congruent_meshes)."""
+    name: str
+    triangles: int
+    mesh_bytes: int
+    collision_kind: str
+    collision_geoms: int
+    collision_triangles: int
+    contact_cost: int
+    decimated: float = None           # visual face ratio applied to fit the budget
+    over: list = field(default_factory=list)   # names of the budgets exceeded
+
+    def __str__(self):
+        status = "OVER" if self.over else " OK "
+        dec = f", visual decimated to {self.decimated:.2g}" if self.decimated else ""
+        over = f" -- over budget: {', '.join(self.over)}" if self.over else ""
+        return (f"[{status}] {self.name}: {self.triangles} tris, {self.mesh_bytes / 2**20:.2f} MB, "
+                f"collision {self.collision_kind} ({self.collision_geoms} geom, "
+                f"{self.collision_triangles} tris), contact cost {self.contact_cost}{dec}{over}")
+
+
+def _pose_text(T) -> str:
+    x, y, z = np.asarray(T)[:3, 3] + 0.0
+    rr, rp, ry = np.asarray(trimesh.transformations.euler_from_matrix(T, "sxyz")) + 0.0
+    return f"{x:.8g} {y:.8g} {z:.8g} {rr:.8g} {rp:.8g} {ry:.8g}"
+
+
+def _collision_mesh_name(link_name: str, i: int) -> str:
+    return f"{link_name}_collision_{i}.stl"
+
+
+def _visual_mesh_name(link_name: str, file_type: str = "stl", level: int = None,
+                      decimated: bool = False) -> str:
+    if level is not None:
+        return f"{link_name}_lod{level}.{file_type}"
+    return f"{link_name}_decimated.{file_type}" if decimated else f"{link_name}.{file_type}"
+
+
+# Namespace of the extension elements model.sdf carries beyond standard
+# SDFormat (SDFormat ignores custom elements whose prefix is declared).
+_MDA_NS = "urn:mechanical-design-agent"
+
+
+def _add_collision(link_elem, link: kin.Link, model_name: str, proxy=None, shared=None):
+    """<collision> element(s) for `link`: its own STL, or the
+    mesh_utils.CollisionProxy fitted for it -- an SDF primitive posed in
+    the link frame, or one <collision> per hull mesh. `shared` is the
+    (source link, T) the link's mesh is shared from, see _add_link; the
+    proxy is then the source's, moved by T."""
+    source, T = shared or (link.name, None)
+    if proxy is None or proxy.kind == "mesh":
+        collision = ET.SubElement(link_elem, "collision", name=f"{link.name}_collision")
+        if T is not None:
+            ET.SubElement(collision, "pose").text = _pose_text(T)
+        _add_geometry(collision, f"model://{model_name}/meshes/{source}.stl")
+        return
+    if proxy.kind in ("hull", "decomposition"):
+        for i in range(len(proxy.meshes)):
+            collision = ET.SubElement(link_elem, "collision", name=f"{link.name}_collision_{i}")
+            if T is not None:
+                ET.SubElement(collision, "pose").text = _pose_text(T)
+            _add_geometry(collision, f"model://{model_name}/meshes/{_collision_mesh_name(source, i)}")
+        return
+    collision = ET.SubElement(link_elem, "collision", name=f"{link.name}_collision")
+    ET.SubElement(collision, "pose").text = _pose_text(proxy.pose if T is None else T @ proxy.pose)
+    geometry = ET.SubElement(collision, "geometry")
+    shape = ET.SubElement(geometry, proxy.kind)
+    if proxy.kind == "sphere":
+        ET.SubElement(shape, "radius").text = f"{proxy.size[0]:.8g}"
+    elif proxy.kind == "box":
+        ET.SubElement(shape, "size").text = " ".join(f"{e:.8g}" for e in proxy.size)
+    elif proxy.kind == "cylinder":
+        ET.SubElement(shape, "radius").text = f"{proxy.size[0]:.8g}"
+        ET.SubElement(shape, "length").text = f"{proxy.size[1]:.8g}"
+    else:
+        raise GazeboExportError(f"Unknown collision proxy kind '{proxy.kind}' on link '{link.name}'")
+
+
+def _add_link(model_elem, link: kin.Link, model_name: str, proxy=None, shared=None,
+              visual_format: str = "stl", lod: tuple = None, visual_lod: int = 0,
+              decimated: float = None):
+    """<link> element for `link`. `shared` = (source link name, T) points
+    the visual/collision at the source link's mesh file instead of the
+    link's own, posed by T (None: the meshes are identical as they stand)
+    -- see mesh_utils.congruent_meshes. With `lod` (face ratios of the
+    exported detail levels) the visual uses level `visual_lod`, recorded
+    in an <mda:lod> element; `decimated` (a face ratio the budget check
+    cut the visual to, see export_model) goes in <mda:decimated>."""
     link_elem = ET.SubElement(model_elem, "link", name=link.name)
     ET.SubElement(link_elem, "self_collide").text = "true" if link.self_collide else "false"
 
     _add_inertial(link_elem, link.mass_props())
 
+    source, T = shared or (link.name, None)
     visual = ET.SubElement(link_elem, "visual", name=f"{link.name}_visual")
-    _add_geometry(visual, f"model://{model_name}/meshes/{link.name}.stl")
+    if T is not None:
+        ET.SubElement(visual, "pose").text = _pose_text(T)
+    _add_geometry(visual, f"model://{model_name}/meshes/"
+                          f"{_visual_mesh_name(source, visual_format, visual_lod if lod else None, bool(decimated))}")
+    if lod:
+        ET.SubElement(visual, "mda:lod", level=str(visual_lod), ratio=f"{lod[visual_lod]:.8g}",
+                      levels=" ".join(f"{r:.8g}" for r in lod))
+    if decimated:
+        ET.SubElement(visual, "mda:decimated", ratio=f"{decimated:.8g}")
     material = ET.SubElement(visual, "material")
     ambient = ET.SubElement(material, "ambient")
     r, g, b = link.color
     ambient.text = f"{r} {g} {b} 1"
     ET.SubElement(material, "diffuse").text = f"{r} {g} {b} 1"
 
-    collision = ET.SubElement(link_elem, "collision", name=f"{link.name}_collision")
-    _add_geometry(collision, f"model://{model_name}/meshes/{link.name}.stl")
+    _add_collision(link_elem, link, model_name, proxy, shared)
 
 
 def _add_joint(model_elem, joint: kin.Joint):
@@ -141,21 +301,49 @@ def _add_joint(model_elem, joint: kin.Joint):
         ET.SubElement(plugin, "gear_ratio").text = f"{joint.gear_ratio if joint.gear_ratio is not None else 1.0:.8g}"
 
 
-def build_sdf_xml(assembly: kin.Assembly, model_name: str) -> str:
+def build_sdf_xml(assembly: kin.Assembly, model_name: str, proxies: dict = None,
+                  shared: dict = None, visual_format: str = "stl", lod: tuple = None,
+                  visual_lod: int = 0, decimated: dict = None) -> str:
+    """model.sdf text -- see _sdf_element for the arguments."""
+    return _pretty(_sdf_element(assembly, model_name, proxies, shared, visual_format, lod, visual_lod,
+                                decimated))
+
+
+def _sdf_element(assembly: kin.Assembly, model_name: str, proxies: dict = None,
+                 shared: dict = None, visual_format: str = "stl", lod: tuple = None,
+                 visual_lod: int = 0, decimated: dict = None):
+    """The model.sdf element tree. `proxies` maps link name -> mesh_utils.CollisionProxy
+    for links that collide through a proxy instead of their own STL.
+    `shared` maps link name -> (source link name, T) for links whose mesh
+    is another link's, moved by T (mesh_utils.congruent_meshes); they
+    reference the source's mesh (and proxy) files. `visual_format`, `lod`,
+    `visual_lod` and `decimated` (link name -> visual face ratio) pick the
+    visual mesh files, see export_model."""
+    proxies = proxies or {}
+    shared = shared or {}
+    decimated = decimated or {}
     sdf = ET.Element("sdf", version="1.9")
+    if lod or decimated:
+        sdf.set("xmlns:mda", _MDA_NS)
     model = ET.SubElement(sdf, "model", name=model_name)
     ET.SubElement(model, "static").text = "false"
 
     for link in assembly.links.values():
-        _add_link(model, link, model_name)
+        source = shared.get(link.name, (link.name, None))[0]
+        _add_link(model, link, model_name, proxies.get(source), shared.get(link.name),
+                  visual_format, lod, visual_lod, decimated.get(source))
     for joint in assembly.joints.values():
         _add_joint(model, joint)
-
-    return _pretty(sdf)
+    return sdf
 
 
 def build_model_config(model_name: str, description: str, author: str = "mechanical-design-agent",
                         email: str = "n/a", version: str = "1.0") -> str:
+    return _pretty(_model_config_element(model_name, description, author, email, version))
+
+
+def _model_config_element(model_name: str, description: str, author: str = "mechanical-design-agent",
+                          email: str = "n/a", version: str = "1.0"):
     cfg = ET.Element("model")
     ET.SubElement(cfg, "name").text = model_name
     ET.SubElement(cfg, "version").text = version
@@ -165,11 +353,18 @@ def build_model_config(model_name: str, description: str, author: str = "mechani
     ET.SubElement(author_el, "name").text = author
     ET.SubElement(author_el, "email").text = email
     ET.SubElement(cfg, "description").text = description
-    return _pretty(cfg)
+    return cfg
 
 
+@profiling.profiled()
 def export_model(assembly: kin.Assembly, output_dir: str, description: str = "",
-                  skip_validation: bool = False, joint_sweep_kwargs: dict = None) -> str:
+                  skip_validation: bool = False, joint_sweep_kwargs: dict = None,
+                  validation_workers: int = None, validation_cache=False,
+                  validation: "pv.ValidationResult" = None, incremental: bool = False,
+                  collision: str = "mesh", collision_tolerance: float = 0.05,
+                  dedupe: bool = True, visual_format: str = "stl", lod=None,
+                  visual_lod: int = 0, mesh_cache: str = None, budgets: dict = None,
+                  over_budget: str = "warn") -> str:
     """Write the full plug-and-play Gazebo model directory for `assembly`
     under `output_dir/<assembly.name>/`. Returns that directory's path.
 
@@ -178,16 +373,117 @@ def export_model(assembly: kin.Assembly, output_dir: str, description: str = "",
     -- this is a deliberate speed bump, not a formality: a non-watertight
     STL silently corrupts collision/inertia in every downstream physics
     step and is far cheaper to catch here than in a running simulation.
+
+    `validation` is a physics_validate.validate() result the caller already
+    has. While it still matches the assembly's fingerprint (no link mesh,
+    density or joint changed since) and was run with the settings this
+    export would validate with (`joint_sweep_kwargs`, the default config
+    space sweep), its watertightness verdicts and report are used as-is
+    -- VALIDATION.txt is its report -- and nothing is re-validated; any
+    other one is ignored.
+
+    validation_workers is passed to physics_validate.validate as
+    `workers` -- for a many-joint robot the validation pass dominates
+    export time, and its checks parallelise across processes.
+    validation_cache keeps the results between exports, so re-exporting
+    after a small edit only re-runs the checks that edit could affect:
+    True keeps them in `output_dir/.<assembly.name>.validation_cache.json`,
+    beside the model directory rather than in it, and a directory path
+    keeps them there as `<assembly.name>.validation_cache.json`. Off by
+    default, so a plain export leaves nothing behind but the model.
+
+    By default the model directory is deleted and rewritten. With
+    incremental=True it is updated in place instead: every file is keyed
+    by a hash of its inputs (see _export_keys), recorded in
+    `output_dir/.<assembly.name>.export_manifest.json`, and only files
+    whose key changed (or that went missing) are regenerated -- an
+    unchanged link's STL isn't even re-encoded, and an unchanged assembly
+    isn't re-validated. Files of links that no longer exist are removed.
+    Only incremental exports write (and read) the manifest; a plain
+    export removes any it finds, since it no longer matches the files.
+
+    collision="proxy" gives each link a lightweight collision geometry
+    instead of its full render mesh (mesh_utils.fit_collision_proxy with
+    `collision_tolerance` as the allowed volume excess): an SDF sphere,
+    box or cylinder where one fits, else hull STLs under
+    meshes/<link>_collision_<i>.stl, else the mesh itself. Contact
+    solvers are far faster on primitives and convex hulls than on
+    triangle soups; the visual keeps the full mesh either way.
+
+    With dedupe (the default), links whose meshes are the same geometry
+    -- identical, or one a rigidly moved copy of another, like the four
+    wheels of a rover (mesh_utils.congruent_meshes) -- share a single
+    STL: only the first is written, the others reference it under a
+    <pose> in their visual/collision, and its mass properties (and
+    collision proxy) are computed once and moved into place rather than
+    recomputed per link.
+
+    visual_format="obj" or "glb" writes the visual meshes as indexed OBJ
+    or binary glTF (mesh_utils.export_mesh) -- a GLB is about a third of
+    the STL's size, which matters for large sdf_core organic parts. `lod`
+    is a sequence of face ratios, e.g. (1.0, 0.25, 0.05): every link's
+    visual is then written once per level, mesh_utils.decimate'd to that
+    ratio, as meshes/<link>_lod<i>.<format>, and the visual uses level
+    `visual_lod` -- recorded on it as <mda:lod level= ratio= levels=>.
+    Collision and inertia always use the full mesh; the full STL is
+    written whenever a collision references it.
+
+    Every link's simulation cost (LinkCost: visual triangles, mesh file
+    bytes, collision geometry and an estimated contact cost) is checked
+    against `budgets` (DEFAULT_BUDGETS, updated with any given). It is
+    appended to VALIDATION.txt and written as cost_report.json in the
+    model directory. over_budget="warn" only reports links over budget;
+    "fail" raises GazeboExportError before anything is written;
+    "decimate" first cuts over-budget visuals down to fit
+    (mesh_utils.decimate, written as meshes/<link>_decimated.<format>)
+    gives links whose collision mesh is over budget a collision proxy
+    (see collision="proxy"), with hulls simplified to the collision
+    budgets (mesh_utils.simplify_hull), then fails on whatever is still
+    over.
+
+    `mesh_cache` is a directory shared between exports (export_variants
+    passes one to every variant): links' mass properties, convex hulls
+    and signed-distance grids are kept there by link fingerprint, fitted
+    collision proxies by their key, and every mesh file is written there
+    once under its content key and hard-linked into the model -- a link
+    that recurs unchanged across exports is neither recomputed nor
+    re-encoded.
+
+    Every file is written to a temporary name and renamed into place, so
+    a reader (Gazebo, a model cache) never sees a half-written one, and
+    the writes go to a thread pool as soon as the links pass, overlapping
+    with building the SDF/config XML and with validation.
     """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if collision not in ("mesh", "proxy"):
+        raise GazeboExportError(f"collision must be 'mesh' or 'proxy', got '{collision}'")
+    if visual_format not in ("stl", "obj", "glb"):
+        raise GazeboExportError(f"visual_format must be 'stl', 'obj' or 'glb', got '{visual_format}'")
+    if lod is not None:
+        lod = tuple(float(r) for r in lod)
+        if not lod or not all(0.0 < r <= 1.0 for r in lod) or not 0 <= visual_lod < len(lod):
+            raise GazeboExportError(f"lod must be face ratios in (0, 1] with visual_lod indexing one "
+                                    f"of them, got lod={lod}, visual_lod={visual_lod}")
+    if over_budget not in ("warn", "fail", "decimate"):
+        raise GazeboExportError(f"over_budget must be 'warn', 'fail' or 'decimate', got '{over_budget}'")
+    budgets = dict(DEFAULT_BUDGETS, **(budgets or {}))
     model_name = assembly.name
     model_dir = os.path.join(output_dir, model_name)
     meshes_dir = os.path.join(model_dir, "meshes")
-    if os.path.exists(model_dir):
-        shutil.rmtree(model_dir)
-    os.makedirs(meshes_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, f".{model_name}.export_manifest.json")
+    if validation is not None and not validation.matches(assembly, joint_sweep_kwargs):
+        validation = None
+    if mesh_cache is not None:
+        os.makedirs(mesh_cache, exist_ok=True)
+        _load_link_caches(assembly, mesh_cache)
 
     bad = []
     for name, link in assembly.links.items():
+        if validation is not None:
+            if not validation.watertight[name] and not skip_validation:
+                bad.append(f"[FAIL] {name}: not watertight (per the supplied validation)")
+            continue
         report = mesh_utils.check_watertight(link.mesh, name)
         if not report.is_watertight and not skip_validation:
             bad.append(str(report))
@@ -198,24 +494,696 @@ def export_model(assembly: kin.Assembly, output_dir: str, description: str = "",
             "skip_validation=True to override at your own risk):\n" + "\n".join(bad)
         )
 
-    for name, link in assembly.links.items():
-        mesh_utils.export_stl(link.mesh, os.path.join(meshes_dir, f"{name}.stl"))
+    manifest = {}
+    if incremental:
+        try:
+            with open(manifest_path) as fh:
+                manifest = json.load(fh)
+        except (OSError, ValueError):
+            manifest = {}
+    previous = manifest.get("files", {})
+
+    shared = _shared_meshes(assembly) if dedupe else {}
+    sources = [name for name in assembly.links if name not in shared]
+    limits = (budgets["collision_triangles"], budgets["contact_cost"]) if over_budget == "decimate" else None
+    proxies = _collision_proxies(assembly, model_dir, collision_tolerance, manifest.get("proxies", {}),
+                                 sources, mesh_cache, limits) if collision == "proxy" else {}
+    decimated = {}
+    files = _mesh_files(assembly, shared, proxies, visual_format, lod, decimated)
+    costs = _link_costs(assembly, shared, proxies, files, lod, visual_lod, decimated, budgets)
+    if over_budget == "decimate" and any(c.over for c in costs.values()):
+        decimated, refit = _fit_budgets(assembly, shared, costs, budgets)
+        proxies.update(_collision_proxies(assembly, model_dir, collision_tolerance,
+                                          manifest.get("proxies", {}), refit, mesh_cache, limits))
+        files = _mesh_files(assembly, shared, proxies, visual_format, lod, decimated)
+        costs = _link_costs(assembly, shared, proxies, files, lod, visual_lod, decimated, budgets)
+    over = [str(c) for c in costs.values() if c.over]
+    if over and over_budget != "warn":
+        raise GazeboExportError("Refusing to export -- the following links are over their simulation "
+                                "cost budget (raise `budgets`, simplify the geometry, or pass "
+                                "over_budget=\"warn\"):\n" + "\n".join(over))
+    cost_report = {"budgets": budgets, "over_budget": over_budget,
+                   "links": {name: asdict(c) for name, c in costs.items()},
+                   "total": {k: sum(getattr(c, k) for c in costs.values())
+                             for k in ("triangles", "mesh_bytes", "collision_triangles", "contact_cost")}}
+    keys = _export_keys(assembly, description, joint_sweep_kwargs or {}, proxies, shared, files,
+                        (visual_format, lod, visual_lod, decimated), cost_report)
+
+    if not incremental and os.path.exists(model_dir):
+        shutil.rmtree(model_dir)
+    os.makedirs(meshes_dir, exist_ok=True)
+
+    def stale(rel):
+        return previous.get(rel) != keys[rel] or not os.path.exists(os.path.join(model_dir, rel))
+
+    with profiling.stage("write"), ThreadPoolExecutor() as pool:
+        writes = [pool.submit(_write_mesh, assembly.links[name].mesh, os.path.join(model_dir, rel),
+                              file_type, ratio, mesh_cache, keys[rel])
+                  for rel, (name, file_type, ratio) in files.items() if stale(rel)]
+        for name, (_, proxy) in proxies.items():
+            for i, piece in enumerate(proxy.meshes):
+                rel = f"meshes/{_collision_mesh_name(name, i)}"
+                if stale(rel):
+                    writes.append(pool.submit(_write_mesh, piece, os.path.join(model_dir, rel),
+                                              "stl", None, mesh_cache, keys[rel]))
+        if stale("model.sdf"):
+            writes.append(pool.submit(_write_xml, os.path.join(model_dir, "model.sdf"),
+                                      _sdf_element(assembly, model_name,
+                                                   {n: p for n, (_, p) in proxies.items()}, shared,
+                                                   visual_format, lod, visual_lod, decimated)))
+        if stale("model.config"):
+            writes.append(pool.submit(_write_xml, os.path.join(model_dir, "model.config"),
+                                      _model_config_element(model_name, description)))
+        if stale("cost_report.json"):
+            writes.append(pool.submit(_write_text, os.path.join(model_dir, "cost_report.json"),
+                                      json.dumps(cost_report, indent=1)))
 
-    with open(os.path.join(model_dir, "model.sdf"), "w") as fh:
-        fh.write(build_sdf_xml(assembly, model_name))
-    with open(os.path.join(model_dir, "model.config"), "w") as fh:
-        fh.write(build_model_config(model_name, description))
+        if stale("VALIDATION.txt"):
+            if validation is None:
+                cache_path = _validation_cache_path(validation_cache, output_dir, model_name)
+                validation = pv.validate(assembly, joint_sweep_kwargs or {},
+                                         workers=validation_workers, cache_path=cache_path)
+            _write_text(os.path.join(model_dir, "VALIDATION.txt"),
+                        validation.report + "\n\n" + _cost_section(costs, budgets, over_budget))
+        for fut in writes:
+            fut.result()
 
-    report_str = pv.full_report(assembly, joint_sweep_kwargs or {})
-    with open(os.path.join(model_dir, "VALIDATION.txt"), "w") as fh:
-        fh.write(report_str)
+    prof = profiling.active()
+    if prof is not None:
+        # Appended after the fact, so the manifest records a key no export
+        # produces: the next export rewrites VALIDATION.txt without it.
+        with open(os.path.join(model_dir, "VALIDATION.txt"), "a") as fh:
+            fh.write("\n\n" + prof.summary())
+        keys["VALIDATION.txt"] = "profiled"
 
+    for rel in set(previous) - set(keys):
+        path = os.path.join(model_dir, rel)
+        if os.path.exists(path):
+            os.remove(path)
+    if incremental:
+        records = {name: dict(_proxy_record(proxy), key=key) for name, (key, proxy) in proxies.items()}
+        _write_text(manifest_path, json.dumps({"files": keys, "proxies": records}, indent=1, sort_keys=True))
+    elif os.path.exists(manifest_path):
+        # This export rewrote files the manifest of an earlier incremental
+        # one describes; left in place, it would vouch for them next time.
+        os.remove(manifest_path)
+    if mesh_cache is not None:
+        _store_link_caches(assembly, mesh_cache)
     return model_dir
 
 
-def zip_model(model_dir: str, zip_path: str = None) -> str:
-    """Convenience: zip the exported model directory for easy hand-off."""
+@profiling.profiled()
+def export_variants(variants: list, output_dir: str, workers: int = None,
+                    index_name: str = "index.json", **export_kwargs) -> dict:
+    """Build, validate and export a batch of design variants -- a
+    parametric sweep over wheel radii, link lengths, densities -- into
+    `output_dir/<variant name>/` each, and write a summary index.
+
+    `variants` holds kinematics.Assembly objects and/or zero-argument
+    callables that build one (module-level functions or functools.partial
+    of them, so they can be sent to a worker process); building then
+    happens in the pool too. Every variant needs its own assembly name.
+    Each is validated (physics_validate.validate) and exported
+    (export_model with `export_kwargs`, reusing that validation) in one
+    task on a `workers`-process pool (default: one per CPU; workers=1
+    runs everything in this process).
+
+    Links repeated across variants -- the chassis every wheel-radius
+    variant shares -- are handled once: all variants use the shared
+    mesh_cache `output_dir/.mesh_cache/` (see export_model), so a link
+    whose fingerprint another task has already seen loads its mass
+    properties, hull and signed-distance grid (which validation would
+    otherwise rebuild) instead of computing them, and its STL is
+    hard-linked rather than written again. Two tasks meeting the same
+    new link at the same moment both compute it; nothing is shared
+    wrongly, only some work is repeated.
+
+    export_kwargs can't hold `mesh_cache` or `validation`, which every
+    task sets itself. skip_validation=True still validates every variant
+    (its "passed" and validate_s are real); as in export_model, it only
+    lets a variant with non-watertight links be exported anyway.
+
+    A variant that fails -- a build error, a non-watertight link -- is
+    recorded in the index with its error rather than stopping the batch.
+    Returns the index, also written to `output_dir/<index_name>`:
+    {"models": [{"name", "model_dir", "fingerprint", "passed", "error",
+    "links", "cached_links", "build_s", "validate_s", "export_s"}, ...],
+    "workers", "total_s"}, models in `variants` order."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    reserved = sorted({"mesh_cache", "validation"} & set(export_kwargs))
+    if reserved:
+        raise GazeboExportError(f"export_variants sets {reserved} for every variant itself; "
+                                "don't pass them in export_kwargs")
+    names = [v.name for v in variants if isinstance(v, kin.Assembly)]
+    dupes = sorted({n for n in names if names.count(n) > 1})
+    if dupes:
+        raise GazeboExportError(f"Variant names must be unique (each is a model directory): {dupes}")
+    os.makedirs(output_dir, exist_ok=True)
+    mesh_cache = os.path.join(output_dir, ".mesh_cache")
+    t0 = time.perf_counter()
+    if workers == 1:
+        models = [_export_variant(v, output_dir, mesh_cache, export_kwargs) for v in variants]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_export_variant, v, output_dir, mesh_cache, export_kwargs)
+                       for v in variants]
+            models = [fut.result() for fut in futures]
+    names = [m["name"] for m in models if m["name"] is not None]
+    for m in models:
+        if m["name"] is not None and names.count(m["name"]) > 1 and m["error"] is None:
+            m["error"] = f"another variant is also named '{m['name']}'; their exports overwrote each other"
+    index = {"models": models, "workers": workers or os.cpu_count(),
+             "total_s": round(time.perf_counter() - t0, 4)}
+    _write_text(os.path.join(output_dir, index_name), json.dumps(index, indent=1))
+    return index
+
+
+def _export_variant(variant, output_dir: str, mesh_cache: str, export_kwargs: dict) -> dict:
+    """One export_variants task -> its index entry."""
+    entry = {"name": getattr(variant, "name", None), "model_dir": None, "fingerprint": None,
+             "passed": False, "error": None, "links": 0, "cached_links": 0,
+             "build_s": 0.0, "validate_s": 0.0, "export_s": 0.0}
+    try:
+        t0 = time.perf_counter()
+        assembly = variant if isinstance(variant, kin.Assembly) else variant()
+        entry.update(name=assembly.name, fingerprint=assembly.fingerprint(), links=len(assembly.links))
+        t1 = time.perf_counter()
+        os.makedirs(mesh_cache, exist_ok=True)
+        entry["cached_links"] = _load_link_caches(assembly, mesh_cache)
+        cache_path = _validation_cache_path(export_kwargs.get("validation_cache", False),
+                                            output_dir, assembly.name)
+        validation = pv.validate(assembly, export_kwargs.get("joint_sweep_kwargs") or {},
+                                 workers=export_kwargs.get("validation_workers"), cache_path=cache_path)
+        entry["passed"] = validation.passed
+        t2 = time.perf_counter()
+        entry["model_dir"] = export_model(assembly, output_dir, validation=validation,
+                                          mesh_cache=mesh_cache, **export_kwargs)
+        t3 = time.perf_counter()
+        entry.update(build_s=round(t1 - t0, 4), validate_s=round(t2 - t1, 4), export_s=round(t3 - t2, 4))
+    except Exception as exc:
+        entry["error"] = f"{type(exc).__name__}: {exc}"
+    return entry
+
+
+def _validation_cache_path(validation_cache, output_dir: str, model_name: str):
+    """export_model's `validation_cache` -> the cache file physics_validate
+    keeps its results in, or None."""
+    if not validation_cache:
+        return None
+    if isinstance(validation_cache, (str, os.PathLike)):
+        os.makedirs(validation_cache, exist_ok=True)
+        return os.path.join(validation_cache, f"{model_name}.validation_cache.json")
+    return os.path.join(output_dir, f".{model_name}.validation_cache.json")
+
+
+def _load_link_caches(assembly: kin.Assembly, cache_dir: str) -> int:
+    """Fill each link's unset mass/hull/signed-distance-grid caches from
+    `cache_dir/<link fingerprint>.link.npz`. Returns how many links were
+    found there."""
+    hits = 0
+    for link in assembly.links.values():
+        path = os.path.join(cache_dir, f"{link.fingerprint()}.link.npz")
+        try:
+            data = np.load(path)
+        except (OSError, ValueError):
+            continue
+        with data:
+            if link._mass_cache is None and "mass" in data:
+                link._mass_cache = json.loads(str(data["mass"]))
+            if link._hull_cache is None and "hull" in data:
+                link._hull_cache = data["hull"]
+            if link._sdf_cache is None and "sdf_values" in data:
+                link._sdf_cache = mesh_utils.SignedDistanceGrid(
+                    data["sdf_origin"], float(data["sdf_spacing"]), data["sdf_values"],
+                    float(data["sdf_band"]), data["sdf_mesh_bounds"], link.mesh)
+        hits += 1
+    return hits
+
+
+def _store_link_caches(assembly: kin.Assembly, cache_dir: str) -> None:
+    """Write each link's computed caches to `cache_dir` (see
+    _load_link_caches), unless an entry holding as much is already there."""
+    for link in assembly.links.values():
+        arrays = {}
+        if link._mass_cache is not None:
+            arrays["mass"] = np.array(json.dumps(link._mass_cache))
+        if link._hull_cache is not None:
+            arrays["hull"] = np.asarray(link._hull_cache)
+        grid = link._sdf_cache
+        if grid is not None:
+            arrays.update(sdf_origin=np.asarray(grid.origin), sdf_spacing=np.array(grid.spacing),
+                          sdf_values=np.asarray(grid.values), sdf_band=np.array(grid.band),
+                          sdf_mesh_bounds=np.asarray(grid.mesh_bounds))
+        if not arrays:
+            continue
+        path = os.path.join(cache_dir, f"{link.fingerprint()}.link.npz")
+        try:
+            with np.load(path) as data:
+                if set(arrays) <= set(data.files):
+                    continue
+        except (OSError, ValueError):
+            pass
+        tmp = _tmp_name(path)
+        with open(tmp, "wb") as fh:
+            np.savez(fh, **arrays)
+        os.replace(tmp, path)
+
+
+def _digest(obj) -> str:
+    blob = json.dumps(obj, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(blob, digest_size=16).hexdigest()
+
+
+def _mesh_digest(mesh) -> str:
+    """Hash of the mesh alone -- Link.fingerprint without the density,
+    which no mesh file or collision proxy depends on."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.ascontiguousarray(mesh.vertices, dtype=np.float64).tobytes())
+    h.update(np.ascontiguousarray(mesh.faces, dtype=np.int64).tobytes())
+    return h.hexdigest()
+
+
+def _proxy_record(proxy: mesh_utils.CollisionProxy) -> dict:
+    return {"kind": proxy.kind, "volume_error": proxy.volume_error, "size": list(proxy.size),
+            "pose": None if proxy.pose is None else np.asarray(proxy.pose).tolist(),
+            "n_meshes": len(proxy.meshes)}
+
+
+def _shared_meshes(assembly: kin.Assembly) -> dict:
+    """{link name: (source link name, T)} for every link whose mesh is a
+    congruent copy of an earlier link's (mesh_utils.congruent_meshes). The
+    copy's mass properties are the source's moved by T, rescaled for its
+    density, and are filled into its cache here rather than integrated
+    over its mesh again."""
+    shared = mesh_utils.congruent_meshes({name: link.mesh for name, link in assembly.links.items()})
+    for name, (source, T) in shared.items():
+        link, src = assembly.links[name], assembly.links[source]
+        if link._mass_cache is None:
+            link._mass_cache = mesh_utils.transform_mass_properties(
+                src.mass_props(), np.eye(4) if T is None else T, link.density / src.density)
+    return shared
+
+
+def _collision_proxies(assembly: kin.Assembly, model_dir: str, tolerance: float, previous: dict,
+                       names: list, cache_dir: str = None, limits: tuple = None) -> dict:
+    """{link name: (key, mesh_utils.CollisionProxy)} for the links in
+    `names`, hulls simplified to within `limits` (see _simplify_proxy)
+    if given. A proxy recorded in the previous export's manifest under the
+    same key (mesh hash and tolerance) whose hull files are all still on
+    disk is reused without refitting, its hulls read back from those
+    files. Otherwise one kept in `cache_dir` under the key is loaded, and
+    a freshly fitted one is stored there."""
+    out = {}
+    for name in names:
+        link = assembly.links[name]
+        key = _digest(["proxy", _mesh_digest(link.mesh), tolerance] + ([limits] if limits else []))
+        rec = previous.get(name)
+        if rec is not None and rec["key"] == key and all(
+                os.path.exists(os.path.join(model_dir, "meshes", _collision_mesh_name(name, i)))
+                for i in range(rec["n_meshes"])):
+            out[name] = (key, mesh_utils.CollisionProxy(
+                rec["kind"], rec["volume_error"], tuple(rec["size"]),
+                None if rec["pose"] is None else np.array(rec["pose"]),
+                [mesh_utils.load_stl(os.path.join(model_dir, "meshes", _collision_mesh_name(name, i)))
+                 for i in range(rec["n_meshes"])]))
+        else:
+            proxy = _load_proxy(cache_dir, key) if cache_dir is not None else None
+            if proxy is None:
+                proxy = mesh_utils.fit_collision_proxy(link.mesh, tolerance)
+                if limits:
+                    proxy = _simplify_proxy(proxy, link.mesh.volume, *limits)
+                if cache_dir is not None:
+                    _store_proxy(cache_dir, key, proxy)
+            out[name] = (key, proxy)
+    return out
+
+
+def _load_proxy(cache_dir: str, key: str):
+    try:
+        data = np.load(os.path.join(cache_dir, f"{key}.proxy.npz"))
+    except (OSError, ValueError):
+        return None
+    with data:
+        rec = json.loads(str(data["record"]))
+        meshes = [trimesh.Trimesh(data[f"vertices_{i}"], data[f"faces_{i}"], process=False)
+                  for i in range(rec["n_meshes"])]
+    return mesh_utils.CollisionProxy(rec["kind"], rec["volume_error"], tuple(rec["size"]),
+                                     None if rec["pose"] is None else np.array(rec["pose"]), meshes)
+
+
+def _store_proxy(cache_dir: str, key: str, proxy: mesh_utils.CollisionProxy) -> None:
+    arrays = {"record": np.array(json.dumps(_proxy_record(proxy)))}
+    for i, piece in enumerate(proxy.meshes):
+        arrays[f"vertices_{i}"] = np.asarray(piece.vertices)
+        arrays[f"faces_{i}"] = np.asarray(piece.faces)
+    path = os.path.join(cache_dir, f"{key}.proxy.npz")
+    tmp = _tmp_name(path)
+    with open(tmp, "wb") as fh:
+        np.savez(fh, **arrays)
+    os.replace(tmp, path)
+
+
+def _mesh_files(assembly: kin.Assembly, shared: dict, proxies: dict, visual_format: str,
+                lod: tuple, decimated: dict) -> dict:
+    """{mesh file path relative to the model directory: (link name, file
+    type, face ratio or None for the full mesh)} -- the visual file(s) of
+    every link not in `shared` (scaled down by its `decimated` ratio, if
+    any), plus its full STL where its collision uses the mesh (it has no
+    proxy, or a "mesh" one)."""
+    files = {}
+    for name in assembly.links:
+        if name in shared:
+            continue
+        scale = decimated.get(name)
+        if lod:
+            for level, ratio in enumerate(lod):
+                files[f"meshes/{_visual_mesh_name(name, visual_format, level)}"] = \
+                    (name, visual_format, ratio * (scale or 1.0))
+        else:
+            files[f"meshes/{_visual_mesh_name(name, visual_format, None, bool(scale))}"] = \
+                (name, visual_format, scale)
+        if name not in proxies or proxies[name][1].kind == "mesh":
+            files[f"meshes/{name}.stl"] = (name, "stl", None)
+    return files
+
+
+def _mesh_bytes(n_vertices: int, n_faces: int, file_type: str) -> int:
+    """Size of a mesh file: exact for binary STL, close for GLB (float32
+    positions, uint32 indices, ~1 KB of JSON) and OBJ (~8 significant
+    digits per coordinate)."""
+    if file_type == "stl":
+        return 84 + 50 * n_faces
+    if file_type == "glb":
+        return 1024 + 12 * n_vertices + 12 * n_faces
+    return 36 * n_vertices + 24 * n_faces
+
+
+def _link_costs(assembly: kin.Assembly, shared: dict, proxies: dict, files: dict, lod: tuple,
+                visual_lod: int, decimated: dict, budgets: dict) -> dict:
+    """{link name: LinkCost} for the export `files` describes, with each
+    link's `over` filled in against `budgets`."""
+    link_bytes = {}
+    for rel, (name, file_type, ratio) in files.items():
+        mesh = assembly.links[name].mesh
+        r = 1.0 if ratio is None else ratio
+        link_bytes[name] = link_bytes.get(name, 0) + _mesh_bytes(
+            int(len(mesh.vertices) * r), int(len(mesh.faces) * r), file_type)
+    costs = {}
+    for name, link in assembly.links.items():
+        source = shared.get(name, (name, None))[0]
+        ratio = (lod[visual_lod] if lod else 1.0) * (decimated.get(source) or 1.0)
+        proxy = proxies[source][1] if source in proxies else None
+        if proxy is None or proxy.kind == "mesh":
+            kind, geoms, tris, contact = "mesh", 1, len(link.mesh.faces), len(link.mesh.faces)
+        elif proxy.kind in ("hull", "decomposition"):
+            kind, geoms = proxy.kind, len(proxy.meshes)
+            tris = sum(len(m.faces) for m in proxy.meshes)
+            contact = sum(len(m.vertices) for m in proxy.meshes)
+            if name == source:
+                link_bytes[name] = link_bytes.get(name, 0) + sum(_mesh_bytes(0, len(m.faces), "stl")
+                                                                 for m in proxy.meshes)
+        else:
+            kind, geoms, tris, contact = proxy.kind, 1, 0, 1
+        cost = LinkCost(name, int(len(link.mesh.faces) * ratio), link_bytes.get(name, 0) if name == source else 0,
+                        kind, geoms, tris, contact, decimated.get(source))
+        cost.over = [b for b, limit in budgets.items() if limit is not None and getattr(cost, b) > limit]
+        costs[name] = cost
+    return costs
+
+
+def _fit_budgets(assembly: kin.Assembly, shared: dict, costs: dict, budgets: dict) -> tuple:
+    """over_budget="decimate": ({link: visual face ratio} bringing each
+    over-budget visual within the triangle and file-size budgets, [links
+    whose collision mesh is over budget, to get a collision proxy])."""
+    decimated, refit = {}, []
+    for name, cost in costs.items():
+        if name in shared or not cost.over:
+            continue
+        ratio = 1.0
+        if "triangles" in cost.over:
+            ratio = min(ratio, budgets["triangles"] / max(cost.triangles, 1))
+        if "mesh_bytes" in cost.over:
+            ratio = min(ratio, budgets["mesh_bytes"] / max(cost.mesh_bytes, 1))
+        if ratio < 1.0:
+            decimated[name] = 0.95 * ratio   # margin: decimate lands near, not exactly on, its target
+        if cost.collision_kind == "mesh" and ({"collision_triangles", "contact_cost", "mesh_bytes"} & set(cost.over)):
+            refit.append(name)
+    return decimated, refit
+
+
+def _simplify_proxy(proxy: mesh_utils.CollisionProxy, volume: float, max_triangles: int = None,
+                    max_contact_cost: int = None) -> mesh_utils.CollisionProxy:
+    """over_budget="decimate": `proxy`, or if it's a hull/decomposition
+    over the collision budgets, the same with its pieces
+    mesh_utils.simplify_hull'd to fit -- still enclosing the mesh (of
+    `volume`), just a little looser."""
+    if proxy.kind not in ("hull", "decomposition"):
+        return proxy
+    n = len(proxy.meshes)
+    tris = sum(len(m.faces) for m in proxy.meshes)
+    verts = sum(len(m.vertices) for m in proxy.meshes)
+    if (max_triangles is None or tris <= max_triangles) and (max_contact_cost is None or verts <= max_contact_cost):
+        return proxy
+    # A closed triangulated convex polytope has F = 2V - 4 faces.
+    per_piece = min(max_triangles / n if max_triangles is not None else np.inf,
+                    2 * (max_contact_cost / n - 2) if max_contact_cost is not None else np.inf)
+    pieces = [mesh_utils.simplify_hull(m, per_piece) for m in proxy.meshes]
+    return mesh_utils.CollisionProxy(proxy.kind, (sum(p.volume for p in pieces) - volume) / volume,
+                                     proxy.size, proxy.pose, pieces)
+
+
+def _cost_section(costs: dict, budgets: dict, over_budget: str) -> str:
+    """The per-link cost table appended to VALIDATION.txt."""
+    limits = ", ".join(f"{k} {v}" for k, v in budgets.items() if v is not None)
+    lines = ["-- Simulation cost (per link, as exported) --", f"(budgets: {limits}; over_budget={over_budget})"]
+    lines += [str(c) for c in costs.values()]
+    n_over = sum(bool(c.over) for c in costs.values())
+    total = sum(c.triangles for c in costs.values())
+    lines.append(f"COST: {'WITHIN BUDGET' if not n_over else f'{n_over} link(s) OVER BUDGET'} "
+                 f"({total} visual triangles, {sum(c.mesh_bytes for c in costs.values()) / 2**20:.2f} MB of meshes)")
+    return "\n".join(lines) + "\n"
+
+
+def _export_keys(assembly: kin.Assembly, description: str, joint_sweep_kwargs: dict,
+                 proxies: dict, shared: dict = None, files: dict = None, visual: tuple = None,
+                 cost_report: dict = None) -> dict:
+    """{file path relative to the model directory: hash of exactly what
+    that file's content depends on} -- export_model(incremental=True)
+    rewrites a file only when its key changes."""
+    shared = shared or {}
+    link_fp = {name: link.fingerprint() for name, link in assembly.links.items()}
+    if files is None:
+        files = {f"meshes/{name}.stl": (name, "stl", None) for name in link_fp if name not in shared}
+    mesh_fp = {name: _mesh_digest(assembly.links[name].mesh) for name in {n for n, _, _ in files.values()}}
+    keys = {rel: _digest(["mesh", mesh_fp[name], file_type, ratio])
+            for rel, (name, file_type, ratio) in files.items()}
+    for name, (key, proxy) in proxies.items():
+        for i in range(len(proxy.meshes)):
+            keys[f"meshes/{_collision_mesh_name(name, i)}"] = _digest(["collision", key, i])
+    keys["model.sdf"] = _digest(["sdf", assembly.name,
+                                 [(n, link_fp[n], l.color, l.self_collide) for n, l in assembly.links.items()],
+                                 [j.fingerprint() for j in assembly.joints.values()],
+                                 {n: key for n, (key, _) in proxies.items()},
+                                 {n: (src, None if T is None else np.round(T, 12).tolist())
+                                  for n, (src, T) in shared.items()},
+                                 visual])
+    keys["model.config"] = _digest(["config", assembly.name, description])
+    keys["VALIDATION.txt"] = _digest(["validation", assembly.fingerprint(), joint_sweep_kwargs, cost_report])
+    keys["cost_report.json"] = _digest(["cost", cost_report])
+    return keys
+
+
+def _tmp_name(path: str) -> str:
+    # Per process and thread, so export_variants workers (or two links
+    # with the same mesh) filling the same mesh_cache entry never write
+    # into each other's temporary file.
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def _write_text(path: str, text: str) -> str:
+    tmp = _tmp_name(path)
+    with open(tmp, "w") as fh:
+        fh.write(text)
+    os.replace(tmp, path)
+    return path
+
+
+def _write_xml(path: str, elem) -> str:
+    """_write_text for an element tree, streamed to the file as it's
+    formatted rather than built up as one string first."""
+    tmp = _tmp_name(path)
+    with open(tmp, "w") as fh:
+        _write_document(elem, fh)
+    os.replace(tmp, path)
+    return path
+
+
+def _write_mesh(mesh, path: str, file_type: str = "stl", ratio: float = None,
+                cache_dir: str = None, key: str = None) -> str:
+    """Write `mesh` (decimated to `ratio`) to `path`; with a `cache_dir`,
+    via `cache_dir/<key>.<file_type>` -- written only if it isn't there
+    yet, then hard-linked (or, across filesystems, copied) into place."""
+    if cache_dir is not None:
+        cached = os.path.join(cache_dir, f"{key}.{file_type}")
+        if not os.path.exists(cached):
+            _write_mesh(mesh, cached, file_type, ratio)
+        tmp = _tmp_name(path)
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        try:
+            os.link(cached, tmp)
+        except OSError:
+            shutil.copyfile(cached, tmp)
+        os.replace(tmp, path)
+        return path
+    if ratio is not None and ratio < 1.0:
+        mesh = mesh_utils.decimate(mesh, ratio)
+    tmp = _tmp_name(path)
+    mesh_utils.export_mesh(mesh, tmp, file_type)
+    os.replace(tmp, path)
+    return path
+
+
+# zip_model's deflate level per file extension: text compresses well
+# and is small, so it gets the best ratio; binary meshes are the bulk
+# and gain little from levels past 3; already-compressed formats are
+# stored as they are.
+_ZIP_LEVELS = {".sdf": 9, ".config": 9, ".txt": 9, ".json": 9, ".obj": 6, ".stl": 3, ".glb": 3}
+_ZIP_STORED = {".png", ".jpg", ".jpeg", ".webp", ".ktx2", ".drc", ".gz", ".zip", ".bz2", ".xz"}
+_ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)      # earliest time a zip entry can hold
+
+
+@profiling.profiled()
+def zip_model(model_dir: str, zip_path: str = None, workers: int = None, reproducible: bool = False,
+              chunk_size: int = 4 * 2**20) -> str:
+    """Zip the exported model directory for hand-off -> the .zip path
+    (default: `<model_dir>.zip`), laid out as `<model name>/...` like
+    shutil.make_archive would.
+
+    Files are deflated in `chunk_size` pieces on a thread pool (`workers`
+    threads, default one per CPU; zlib releases the GIL), pigz-style --
+    every piece but a file's last ends on a sync flush, so the pieces
+    concatenate into one valid deflate stream -- and streamed into the
+    archive in order with a bounded number in flight, so one huge mesh
+    is compressed in parallel too and memory stays flat. The level is
+    chosen per file type (_ZIP_LEVELS), and already-compressed formats
+    are stored. reproducible=True gives byte-identical archives for
+    identical content: entries sorted by path, every timestamp
+    1980-01-01 and fixed permissions.
+
+    Models past the classic zip limits (a 4 GiB file or archive, 65535
+    entries) are written with the zipfile module instead -- serially,
+    at zlib's default level, with the same ordering and timestamps."""
+    import zlib
+    from concurrent.futures import ThreadPoolExecutor
+
+    model_dir = model_dir.rstrip("/")
     if zip_path is None:
-        zip_path = model_dir.rstrip("/")
-    base = zip_path[:-4] if zip_path.endswith(".zip") else zip_path
-    return shutil.make_archive(base, "zip", root_dir=os.path.dirname(model_dir), base_dir=os.path.basename(model_dir))
+        zip_path = model_dir
+    if not zip_path.endswith(".zip"):
+        zip_path += ".zip"
+    root = os.path.dirname(model_dir)
+    entries = [os.path.basename(model_dir) + "/"]
+    for dirpath, dirnames, filenames in os.walk(model_dir):
+        dirnames.sort()
+        rel_dir = os.path.relpath(dirpath, root)
+        entries += [f"{rel_dir}/{d}/" for d in dirnames] + [f"{rel_dir}/{f}" for f in sorted(filenames)]
+    if reproducible:
+        entries.sort()
+    sizes = [0 if e.endswith("/") else os.path.getsize(os.path.join(root, e)) for e in entries]
+    if max(sizes) >= 0xFFFFFFFF or sum(sizes) >= 0xF0000000 or len(entries) > 0xFFFF:
+        return _zip_with_zipfile(root, entries, zip_path, reproducible)
+
+    workers = workers or os.cpu_count() or 1
+
+    def deflate(chunk, level, last):
+        c = zlib.compressobj(level, zlib.DEFLATED, -15)
+        return c.compress(chunk) + c.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+    central = []
+    tmp = _tmp_name(zip_path)
+    with open(tmp, "wb") as out, ThreadPoolExecutor(max_workers=workers) as pool:
+        for name in entries:
+            path = os.path.join(root, name)
+            is_dir = name.endswith("/")
+            ext = os.path.splitext(name)[1].lower()
+            method = 0 if is_dir or ext in _ZIP_STORED else 8
+            level = _ZIP_LEVELS.get(ext, 6)
+            when = _ZIP_EPOCH if reproducible else time.localtime(os.path.getmtime(path))[:6]
+            mode = (0o40755 if is_dir else 0o100644) if reproducible else os.stat(path).st_mode
+            fname = name.encode("utf-8")
+            flags = 0x800 if not name.isascii() else 0
+            offset = out.tell()
+            out.write(_zip_local_header(fname, flags, method, when, 0, 0, 0))
+            crc, usize, csize = 0, 0, 0
+            if not is_dir:
+                with open(path, "rb") as fh:
+                    pending = []
+                    chunk = fh.read(chunk_size)
+                    while True:
+                        nxt = fh.read(chunk_size) if chunk else b""
+                        last = not nxt
+                        crc = zlib.crc32(chunk, crc)
+                        usize += len(chunk)
+                        pending.append(pool.submit(deflate, chunk, level, last) if method else chunk)
+                        while len(pending) > 2 * workers or (last and pending):
+                            data = pending.pop(0)
+                            data = data.result() if method else data
+                            out.write(data)
+                            csize += len(data)
+                        if last:
+                            break
+                        chunk = nxt
+            end = out.tell()
+            out.seek(offset)
+            out.write(_zip_local_header(fname, flags, method, when, crc, csize, usize))
+            out.seek(end)
+            central.append(_zip_central_header(fname, flags, method, when, crc, csize, usize,
+                                               (mode << 16) | (0x10 if is_dir else 0), offset))
+        cd_offset = out.tell()
+        for header in central:
+            out.write(header)
+        out.write(struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, len(central), len(central),
+                              out.tell() - cd_offset, cd_offset, 0))
+    os.replace(tmp, zip_path)
+    return zip_path
+
+
+def _dos_time(when) -> tuple:
+    y, mo, d, h, mi, sec = when
+    return (h << 11) | (mi << 5) | (sec // 2), ((max(y, 1980) - 1980) << 9) | (mo << 5) | d
+
+
+def _zip_local_header(fname: bytes, flags: int, method: int, when, crc: int, csize: int,
+                      usize: int) -> bytes:
+    t, d = _dos_time(when)
+    return struct.pack("<IHHHHHIIIHH", 0x04034B50, 20, flags, method, t, d, crc, csize, usize,
+                       len(fname), 0) + fname
+
+
+def _zip_central_header(fname: bytes, flags: int, method: int, when, crc: int, csize: int,
+                        usize: int, external_attr: int, offset: int) -> bytes:
+    t, d = _dos_time(when)
+    return struct.pack("<IHHHHHHIIIHHHHHII", 0x02014B50, (3 << 8) | 20, 20, flags, method, t, d,
+                       crc, csize, usize, len(fname), 0, 0, 0, 0, external_attr, offset) + fname
+
+
+def _zip_with_zipfile(root: str, entries: list, zip_path: str, reproducible: bool) -> str:
+    import zipfile
+    tmp = _tmp_name(zip_path)
+    with zipfile.ZipFile(tmp, "w", allowZip64=True) as zf:
+        for name in entries:
+            path = os.path.join(root, name)
+            ext = os.path.splitext(name)[1].lower()
+            info = zipfile.ZipInfo(name, _ZIP_EPOCH if reproducible else time.localtime(os.path.getmtime(path))[:6])
+            if name.endswith("/"):
+                info.external_attr = ((0o40755 if reproducible else os.stat(path).st_mode) << 16) | 0x10
+                zf.writestr(info, b"")
+                continue
+            info.external_attr = (0o100644 if reproducible else os.stat(path).st_mode) << 16
+            info.compress_type = zipfile.ZIP_STORED if ext in _ZIP_STORED else zipfile.ZIP_DEFLATED
+            with open(path, "rb") as src, zf.open(info, "w", force_zip64=True) as dst:
+                shutil.copyfileobj(src, dst, 4 * 2**20)
+    os.replace(tmp, zip_path)
+    return zip_path
@@ -20,8 +20,13 @@ point patch between two parts). It is a heuristic, not a guarantee -- always
 cross-check the result against the part's obvious symmetry axis.
 """
 from __future__ import annotations
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields, asdict
 from typing import Optional
+import hashlib
+import json
+import mmap
+import struct
+import zlib
 import numpy as np
 import trimesh
 import networkx as nx
@@ -39,6 +44,8 @@ class Link:
                                       # intra-model contacts by default.
     color: tuple = (0.65, 0.65, 0.68)  # cosmetic RGB for the exported visual
     _mass_cache: Optional[dict] = field(default=None, repr=False)
+    _sdf_cache: Optional[object] = field(default=None, repr=False)
+    _hull_cache: Optional[np.ndarray] = field(default=None, repr=False)
 
     def mass_props(self) -> dict:
         if self._mass_cache is None:
@@ -46,6 +53,35 @@ class Link:
             self._mass_cache = mesh_utils.mass_properties(self.mesh, density=self.density)
         return self._mass_cache
 
+    def sdf_grid(self):
+        """mesh_utils.SignedDistanceGrid of this link's mesh in its own
+        local frame, built on first use and cached -- physics_validate's
+        containment narrow phase for every pose of every check."""
+        if self._sdf_cache is None:
+            import mesh_utils
+            self._sdf_cache = mesh_utils.signed_distance_grid(self.mesh)
+        return self._sdf_cache
+
+    def hull_points(self) -> np.ndarray:
+        """(H,3) convex-hull vertices of this link's mesh in its own local
+        frame (mesh_utils.convex_hull_points), built on first use and
+        cached -- physics_validate's GJK filter in front of the grid."""
+        if self._hull_cache is None:
+            import mesh_utils
+            self._hull_cache = mesh_utils.convex_hull_points(self.mesh)
+        return self._hull_cache
+
+    def fingerprint(self) -> str:
+        """Content hash of what this link's checks and exports depend on:
+        the mesh's vertex and face buffers and the density. Recomputed on
+        every call (never cached), so a mesh edited in place can't keep a
+        stale fingerprint."""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(np.ascontiguousarray(self.mesh.vertices, dtype=np.float64).tobytes())
+        h.update(np.ascontiguousarray(self.mesh.faces, dtype=np.int64).tobytes())
+        h.update(struct.pack("<d", self.density))
+        return h.hexdigest()
+
 
 @dataclass
 class Joint:
@@ -66,6 +102,141 @@ class Joint:
     gear_partner: Optional[str] = None
     gear_ratio: Optional[float] = None
 
+    def fingerprint(self) -> str:
+        """Content hash of every field (type, parent/child, origin, axis,
+        limits, ...)."""
+        blob = json.dumps(asdict(self), sort_keys=True,
+                          default=lambda o: np.asarray(o).tolist()).encode("utf-8")
+        return hashlib.blake2b(blob, digest_size=16).hexdigest()
+
+
+@dataclass
+class IKResult:
+    """Output of Assembly.inverse_kinematics: one row per target."""
+    link_name: str
+    joint_names: list                 # column order of `solutions`
+    solutions: np.ndarray             # (N, n_dof) joint values, radians/metres
+    converged: np.ndarray             # (N,) bool -- met both tolerances
+    position_error: np.ndarray        # (N,) metres, at the returned solution
+    orientation_error: Optional[np.ndarray] = None  # (N,) radians; None for position-only targets
+    iterations: int = 0
+
+    def as_actuations(self) -> list:
+        """[{joint_name: value}, ...] -- directly usable as
+        forward_kinematics/sweep actuation dicts."""
+        return [dict(zip(self.joint_names, row)) for row in self.solutions.tolist()]
+
+    def __str__(self):
+        n_ok = int(np.sum(self.converged))
+        return (f"IK '{self.link_name}': {n_ok}/{len(self.converged)} targets converged "
+                f"in <= {self.iterations} iterations, worst position error "
+                f"{float(np.max(self.position_error)) if len(self.position_error) else 0.0:.2e} m")
+
+
+class PosedMesh:
+    """A link mesh placed at a world pose WITHOUT copying it: a reference
+    to the local-frame `mesh` plus the rigid 4x4 `transform` that places
+    it. This is what Assembly.world_mesh returns.
+
+    Why a view instead of `mesh.copy().apply_transform(T)`: the validators
+    ask for world meshes once per link per pose, and every copy throws away
+    trimesh's per-mesh caches (the ray-test BVH behind `contains`, face
+    normals, watertightness) and rebuilds them from scratch. Here the
+    base mesh is never touched, so those caches are built once and reused
+    at every pose:
+        - `vertices`/`bounds`/`face_normals` are transformed on demand (and
+          cached on the view, not the base mesh)
+        - `contains(points)` maps the query points into the local frame
+          instead of mapping the mesh into the world frame
+        - rigid-invariant properties (`is_watertight`, `volume`, ...) are
+          read straight off the base mesh
+    Anything else (export, show, slicing, ...) falls through to a one-off
+    materialized world-space copy via `to_trimesh()`, so code written
+    against the old copy-returning world_mesh keeps working.
+    """
+
+    def __init__(self, mesh: trimesh.Trimesh, transform: np.ndarray):
+        self.mesh = mesh
+        self.transform = np.asarray(transform, dtype=float)
+        self._inverse = None
+        self._vertices = None
+        self._materialized = None
+
+    @property
+    def inverse(self) -> np.ndarray:
+        if self._inverse is None:
+            self._inverse = np.linalg.inv(self.transform)
+        return self._inverse
+
+    def to_local(self, points) -> np.ndarray:
+        """World-frame points -> the base mesh's local frame."""
+        return trimesh.transformations.transform_points(np.asarray(points, dtype=float), self.inverse)
+
+    def to_world(self, points) -> np.ndarray:
+        """Local-frame points -> world frame."""
+        return trimesh.transformations.transform_points(np.asarray(points, dtype=float), self.transform)
+
+    @property
+    def vertices(self) -> np.ndarray:
+        if self._vertices is None:
+            self._vertices = self.to_world(self.mesh.vertices)
+        return self._vertices
+
+    @property
+    def faces(self) -> np.ndarray:
+        return self.mesh.faces
+
+    @property
+    def triangles(self) -> np.ndarray:
+        return self.vertices[self.faces]
+
+    @property
+    def face_normals(self) -> np.ndarray:
+        return self.mesh.face_normals @ self.transform[:3, :3].T
+
+    @property
+    def bounds(self) -> np.ndarray:
+        v = self.vertices
+        return np.array([v.min(axis=0), v.max(axis=0)])
+
+    @property
+    def centroid(self) -> np.ndarray:
+        return self.to_world(self.mesh.centroid[None, :])[0]
+
+    @property
+    def is_watertight(self) -> bool:
+        return self.mesh.is_watertight
+
+    @property
+    def is_winding_consistent(self) -> bool:
+        return self.mesh.is_winding_consistent
+
+    @property
+    def euler_number(self) -> int:
+        return self.mesh.euler_number
+
+    @property
+    def volume(self) -> float:
+        return self.mesh.volume
+
+    def contains(self, points) -> np.ndarray:
+        return self.mesh.contains(self.to_local(points))
+
+    def to_trimesh(self) -> trimesh.Trimesh:
+        """A real world-space trimesh.Trimesh (built once per view)."""
+        if self._materialized is None:
+            m = self.mesh.copy()
+            m.apply_transform(self.transform)
+            self._materialized = m
+        return self._materialized
+
+    def __getattr__(self, name):
+        # Only reached for attributes not defined above. Guard private
+        # names so copy/pickle probing doesn't recurse before __init__ ran.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.to_trimesh(), name)
+
 
 class Assembly:
     """A tree of Links connected by Joints, rooted at `root`."""
@@ -94,6 +265,16 @@ class Assembly:
         self.graph.add_edge(joint.parent, joint.child, joint=joint.name)
         return joint
 
+    def fingerprint(self) -> str:
+        """Content hash of everything physics_validate's checks depend on:
+        the root and every link's and joint's fingerprint, by name. Two
+        assemblies with the same fingerprint validate identically."""
+        blob = json.dumps({"root": self.root,
+                           "links": {n: l.fingerprint() for n, l in self.links.items()},
+                           "joints": {n: j.fingerprint() for n, j in self.joints.items()}},
+                          sort_keys=True).encode("utf-8")
+        return hashlib.blake2b(blob, digest_size=16).hexdigest()
+
     # -- kinematics -----------------------------------------------------
     @staticmethod
     def _joint_local_transform(joint: Joint, actuation: float) -> np.ndarray:
@@ -138,6 +319,10 @@ class Assembly:
             a = actuation.get(jname, 0.0)
             transforms[child] = transforms[parent] @ self._joint_local_transform(joint, a)
 
+        self._raise_if_unreached(transforms)
+        return transforms
+
+    def _raise_if_unreached(self, transforms: dict):
         unreached = set(self.links) - set(transforms)
         if unreached:
             raise ValueError(
@@ -148,13 +333,227 @@ class Assembly:
                 "or give each one its own separate Assembly/export_model call if it "
                 "really is an independent, unconnected body."
             )
-        return transforms
 
-    def world_mesh(self, link_name: str, transforms: Optional[dict] = None) -> trimesh.Trimesh:
+    # -- batched kinematics -----------------------------------------------
+    # Everything below evaluates N configurations at once as (N,4,4) stacks
+    # instead of looping forward_kinematics() in Python -- that loop is
+    # what makes IK over thousands of targets (or a workspace sweep over
+    # millions of samples) impractically slow.
+    @staticmethod
+    def _joint_local_transforms(joint: Joint, actuation) -> np.ndarray:
+        """Batched _joint_local_transform: (N,) actuation values -> (N,4,4)
+        parent-link-frame -> child-link-frame transforms."""
+        q = np.atleast_1d(np.asarray(actuation, dtype=float))
+        T0 = trimesh.transformations.compose_matrix(
+            angles=np.radians(joint.origin_rpy_deg), translate=joint.origin_xyz
+        )
+        out = np.broadcast_to(T0, (len(q), 4, 4)).copy()
+        if joint.joint_type in ("revolute", "continuous", "gear"):
+            axis = np.asarray(joint.axis, dtype=float)
+            axis = axis / np.linalg.norm(axis)
+            K = np.array([[0.0, -axis[2], axis[1]],
+                          [axis[2], 0.0, -axis[0]],
+                          [-axis[1], axis[0], 0.0]])
+            # Rodrigues: R = I + sin(q) K + (1 - cos(q)) K^2
+            R = (np.eye(3) + np.sin(q)[:, None, None] * K
+                 + (1.0 - np.cos(q))[:, None, None] * (K @ K))
+            out[:, :3, :3] = T0[:3, :3] @ R
+        elif joint.joint_type == "prismatic":
+            axis = np.asarray(joint.axis, dtype=float)
+            axis = axis / np.linalg.norm(axis)
+            out[:, :3, 3] = T0[:3, 3] + (q[:, None] * axis) @ T0[:3, :3].T
+        return out
+
+    def _batch_fk(self, actuation: Optional[dict], n: Optional[int], links=None):
+        """Shared core of batch_forward_kinematics/batch_jacobian. Returns
+        ({link: (N,4,4)}, {joint: (N,4,4) joint frame before actuation})."""
+        actuation = actuation or {}
+        if n is None:
+            sizes = {np.size(v) for v in actuation.values() if np.ndim(v) > 0}
+            if len(sizes) > 1:
+                raise ValueError(f"batch actuation arrays have mismatched lengths {sorted(sizes)}")
+            n = sizes.pop() if sizes else 1
+        needed = None
+        if links is not None:
+            needed = set(links)
+            for l in links:
+                needed |= nx.ancestors(self.graph, l)
+        transforms = {self.root: np.broadcast_to(np.eye(4), (n, 4, 4))}
+        joint_frames = {}
+        for parent, child in nx.bfs_tree(self.graph, self.root).edges():
+            if needed is not None and child not in needed:
+                continue
+            jname = self.graph.edges[parent, child]["joint"]
+            joint = self.joints[jname]
+            q = np.broadcast_to(np.asarray(actuation.get(jname, 0.0), dtype=float), (n,))
+            local = self._joint_local_transforms(joint, q)
+            transforms[child] = transforms[parent] @ local
+            T0 = trimesh.transformations.compose_matrix(
+                angles=np.radians(joint.origin_rpy_deg), translate=joint.origin_xyz
+            )
+            joint_frames[jname] = transforms[parent] @ T0
+        if needed is None:
+            self._raise_if_unreached(transforms)
+        return transforms, joint_frames
+
+    def batch_forward_kinematics(self, actuation: Optional[dict] = None,
+                                 n: Optional[int] = None, links=None) -> dict:
+        """{link_name: (N,4,4) world transforms} for N configurations at
+        once. `actuation` maps joint name -> (N,) array (or a scalar, held
+        for every configuration); N is inferred from the arrays unless
+        given. Pass `links` to only evaluate the chains leading to those
+        links -- a 6-joint arm's end effector doesn't need the other
+        branches of a 40-link robot."""
+        return self._batch_fk(actuation, n, links)[0]
+
+    def chain_joints(self, link_name: str) -> list:
+        """The movable joints on the path root -> `link_name`, root first.
+        These are the degrees of freedom that move that link."""
+        path = nx.shortest_path(self.graph, self.root, link_name)
+        chain = [self.joint_between(p, c) for p, c in zip(path[:-1], path[1:])]
+        return [j for j in chain if j.joint_type in ("revolute", "continuous", "prismatic")]
+
+    def batch_jacobian(self, link_name: str, actuation: Optional[dict] = None,
+                       point=(0.0, 0.0, 0.0), n: Optional[int] = None) -> np.ndarray:
+        """(N, 6, n_dof) geometric Jacobian of `point` (given in
+        `link_name`'s local frame) with respect to chain_joints(link_name),
+        rows = (linear velocity xyz, angular velocity xyz) in the world
+        frame. Derived analytically from each joint's world axis a and
+        origin o: revolute columns are (a x (p - o), a), prismatic columns
+        are (a, 0)."""
+        chain = self.chain_joints(link_name)
+        transforms, frames = self._batch_fk(actuation, n, [link_name])
+        T_link = transforms[link_name]
+        p = T_link[:, :3, :3] @ np.asarray(point, dtype=float) + T_link[:, :3, 3]
+        J = np.zeros((len(T_link), 6, len(chain)))
+        for k, joint in enumerate(chain):
+            F = frames[joint.name]
+            axis = np.asarray(joint.axis, dtype=float)
+            a = F[:, :3, :3] @ (axis / np.linalg.norm(axis))
+            if joint.joint_type == "prismatic":
+                J[:, :3, k] = a
+            else:
+                J[:, :3, k] = np.cross(a, p - F[:, :3, 3])
+                J[:, 3:, k] = a
+        return J
+
+    def jacobian(self, link_name: str, actuation: Optional[dict] = None,
+                 point=(0.0, 0.0, 0.0)) -> np.ndarray:
+        """(6, n_dof) geometric Jacobian at a single configuration; see
+        batch_jacobian."""
+        return self.batch_jacobian(link_name, actuation, point, n=1)[0]
+
+    def inverse_kinematics(self, link_name: str, targets, initial=None,
+                           point=(0.0, 0.0, 0.0), max_iter: int = 200,
+                           tolerance: float = 1e-4, angle_tolerance: float = 1e-3,
+                           damping: float = 0.05, orientation_weight: float = 0.1,
+                           max_step: float = 0.5) -> "IKResult":
+        """Damped-least-squares IK for many targets at once.
+
+        `targets` is (N,3) world positions for `point` on `link_name`, or
+        (N,4,4) world poses to also match orientation. Every iteration runs
+        one batched FK + Jacobian over all still-unconverged targets and
+        solves dq = J^T (J J^T + damping^2 I)^-1 e for all of them together,
+        then clips each joint to its lower/upper limit (continuous joints
+        are wrapped to [-pi, pi] instead). `orientation_weight` trades
+        radians of orientation error against metres of position error.
+
+        DLS rather than a plain pseudo-inverse so that targets near or past
+        the edge of the workspace (singular J) still take bounded steps --
+        those come back with converged=False and their best-effort pose,
+        rather than blowing up. `initial` seeds every target ((n_dof,) or
+        (N, n_dof)); default is the rest pose clipped into limits.
+        """
+        from scipy.spatial.transform import Rotation
+
+        chain = self.chain_joints(link_name)
+        names = [j.name for j in chain]
+        targets = np.asarray(targets, dtype=float)
+        with_orientation = targets.ndim == 3
+        if with_orientation and targets.shape[1:] != (4, 4) or \
+                not with_orientation and (targets.ndim != 2 or targets.shape[1] != 3):
+            raise ValueError(f"targets must be (N,3) positions or (N,4,4) poses, got {targets.shape}")
+        N, n_dof = len(targets), len(chain)
+        if n_dof == 0:
+            raise ValueError(f"link '{link_name}' has no movable joints between it and root "
+                             f"'{self.root}' -- there is nothing for IK to solve for")
+
+        lo = np.array([-np.inf if j.lower is None or j.joint_type == "continuous" else j.lower
+                       for j in chain])
+        hi = np.array([np.inf if j.upper is None or j.joint_type == "continuous" else j.upper
+                       for j in chain])
+        wrap = np.array([j.joint_type == "continuous" for j in chain])
+        q = np.zeros((N, n_dof)) if initial is None else \
+            np.broadcast_to(np.asarray(initial, dtype=float), (N, n_dof)).copy()
+        q = np.clip(q, lo, hi)
+
+        target_pos = targets[:, :3, 3] if with_orientation else targets
+        pos_err = np.full(N, np.inf)
+        ang_err = np.zeros(N)
+        converged = np.zeros(N, dtype=bool)
+        active = np.arange(N)
+        iterations = 0
+        for iterations in range(1, max_iter + 1):
+            qa = q[active]
+            act = {name: qa[:, k] for k, name in enumerate(names)}
+            T_link = self._batch_fk(act, len(active), [link_name])[0][link_name]
+            p = T_link[:, :3, :3] @ np.asarray(point, dtype=float) + T_link[:, :3, 3]
+            e_pos = target_pos[active] - p
+            pos_err[active] = np.linalg.norm(e_pos, axis=1)
+            ok = pos_err[active] <= tolerance
+            if with_orientation:
+                R_err = targets[active, :3, :3] @ np.transpose(T_link[:, :3, :3], (0, 2, 1))
+                e_rot = Rotation.from_matrix(R_err).as_rotvec()
+                ang_err[active] = np.linalg.norm(e_rot, axis=1)
+                ok &= ang_err[active] <= angle_tolerance
+                e = np.concatenate([e_pos, orientation_weight * e_rot], axis=1)
+            else:
+                e = e_pos
+            converged[active[ok]] = True
+            active = active[~ok]
+            if len(active) == 0:
+                break
+            e = e[~ok]
+            qa = qa[~ok]
+
+            J = self.batch_jacobian(link_name, {name: qa[:, k] for k, name in enumerate(names)},
+                                    point, n=len(active))
+            if with_orientation:
+                J[:, 3:, :] *= orientation_weight
+            else:
+                J = J[:, :3, :]
+            JJt = J @ np.transpose(J, (0, 2, 1))
+            JJt += (damping ** 2) * np.eye(JJt.shape[1])
+            dq = np.einsum("nji,nj->ni", J, np.linalg.solve(JJt, e[..., None])[..., 0])
+            step = np.max(np.abs(dq), axis=1, keepdims=True)
+            dq *= np.minimum(1.0, max_step / np.maximum(step, 1e-12))
+            qa = qa + dq
+            qa[:, wrap] = (qa[:, wrap] + np.pi) % (2 * np.pi) - np.pi
+            q[active] = np.clip(qa, lo, hi)
+
+        # Targets still unconverged took one more step after their errors
+        # were measured; report the errors of the q actually returned.
+        if len(active):
+            qa = q[active]
+            T_link = self._batch_fk({name: qa[:, k] for k, name in enumerate(names)},
+                                    len(active), [link_name])[0][link_name]
+            p = T_link[:, :3, :3] @ np.asarray(point, dtype=float) + T_link[:, :3, 3]
+            pos_err[active] = np.linalg.norm(target_pos[active] - p, axis=1)
+            if with_orientation:
+                R_err = targets[active, :3, :3] @ np.transpose(T_link[:, :3, :3], (0, 2, 1))
+                ang_err[active] = np.linalg.norm(Rotation.from_matrix(R_err).as_rotvec(), axis=1)
+
+        return IKResult(link_name, names, q, converged, pos_err,
+                        ang_err if with_orientation else None, iterations)
+
+    def world_mesh(self, link_name: str, transforms: Optional[dict] = None) -> "PosedMesh":
+        """The link's mesh placed at its world pose, as a lazy PosedMesh
+        view (no copy): vertices are only transformed if something asks
+        for them, and containment queries run in the link's local frame
+        against the shared base mesh, so its cached BVH/normals survive
+        from one pose to the next."""
         transforms = transforms if transforms is not None else self.forward_kinematics()
-        m = self.links[link_name].mesh.copy()
-        m.apply_transform(transforms[link_name])
-        return m
+        return PosedMesh(self.links[link_name].mesh, transforms[link_name])
 
     def all_world_meshes(self, actuation: Optional[dict] = None) -> dict:
         t = self.forward_kinematics(actuation)
@@ -175,6 +574,136 @@ class Assembly:
     def movable_joints(self) -> list:
         return [j for j in self.joints.values() if j.joint_type in ("revolute", "continuous", "prismatic")]
 
+    # -- snapshots ------------------------------------------------------
+    def save(self, path: str) -> str:
+        """Snapshot the whole assembly -- links (with mesh buffers, density,
+        colour, cached mass properties, signed-distance grids and hulls), joints
+        and the root -- into ONE
+        file that Assembly.load can memory-map. See _SNAPSHOT_MAGIC for
+        the layout. Returns `path`."""
+        buffers, links_meta = [], []
+        offset = 0
+
+        def _add_buffer(arr):
+            nonlocal offset
+            arr = np.ascontiguousarray(arr)
+            offset = _align(offset)
+            desc = {"offset": offset, "dtype": arr.dtype.str, "shape": list(arr.shape)}
+            buffers.append((offset, arr))
+            offset += arr.nbytes
+            return desc
+
+        for link in self.links.values():
+            meta = {f.name: getattr(link, f.name) for f in fields(Link)
+                    if f.name != "mesh" and not f.name.startswith("_")}
+            meta["mass"] = link._mass_cache
+            meta["buffers"] = {"vertices": _add_buffer(np.asarray(link.mesh.vertices, dtype=np.float64)),
+                               "faces": _add_buffer(np.asarray(link.mesh.faces, dtype=np.int64))}
+            grid = link._sdf_cache
+            meta["sdf"] = None if grid is None else {
+                "origin": np.asarray(grid.origin).tolist(), "spacing": grid.spacing,
+                "band": grid.band, "mesh_bounds": np.asarray(grid.mesh_bounds).tolist(),
+                "values": _add_buffer(grid.values)}
+            meta["hull"] = None if link._hull_cache is None else _add_buffer(link._hull_cache)
+            links_meta.append(meta)
+
+        header = json.dumps({
+            "version": _SNAPSHOT_VERSION,
+            "name": self.name,
+            "root": self.root,
+            "links": links_meta,
+            "joints": [asdict(j) for j in self.joints.values()],
+        }).encode("utf-8")
+        data_start = _align(len(_SNAPSHOT_MAGIC) + 8 + len(header))
+        with open(path, "wb") as fh:
+            fh.write(_SNAPSHOT_MAGIC)
+            fh.write(struct.pack("<Q", len(header)))
+            fh.write(header)
+            for off, arr in buffers:
+                fh.seek(data_start + off)
+                fh.write(arr.tobytes())
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "Assembly":
+        """Rebuild an Assembly written by save(). The file is mapped, not
+        read: every mesh's vertex/face (and SDF grid and hull) arrays are
+        copy-on-write views straight into the mapping, so loading costs
+        one JSON parse regardless of mesh size and the OS only pages a
+        mesh in the first time something touches it. Cached mass properties come back too,
+        so mass_props() doesn't recompute either. Editing a loaded mesh
+        in place is safe -- the copy-on-write mapping never writes back to
+        the file."""
+        with open(path, "rb") as fh:
+            if fh.read(len(_SNAPSHOT_MAGIC)) != _SNAPSHOT_MAGIC:
+                raise ValueError(f"'{path}' is not an Assembly snapshot (bad magic bytes)")
+            (header_len,) = struct.unpack("<Q", fh.read(8))
+            header = json.loads(fh.read(header_len).decode("utf-8"))
+            if header.get("version") != _SNAPSHOT_VERSION:
+                raise ValueError(f"'{path}' is snapshot version {header.get('version')}, "
+                                 f"this code reads version {_SNAPSHOT_VERSION} -- re-save it")
+            data = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_COPY)
+        data_start = _align(len(_SNAPSHOT_MAGIC) + 8 + header_len)
+
+        def _view(desc):
+            dtype = np.dtype(desc["dtype"])
+            count = int(np.prod(desc["shape"]))
+            return np.frombuffer(data, dtype=dtype, count=count,
+                                 offset=data_start + desc["offset"]).reshape(desc["shape"])
+
+        asm = cls(header["name"])
+        for meta in header["links"]:
+            bufs = meta.pop("buffers")
+            mass = meta.pop("mass")
+            sdf = meta.pop("sdf")
+            hull = meta.pop("hull", None)
+            meta["color"] = tuple(meta["color"])
+            mesh = trimesh.Trimesh(vertices=_view(bufs["vertices"]), faces=_view(bufs["faces"]),
+                                   process=False, validate=False)
+            link = Link(mesh=mesh, **meta)
+            link._mass_cache = mass
+            if sdf is not None:
+                import mesh_utils
+                link._sdf_cache = mesh_utils.SignedDistanceGrid(
+                    np.asarray(sdf["origin"]), sdf["spacing"], _view(sdf["values"]), sdf["band"],
+                    np.asarray(sdf["mesh_bounds"]), mesh)
+            if hull is not None:
+                link._hull_cache = _view(hull)
+            asm.add_link(link)
+        asm.root = header["root"]
+        for meta in header["joints"]:
+            for key in ("origin_xyz", "origin_rpy_deg", "axis"):
+                meta[key] = tuple(meta[key])
+            asm.add_joint(Joint(**meta))
+        return asm
+
+
+# Snapshot layout (Assembly.save/load): magic, little-endian uint64 header
+# length, UTF-8 JSON header, then raw array buffers each starting on a
+# 64-byte boundary so they can be viewed in place from a memory map. Buffer
+# offsets in the header are relative to the first aligned byte after it.
+_SNAPSHOT_MAGIC = b"MDASNAP\x00"
+_SNAPSHOT_VERSION = 1
+
+
+def _align(n: int, to: int = 64) -> int:
+    return (n + to - 1) // to * to
+
+
+def joint_range(joint: Joint) -> tuple:
+    """Finite (lower, upper) actuation range of a movable joint, in radians
+    or metres, for anything that has to SAMPLE a joint's motion (workspace
+    analysis, configuration-space sweeps). Missing limits fall back to the
+    same defaults physics_validate.sweep_test uses: +/-30 deg revolute,
+    +/-5 cm prismatic, a full turn for continuous joints."""
+    if joint.joint_type == "continuous":
+        return -np.pi, np.pi
+    if joint.joint_type == "prismatic":
+        return (joint.lower if joint.lower is not None else -0.05,
+                joint.upper if joint.upper is not None else 0.05)
+    return (joint.lower if joint.lower is not None else np.radians(-30.0),
+            joint.upper if joint.upper is not None else np.radians(30.0))
+
 
 # ---------------------------------------------------------------------------
 # Reverse-engineering heuristic: guess a revolute axis from where two parts
@@ -206,7 +735,137 @@ def estimate_joint_axis_from_contact(mesh_a: trimesh.Trimesh, mesh_b: trimesh.Tr
             "mesh_b -- the parts may not actually be in contact. Widen "
             "`tolerance` or check that the two parts were placed correctly."
         )
-    centroid = close.mean(axis=0)
-    _, _, vt = np.linalg.svd(close - centroid)
-    axis = vt[-1]
+    centroid, axis, _ = _fit_contact_patch(close)
     return centroid, axis
+
+
+def _fit_contact_patch(points: np.ndarray):
+    """PCA plane fit of a contact patch: (centroid, normal, singular values
+    in descending order). The normal is the smallest-variance direction."""
+    centroid = points.mean(axis=0)
+    _, s, vt = np.linalg.svd(points - centroid, full_matrices=False)
+    return centroid, vt[-1], s
+
+
+# ---------------------------------------------------------------------------
+# Whole-assembly version of the above: propose every joint at once from a
+# pile of parts placed in a common frame.
+# ---------------------------------------------------------------------------
+
+def sweep_and_prune(bounds: dict, margin: float = 0.0) -> list:
+    """AABB broad phase: every pair of names in `bounds` ({name: (2,3)
+    [min, max] array}) whose boxes, each grown by `margin`, overlap.
+
+    Sort-and-sweep along x, then a vectorised y/z test over only the boxes
+    whose x-intervals overlap -- O(n log n + candidates) rather than
+    testing all n^2 pairs. Pairs come back in the order of `bounds`
+    (a before b iff a was listed first), so callers' output is stable.
+    """
+    names = list(bounds)
+    if len(names) < 2:
+        return []
+    order = {n: i for i, n in enumerate(names)}
+    b = np.array([np.asarray(bounds[n], dtype=float) for n in names])
+    lo, hi = b[:, 0] - margin, b[:, 1] + margin
+    by_x = np.argsort(lo[:, 0], kind="stable")
+    lo_x_sorted = lo[by_x, 0]
+    pairs = []
+    for rank, i in enumerate(by_x):
+        end = np.searchsorted(lo_x_sorted, hi[i, 0], side="right")
+        cand = by_x[rank + 1:end]
+        if len(cand) == 0:
+            continue
+        ok = np.all((lo[cand, 1:] <= hi[i, 1:]) & (hi[cand, 1:] >= lo[i, 1:]), axis=1)
+        for j in cand[ok]:
+            a_, b_ = sorted((names[i], names[j]), key=order.__getitem__)
+            pairs.append((a_, b_))
+    pairs.sort(key=lambda p: (order[p[0]], order[p[1]]))
+    return pairs
+
+
+@dataclass
+class ProposedJoint:
+    """A candidate joint found by discover_joints. `origin`/`axis` are in
+    the common frame the input meshes were given in -- convert `origin`
+    into the parent link's frame before building a kinematics.Joint."""
+    part_a: str
+    part_b: str
+    origin: np.ndarray
+    axis: np.ndarray
+    confidence: float               # 0..1, see discover_joints
+    n_contact_points: int
+
+    def __str__(self):
+        o, a = self.origin, self.axis
+        return (f"{self.part_a} <-> {self.part_b}: origin ({o[0]:.4f}, {o[1]:.4f}, {o[2]:.4f}) "
+                f"axis ({a[0]:.3f}, {a[1]:.3f}, {a[2]:.3f}), confidence {self.confidence:.2f} "
+                f"({self.n_contact_points} contact pts)")
+
+
+def discover_joints(meshes: dict, tolerance: float = 2e-3, n_surface_samples: int = 4000,
+                    min_points: int = 6, seed: int = 0) -> list:
+    """Batch estimate_joint_axis_from_contact over every part at once.
+
+    `meshes` maps part name -> trimesh.Trimesh, all placed in ONE common
+    frame (e.g. as reconstructed from photos). Steps:
+        1. AABB broad phase (sweep_and_prune, boxes grown by `tolerance`)
+           -> only pairs whose boxes touch are looked at.
+        2. Per part, ONCE: a cKDTree over its vertices plus
+           `n_surface_samples` area-weighted points sampled on its faces
+           (vertices alone miss the middle of large flat faces, which is
+           exactly where a bearing face or bolt pad tends to be).
+        3. Per candidate pair: only the points of each part that fall
+           inside the overlap of the two grown boxes are queried against
+           the other part's tree, so cost follows the contact region's
+           size, not the parts' total size.
+        4. The near-contact points from both sides go through the same
+           PCA plane fit as estimate_joint_axis_from_contact.
+
+    `confidence` multiplies how planar the patch is (1 - s3/s2 of its
+    singular values: a bearing ring is flat, a glancing edge contact is
+    not) by how well supported it is (saturating at 50 points). Treat
+    anything under ~0.5 as "these parts touch" rather than "this is a
+    revolute joint". Returned best-first; pairs with fewer than
+    `min_points` near-contact points are dropped.
+    """
+    from scipy.spatial import cKDTree
+    bounds = {name: m.bounds for name, m in meshes.items()}
+    candidates = sweep_and_prune(bounds, margin=tolerance)
+
+    cloud, trees = {}, {}
+
+    def _points(name):
+        if name not in cloud:
+            m = meshes[name]
+            if n_surface_samples > 0 and len(m.faces):
+                # Seeded per part name, so a part's samples don't depend on
+                # which pair happened to touch it first.
+                samples, _ = trimesh.sample.sample_surface(
+                    m, n_surface_samples, seed=[seed, zlib.crc32(name.encode())])
+                cloud[name] = np.vstack([m.vertices, samples])
+            else:
+                cloud[name] = np.asarray(m.vertices)
+            trees[name] = cKDTree(cloud[name])
+        return cloud[name], trees[name]
+
+    proposals = []
+    for a, b in candidates:
+        lo = np.maximum(bounds[a][0], bounds[b][0]) - tolerance
+        hi = np.minimum(bounds[a][1], bounds[b][1]) + tolerance
+        pts_a, tree_a = _points(a)
+        pts_b, tree_b = _points(b)
+        near = []
+        for pts, other in ((pts_a, tree_b), (pts_b, tree_a)):
+            pts = pts[np.all((pts >= lo) & (pts <= hi), axis=1)]
+            if len(pts):
+                dist, _ = other.query(pts, k=1, distance_upper_bound=tolerance)
+                near.append(pts[dist < tolerance])
+        close = np.vstack(near) if near else np.zeros((0, 3))
+        if len(close) < min_points:
+            continue
+        centroid, axis, s = _fit_contact_patch(close)
+        planarity = 1.0 - s[2] / s[1] if s[1] > 0 else 0.0
+        confidence = float(np.clip(planarity, 0.0, 1.0) * min(1.0, len(close) / 50.0))
+        proposals.append(ProposedJoint(a, b, centroid, axis, confidence, len(close)))
+    proposals.sort(key=lambda p: -p.confidence)
+    return proposals
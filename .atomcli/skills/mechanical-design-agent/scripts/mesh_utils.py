@@ -21,10 +21,12 @@ gazebo_export.py; treat a "not watertight" result as a build error to fix,
 not a warning to note and move past.
 """
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import numpy as np
 import trimesh
 
+import profiling
+
 
 @dataclass
 class WatertightReport:
@@ -53,6 +55,7 @@ def _open_edge_count(mesh: trimesh.Trimesh) -> int:
     return int(np.sum(counts == 1))
 
 
+@profiling.profiled()
 def check_watertight(mesh: trimesh.Trimesh, name="part") -> WatertightReport:
     return WatertightReport(
         name=name,
@@ -65,6 +68,7 @@ def check_watertight(mesh: trimesh.Trimesh, name="part") -> WatertightReport:
     )
 
 
+@profiling.profiled()
 def repair_and_verify(mesh: trimesh.Trimesh, name="part") -> tuple[trimesh.Trimesh, WatertightReport]:
     """Try trimesh's standard repair pipeline, then re-check. Returns the
     (possibly-repaired) mesh and its final report. Raise-worthy failure is
@@ -94,6 +98,7 @@ def repair_and_verify(mesh: trimesh.Trimesh, name="part") -> tuple[trimesh.Trime
     return mesh, new_report
 
 
+@profiling.profiled()
 def mass_properties(mesh: trimesh.Trimesh, density=1000.0):
     """Volume, mass, center of mass, and inertia tensor (about the center of
     mass, in the mesh's own local frame) for a watertight mesh. Density
@@ -119,6 +124,661 @@ def mass_properties(mesh: trimesh.Trimesh, density=1000.0):
     }
 
 
+def transform_mass_properties(props: dict, T, density_scale: float = 1.0) -> dict:
+    """mass_properties of a mesh moved rigidly by the 4x4 `T` (and made of
+    a material `density_scale` times as dense), from the original's --
+    mass and inertia scale with density, the centre of mass moves with T
+    and the inertia tensor rotates (R I R^T). Lets congruent links share
+    one mass_properties computation."""
+    T = np.asarray(T, dtype=float)
+    R = T[:3, :3]
+    return {
+        "volume": props["volume"],
+        "mass": props["mass"] * density_scale,
+        "center_mass": (R @ np.asarray(props["center_mass"]) + T[:3, 3]).tolist(),
+        "inertia": (R @ np.asarray(props["inertia"]) @ R.T * density_scale).tolist(),
+    }
+
+
+def rigid_transform_between(a: trimesh.Trimesh, b: trimesh.Trimesh, tol: float = 1e-7):
+    """The 4x4 rigid motion T (rotation + translation, no reflection) with
+    b == T applied to a, vertex for vertex, or None if there isn't one.
+    Meshes must share their face array -- which a copied-then-moved mesh
+    does -- so the vertex correspondence is known and T is a Kabsch fit
+    checked to within `tol` times the mesh's size."""
+    va, vb = np.asarray(a.vertices, dtype=float), np.asarray(b.vertices, dtype=float)
+    if va.shape != vb.shape or not np.array_equal(a.faces, b.faces) or len(va) == 0:
+        return None
+    ca, cb = va.mean(axis=0), vb.mean(axis=0)
+    U, _, Vt = np.linalg.svd((va - ca).T @ (vb - cb))
+    D = np.diag([1.0, 1.0, np.sign(np.linalg.det(Vt.T @ U.T))])
+    R = Vt.T @ D @ U.T
+    T = np.eye(4)
+    T[:3, :3] = R
+    T[:3, 3] = cb - R @ ca
+    scale = max(float(np.ptp(va, axis=0).max()), 1e-12)
+    if np.abs(va @ R.T + T[:3, 3] - vb).max() > tol * scale:
+        return None
+    return T
+
+
+@profiling.profiled()
+def congruent_meshes(meshes: dict, tol: float = 1e-7) -> dict:
+    """Group meshes that are the same geometry up to a rigid motion ->
+    {name: (representative name, T)} for every mesh that has an earlier
+    congruent one (in `meshes`' order), T mapping the representative onto
+    it (None when they are identical outright). Candidates are bucketed by
+    face array and rounded edge lengths -- which a rigid motion keeps --
+    so only plausible pairs reach rigid_transform_between."""
+    import hashlib
+    buckets = {}
+    out = {}
+    for name, mesh in meshes.items():
+        verts = np.ascontiguousarray(mesh.vertices, dtype=np.float64)
+        faces = np.ascontiguousarray(mesh.faces, dtype=np.int64)
+        edges = np.linalg.norm(verts[faces] - verts[np.roll(faces, 1, axis=1)], axis=2)
+        h = hashlib.blake2b(faces.tobytes(), digest_size=16)
+        h.update(np.round(edges / max(float(edges.max(initial=0.0)), 1e-12), 6).tobytes())
+        for rep in buckets.setdefault(h.hexdigest(), []):
+            if np.array_equal(verts, meshes[rep].vertices):
+                out[name] = (rep, None)
+                break
+            T = rigid_transform_between(meshes[rep], mesh, tol)
+            if T is not None:
+                out[name] = (rep, T)
+                break
+        else:
+            buckets[h.hexdigest()].append(name)
+    return out
+
+
+@dataclass
+class SignedDistanceGrid:
+    """A mesh's signed distance field sampled once on a regular grid in the
+    mesh's OWN frame (negative inside, sdf_core's convention), so repeated
+    "is this point inside / how far is it" questions become vectorised
+    trilinear lookups instead of per-point ray casts. Build with
+    `signed_distance_grid`; kinematics.Link.sdf_grid() caches one per link.
+
+    Grid values are approximate: an interpolated `query` is within `band`
+    of the true signed distance. `contains` is nevertheless EXACT: points
+    whose grid value is within `band` of zero are re-answered by
+    `exact_signed_distance` (closest point on the mesh, signed with an
+    angle-weighted pseudo-normal), and almost every sample point of a part
+    is nowhere near another part's surface, so only a few points ever pay
+    for that.
+    """
+    origin: np.ndarray               # position of grid node [0,0,0], mesh frame
+    spacing: float
+    values: np.ndarray               # (X,Y,Z) float32 signed distances
+    band: float                      # max |interpolated - true| distance
+    mesh_bounds: np.ndarray          # (2,3) AABB of the source mesh
+    mesh: trimesh.Trimesh = field(default=None, repr=False, compare=False)
+    _pseudo_normals: tuple = field(default=None, repr=False, compare=False)
+
+    def query(self, points) -> np.ndarray:
+        """(N,) approximate signed distances (within +/- band). Points off
+        the grid get their distance to the mesh's AABB -- a lower bound on
+        their true (positive) distance."""
+        from scipy.ndimage import map_coordinates
+        p = np.asarray(points, dtype=float).reshape(-1, 3)
+        rel = (p - self.origin) / self.spacing
+        on_grid = np.all((rel >= 0) & (rel <= np.array(self.values.shape) - 1), axis=1)
+        out = np.empty(len(p))
+        if on_grid.any():
+            out[on_grid] = map_coordinates(self.values, rel[on_grid].T, order=1, mode="nearest")
+        if (~on_grid).any():
+            lo, hi = self.mesh_bounds
+            q = p[~on_grid]
+            out[~on_grid] = np.linalg.norm(np.maximum(np.maximum(lo - q, q - hi), 0.0), axis=1)
+        return out
+
+    def exact_signed_distance(self, points) -> np.ndarray:
+        """(N,) exact signed distances (negative inside): trimesh's
+        closest-point query (backed by the mesh's cached triangle tree),
+        signed by the face / edge / vertex pseudo-normal at the closest
+        point -- exact for a watertight, consistently-wound mesh, and far
+        cheaper than a ray-cast `contains` for points near the surface."""
+        p = np.asarray(points, dtype=float).reshape(-1, 3)
+        if len(p) == 0:
+            return np.zeros(0)
+        mesh = self.mesh
+        closest, dist, tri = trimesh.proximity.closest_point(mesh, p)
+        face_n, edge_n, vert_n = self._normals()
+        bary = trimesh.triangles.points_to_barycentric(mesh.triangles[tri], closest)
+        on_zero = bary < 1e-7
+        n_zero = on_zero.sum(axis=1)
+        normal = face_n[tri].copy()
+        edge = n_zero == 1
+        if edge.any():
+            # Barycentric weight ~0 at corner z -> the edge opposite z,
+            # which is trimesh's per-face edge index (z + 1) % 3.
+            z = np.argmax(on_zero[edge], axis=1)
+            edge_id = self.mesh.edges_unique_inverse[tri[edge] * 3 + (z + 1) % 3]
+            normal[edge] = edge_n[edge_id]
+        vert = n_zero >= 2
+        if vert.any():
+            corner = np.argmax(bary[vert], axis=1)
+            normal[vert] = vert_n[mesh.faces[tri[vert], corner]]
+        inside = np.einsum("ij,ij->i", p - closest, normal) < 0
+        return np.where(inside, -dist, dist)
+
+    def min_signed_distance(self, points, upper=np.inf, lower=None, batch=64) -> tuple:
+        """Exact minimum signed distance over (N,3) points -> (distance,
+        index of the point attaining it): the closest approach when
+        positive, minus the deepest penetration when negative. Returns
+        (upper, -1) if no point gets below `upper`.
+
+        Points are refined with `exact_signed_distance` a batch at a time,
+        in order of their lower bound (`distance_bound`'s, or `lower` if
+        the caller already has one), until no remaining bound can beat the
+        best. Every exact answer also tightens its neighbours' bounds --
+        signed distance is 1-Lipschitz, so a point x can't be closer than
+        d(p) - |x - p| -- which is what keeps the refined set small when a
+        whole part sits within the grid's error band of another."""
+        from scipy.spatial import cKDTree
+        p = np.asarray(points, dtype=float).reshape(-1, 3)
+        if lower is None:
+            lower = self.query(p) - self.band
+        lower = np.array(lower, dtype=float)
+        done = np.zeros(len(p), dtype=bool)
+        best, best_i, tree = upper, -1, None
+        while True:
+            open_ = np.flatnonzero(~done & (lower < best))
+            if len(open_) == 0:
+                break
+            idx = open_[np.argsort(lower[open_])[:batch]]
+            exact = self.exact_signed_distance(p[idx])
+            done[idx] = True
+            j = int(np.argmin(exact))
+            if exact[j] < best:
+                best, best_i = float(exact[j]), int(idx[j])
+            if tree is None:
+                tree = cKDTree(p)
+            radii = exact - best
+            for i, d, nb in zip(idx, exact, tree.query_ball_point(p[idx], r=np.maximum(radii, 0.0))):
+                if nb:
+                    nb = np.asarray(nb)
+                    np.maximum.at(lower, nb, d - np.linalg.norm(p[nb] - p[i], axis=1))
+        return best, best_i
+
+    def _normals(self):
+        if self._pseudo_normals is None:
+            mesh = self.mesh
+            face_n = np.asarray(mesh.face_normals)
+            edge_n = np.zeros((len(mesh.edges_unique), 3))
+            np.add.at(edge_n, mesh.edges_unique_inverse, face_n[mesh.edges_face])
+            vert_n = np.zeros((len(mesh.vertices), 3))
+            np.add.at(vert_n, mesh.faces, face_n[:, None, :] * mesh.face_angles[:, :, None])
+            self._pseudo_normals = (face_n, edge_n, vert_n)
+        return self._pseudo_normals
+
+    def contains(self, points) -> np.ndarray:
+        """(N,) bool, exact: grid sign where the grid is sure, the exact
+        closest-point sign inside the uncertainty band."""
+        return self.distance_bound(points)[1]
+
+    def distance_bound(self, points) -> tuple:
+        """(lower_bound, inside) for (N,3) points: a guaranteed lower bound
+        on each point's signed distance (exact for points within `band` of
+        the surface, grid value minus `band` elsewhere) and the exact
+        `contains` answer. This is what lets a sweep take provably safe
+        steps: no point can reach the surface before it has moved
+        `lower_bound`."""
+        p = np.asarray(points, dtype=float).reshape(-1, 3)
+        d = self.query(p)
+        lower = d - self.band
+        inside = d < 0
+        unsure = np.abs(d) < self.band
+        if unsure.any():
+            exact = self.exact_signed_distance(p[unsure])
+            lower[unsure] = exact
+            # A point ON the surface (to round-off) is touching, not inside
+            # -- e.g. two coincident faces must not read as interpenetrating.
+            inside[unsure] = exact < -1e-6 * self.spacing
+        return lower, inside
+
+
+def _surface_lattice(mesh: trimesh.Trimesh, step: float):
+    """Points covering every triangle so that no surface point is more than
+    ~0.7*step from one, plus each point's source face index.
+
+    Each triangle gets its own (n_u+1) x (n_v+1) lattice: rows parallel to
+    its longest edge, `step` apart in height, each with points `step`
+    apart along the edge. Sized by length AND height rather than by the
+    longest edge alone, so the long slivers a fan-triangulated cap is made
+    of cost points in proportion to their area, not their length squared.
+    Fully vectorised over all triangles at once."""
+    tris = np.asarray(mesh.triangles)
+    edge_len = np.linalg.norm(tris - np.roll(tris, -1, axis=1), axis=2)   # edge k: corner k -> k+1
+    k = np.argmax(edge_len, axis=1)
+    rows = np.arange(len(tris))[:, None]
+    tris = tris[rows, (k[:, None] + np.arange(3)) % 3]                      # longest edge is now 0 -> 1
+    length = edge_len[rows[:, 0], k]
+    height = 2.0 * np.asarray(mesh.area_faces) / np.maximum(length, 1e-300)
+    n_u = np.maximum(np.ceil(length / step).astype(np.int64), 1)
+    n_v = np.maximum(np.ceil(height / step).astype(np.int64), 1)
+    counts = (n_u + 1) * (n_v + 1)
+    face = np.repeat(np.arange(len(tris)), counts)
+    local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    u = (local % (n_u + 1)[face]) / n_u[face]
+    v = (local // (n_u + 1)[face]) / n_v[face]
+    t = tris[face]
+    base = (1.0 - u)[:, None] * t[:, 0] + u[:, None] * t[:, 1]
+    return (1.0 - v)[:, None] * base + v[:, None] * t[:, 2], face
+
+
+@profiling.profiled()
+def signed_distance_grid(mesh: trimesh.Trimesh, max_cells: int = 48, padding_cells: int = 2) -> SignedDistanceGrid:
+    """Sample `mesh`'s signed distance field on a grid with `max_cells`
+    cells along its longest side (plus `padding_cells` on every side).
+
+    Built without a per-node closest-point or ray query (that would cost
+    seconds per link):
+        1. every node nearest to a point of a lattice laid over each
+           triangle at 1/3-cell pitch is marked as "shell" -- fine enough
+           that the shell is a closed barrier between inside and outside
+        2. a flood fill from the grid border (scipy binary_fill_holes)
+           marks every non-shell node inside or outside
+        3. a Euclidean distance transform gives every non-shell node its
+           distance to the shell; shell nodes take their distance to the
+           closest lattice point that snapped to them, signed by that
+           point's face
+    Every interpolated value is then within ~3 cells of the truth, which
+    is recorded as `band`. Requires a watertight mesh, like
+    mass_properties.
+    """
+    from scipy import ndimage
+    if not mesh.is_watertight:
+        raise ValueError("signed_distance_grid needs a watertight mesh -- inside/outside "
+                         "is undefined otherwise. Run repair_and_verify first.")
+    lo, hi = mesh.bounds
+    spacing = float(np.max(hi - lo)) / max_cells
+    if spacing <= 0:
+        raise ValueError("signed_distance_grid: mesh has zero extent")
+    origin = lo - padding_cells * spacing
+    dims = np.ceil((hi - lo) / spacing).astype(int) + 2 * padding_cells + 1
+
+    dense, dense_face = _surface_lattice(mesh, spacing / 3)
+    idx = np.clip(np.rint((dense - origin) / spacing).astype(int), 0, dims - 1)
+    shell = np.zeros(tuple(dims), dtype=bool)
+    shell[idx[:, 0], idx[:, 1], idx[:, 2]] = True
+
+    inside = ndimage.binary_fill_holes(shell) & ~shell
+    dist_cells = ndimage.distance_transform_edt(~shell)
+    values = np.where(inside, -dist_cells, dist_cells) * spacing
+
+    # Shell nodes: distance to the closest lattice point that snapped to
+    # them (one sort, no KD-tree over what can be ~10^6 lattice points),
+    # signed by that point's face normal.
+    node_pts = origin + idx * spacing
+    dist = np.linalg.norm(dense - node_pts, axis=1)
+    lin = np.ravel_multi_index(idx.T, tuple(dims))
+    order = np.lexsort((dist, lin))
+    first = order[np.r_[True, lin[order][1:] != lin[order][:-1]]]
+    side = np.einsum("ij,ij->i", node_pts[first] - dense[first], mesh.face_normals[dense_face[first]])
+    values.flat[lin[first]] = np.where(side < 0, -dist[first], dist[first])
+
+    return SignedDistanceGrid(origin, spacing, values.astype(np.float32), 3.0 * spacing,
+                              np.array([lo, hi]), mesh)
+
+
+def convex_hull_points(mesh: trimesh.Trimesh) -> np.ndarray:
+    """(H,3) vertices of `mesh`'s convex hull, built with csg_core.hull
+    (kinematics.Link.hull_points() caches one per link). manifold3d works
+    in float32, so its hull vertices -- always a subset of the mesh's --
+    are snapped back to the mesh's own float64 vertices: a hull a hair
+    smaller than the mesh would make gjk_distance's separation claims
+    wrong by that hair. A mesh manifold3d won't take (not watertight)
+    falls back to trimesh's qhull hull."""
+    import csg_core as csg
+    from scipy.spatial import cKDTree
+    verts = np.asarray(mesh.vertices, dtype=float)
+    try:
+        hull = csg.to_trimesh(csg.hull(csg.from_trimesh(mesh))).vertices
+    except csg.CSGError:
+        return np.array(mesh.convex_hull.vertices, dtype=float)
+    return verts[np.unique(cKDTree(verts).query(hull)[1])]
+
+
+def _support(points: np.ndarray, direction: np.ndarray) -> np.ndarray:
+    return points[np.argmax(points @ direction)]
+
+
+def _solve_small(G: list, r: list):
+    """Solve the n x n (n <= 3) system G x = r by Cramer's rule, in plain
+    floats -- np.linalg.solve's per-call overhead dwarfs systems this
+    small. None if G is (numerically) singular."""
+    n = len(G)
+    if n == 1:
+        return [r[0] / G[0][0]] if G[0][0] > 0 else None
+
+    def det(m):
+        if n == 2:
+            return m[0][0] * m[1][1] - m[0][1] * m[1][0]
+        return (m[0][0] * (m[1][1] * m[2][2] - m[1][2] * m[2][1])
+                - m[0][1] * (m[1][0] * m[2][2] - m[1][2] * m[2][0])
+                + m[0][2] * (m[1][0] * m[2][1] - m[1][1] * m[2][0]))
+    d = det(G)
+    scale = 1.0
+    for i in range(n):
+        scale *= G[i][i]
+    if abs(d) <= 1e-12 * scale:
+        return None
+    return [det([[r[i] if j == c else G[i][j] for j in range(n)] for i in range(n)]) / d
+            for c in range(n)]
+
+
+def _closest_on_simplex(simplex: np.ndarray) -> tuple:
+    """Closest point to the origin on the simplex spanned by the (k,3)
+    rows of `simplex` (k <= 4) -> (point, rows of the smallest face that
+    contains it). Faces are tried outright -- each a tiny linear solve
+    (on the simplex's Gram matrix) for the origin's projection onto its
+    affine hull, kept only if the projection's barycentric coordinates
+    are all non-negative -- which has no degenerate cases to get wrong,
+    unlike Johnson's case analysis. The closest face always contains the
+    newest (last) point, so the faces without it are only tried if
+    round-off leaves no other."""
+    k = len(simplex)
+    M = (simplex @ simplex.T).tolist()
+    best, best_face, best_lam = None, None, None
+    newest = 1 << (k - 1)
+    masks = [m for m in range(1, 2 ** k) if m & newest]
+    for mask in masks + [m for m in range(1, newest)]:
+        if best is not None and not mask & newest:
+            break
+        face = [i for i in range(k) if mask >> i & 1]
+        i0, rest = face[0], face[1:]
+        if rest:
+            G = [[M[i][j] - M[i][i0] - M[i0][j] + M[i0][i0] for j in rest] for i in rest]
+            mu = _solve_small(G, [M[i0][i0] - M[i][i0] for i in rest])
+            if mu is None or min(mu) < 0 or sum(mu) > 1:
+                continue
+            lam = [1.0 - sum(mu)] + mu
+        else:
+            lam = [1.0]
+        dist = sum(li * lj * M[i][j] for li, i in zip(lam, face) for lj, j in zip(lam, face))
+        if best is None or dist < best or (dist == best and len(face) < len(best_face)):
+            best, best_face, best_lam = dist, face, lam
+    return np.asarray(best_lam) @ simplex[best_face], simplex[best_face]
+
+
+def _gjk(a: np.ndarray, b: np.ndarray, tol: float, max_iter: int) -> tuple:
+    """GJK on the Minkowski difference A - B -> (lower bound on the
+    distance between conv(a) and conv(b), final simplex). The bound is
+    v.w / |v| for the current closest point v and the support point w
+    along -v -- every point x of A - B has x.v >= w.v -- so it is valid
+    whenever the loop stops, converged or not; 0 means overlapping or
+    within `tol` of touching."""
+    v = a[0] - b[0]
+    simplex = np.empty((0, 3))
+    lower = 0.0
+    for _ in range(max_iter):
+        norm = float(np.sqrt(v @ v))
+        if norm <= tol:
+            return 0.0, simplex
+        w = _support(a, -v) - _support(b, v)
+        lower = max(lower, float(w @ v) / norm)
+        if norm - lower <= tol or any(np.array_equal(w, s) for s in simplex):
+            break
+        v, simplex = _closest_on_simplex(np.vstack([simplex, w]))
+        if len(simplex) == 4:
+            return 0.0, simplex
+    return max(lower, 0.0), simplex
+
+
+def gjk_distance(a, b, tol: float = 1e-9, max_iter: int = 64) -> float:
+    """Distance between the convex hulls of point sets `a` (N,3) and `b`
+    (M,3), given in the same frame -- 0 when they touch or overlap.
+
+    GJK (Gilbert-Johnson-Keerthi) walks a simplex through the Minkowski
+    difference A - B towards the origin using only support points (one
+    argmax per hull per iteration), so it costs a handful of dot products
+    on hull vertices, not a closest-point query per sample point. The
+    value returned is a guaranteed LOWER bound, within `tol` of the true
+    distance once converged: two shapes whose hulls come out separated
+    cannot be closer than this."""
+    return _gjk(np.asarray(a, dtype=float), np.asarray(b, dtype=float), tol, max_iter)[0]
+
+
+def hull_signed_distance(a, b, tol: float = 1e-9, max_iter: int = 64) -> float:
+    """Signed distance between the convex hulls of `a` and `b`: the GJK
+    separation when they're apart, minus the penetration depth (shortest
+    translation that separates them, found by EPA) when they overlap."""
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    d, simplex = _gjk(a, b, tol, max_iter)
+    if d > 0:
+        return d
+    return -_epa_depth(a, b, simplex, tol, max_iter)
+
+
+def _epa_depth(a: np.ndarray, b: np.ndarray, simplex: np.ndarray, tol: float, max_iter: int) -> float:
+    """EPA (expanding polytope algorithm) for overlapping hulls: grow a
+    polytope inside A - B -- seeded with GJK's final simplex and the
+    support points along the six axis directions -- by the support point
+    along the normal of its face nearest the origin, until that face lies
+    on A - B's boundary; its distance to the origin is the penetration
+    depth. The polytope stays small, so it is simply rebuilt by qhull each
+    iteration instead of patched face by face."""
+    from scipy.spatial import ConvexHull, QhullError
+    dirs = np.vstack([np.eye(3), -np.eye(3)])
+    pts = np.vstack([simplex.reshape(-1, 3)] + [_support(a, d) - _support(b, -d) for d in dirs])
+    nearest = 0.0
+    for _ in range(max_iter):
+        try:
+            hull = ConvexHull(pts)
+        except QhullError:
+            return 0.0      # A - B is flat: nothing to be inside of
+        offsets = -hull.equations[:, 3]
+        i = int(np.argmin(offsets))
+        n, nearest = hull.equations[i, :3], float(offsets[i])
+        w = _support(a, n) - _support(b, -n)
+        if float(w @ n) - nearest <= tol:
+            break
+        pts = np.vstack([pts, w])
+    return max(nearest, 0.0)
+
+
+@dataclass
+class CollisionProxy:
+    """A cheap stand-in for a link's mesh in the physics engine's contact
+    solver (fit_collision_proxy). Every kind encloses the mesh, so a proxy
+    can add contacts the mesh wouldn't have, never miss one it would."""
+    kind: str                     # "sphere" | "box" | "cylinder" | "hull" | "decomposition" | "mesh"
+    volume_error: float           # (proxy volume - mesh volume) / mesh volume
+    size: tuple = ()              # sphere (r,), box (x, y, z), cylinder (r, length)
+    pose: np.ndarray = None       # (4,4) primitive frame in the mesh frame (cylinder axis = Z)
+    meshes: list = field(default_factory=list)   # hull / decomposition pieces, mesh frame
+
+    def __str__(self):
+        pieces = f" ({len(self.meshes)} hulls)" if self.kind == "decomposition" else ""
+        return f"{self.kind}{pieces}, volume error {self.volume_error * 100:.1f}%"
+
+
+@profiling.profiled()
+def fit_collision_proxy(mesh: trimesh.Trimesh, tolerance: float = 0.05, max_hulls: int = 8) -> CollisionProxy:
+    """Cheapest collision representation of `mesh` whose volume exceeds
+    the mesh's by at most `tolerance` (a fraction), tried in order of what
+    a contact solver pays for them: bounding sphere, oriented bounding
+    box, bounding cylinder (trimesh's minimum-volume fits), the convex
+    hull (csg_core.hull), then an approximate convex decomposition into
+    at most `max_hulls` hulls. The decomposition splits the piece whose
+    hull wastes the most volume in two (csg_core.split_by_plane, across
+    one of its bounding-box axes at one of its vertex levels -- concave
+    corners are vertices -- whichever leaves the least hull volume)
+    until the total is within tolerance. If nothing
+    fits, or the mesh isn't watertight (no volume to compare against),
+    the kind is "mesh": collide with the mesh itself."""
+    import csg_core as csg
+    if not mesh.is_watertight or mesh.volume <= 0:
+        return CollisionProxy("mesh", 0.0)
+    volume = float(mesh.volume)
+
+    def excess(proxy_volume):
+        return max(float(proxy_volume) / volume - 1.0, 0.0)
+
+    sphere = mesh.bounding_sphere.primitive
+    box = mesh.bounding_box_oriented.primitive
+    cylinder = mesh.bounding_cylinder.primitive
+    pose = np.eye(4)
+    pose[:3, 3] = sphere.center
+    for proxy in (CollisionProxy("sphere", excess(4.0 / 3.0 * np.pi * sphere.radius ** 3),
+                                 (float(sphere.radius),), pose),
+                  CollisionProxy("box", excess(np.prod(box.extents)),
+                                 tuple(float(e) for e in box.extents), np.array(box.transform)),
+                  CollisionProxy("cylinder", excess(np.pi * cylinder.radius ** 2 * cylinder.height),
+                                 (float(cylinder.radius), float(cylinder.height)),
+                                 np.array(cylinder.transform))):
+        if proxy.volume_error <= tolerance:
+            return proxy
+
+    try:
+        solid = csg.from_trimesh(mesh)
+        hulls = [csg.hull(solid)]
+    except csg.CSGError:
+        return CollisionProxy("mesh", 0.0)
+    hull_error = excess(hulls[0].volume())
+    if hull_error <= tolerance:
+        return CollisionProxy("hull", hull_error, meshes=[csg.to_trimesh(hulls[0])])
+
+    pieces = [solid]
+    waste = [hulls[0].volume() - solid.volume()]
+    while len(pieces) < max_hulls and sum(h.volume() for h in hulls) / volume - 1.0 > tolerance:
+        i = int(np.argmax(waste))
+        if waste[i] <= 0:
+            break
+        piece = csg.to_trimesh(pieces[i])
+        best = None
+        for axis in piece.bounding_box_oriented.primitive.transform[:3, :3].T:
+            levels = np.unique(np.round(piece.vertices @ axis, 9))[1:-1]
+            if len(levels) > 9:
+                levels = np.quantile(levels, np.linspace(0.1, 0.9, 9))
+            for offset in levels:
+                try:
+                    halves = csg.split_by_plane(pieces[i], axis, offset)
+                except csg.CSGError:
+                    continue
+                halves_hulls = [csg.hull(h) for h in halves]
+                total = sum(h.volume() for h in halves_hulls)
+                if best is None or total < best[0]:
+                    best = (total, halves, halves_hulls)
+        if best is None or best[0] >= hulls[i].volume():
+            waste[i] = 0.0          # no cut helps this piece; leave it whole
+            continue
+        _, halves, halves_hulls = best
+        pieces[i:i + 1] = halves
+        hulls[i:i + 1] = halves_hulls
+        waste[i:i + 1] = [h.volume() - p.volume() for h, p in zip(halves_hulls, halves)]
+
+    error = excess(sum(h.volume() for h in hulls))
+    if error > tolerance:
+        return CollisionProxy("mesh", 0.0)
+    return CollisionProxy("decomposition", error, meshes=[csg.to_trimesh(h) for h in hulls])
+
+
+@profiling.profiled()
+def decimate(mesh: trimesh.Trimesh, ratio: float) -> trimesh.Trimesh:
+    """A copy of `mesh` reduced to about `ratio` of its faces, for
+    level-of-detail visuals. Uses quadric decimation (fast_simplification,
+    imported lazily) when it's installed; otherwise vertex clustering --
+    vertices snapped to a grid whose cell size is bisected until the face
+    count lands near the target, each cell collapsed to its vertices'
+    mean and the faces that collapse dropped. Clustering is cruder and
+    may open the surface, so use the result for rendering only --
+    collision and inertia keep the full mesh."""
+    n = len(mesh.faces)
+    target = max(4, int(round(n * ratio)))
+    if target >= n:
+        return mesh.copy()
+    try:
+        import fast_simplification
+    except ImportError:
+        fast_simplification = None
+    if fast_simplification is not None:
+        v, f = fast_simplification.simplify(np.asarray(mesh.vertices, dtype=np.float64),
+                                            np.asarray(mesh.faces), target_reduction=1.0 - target / n)
+        return trimesh.Trimesh(v, f, process=False)
+
+    verts = np.asarray(mesh.vertices, dtype=float)
+    faces = np.asarray(mesh.faces)
+    lo = verts.min(axis=0)
+
+    def cluster(h):
+        cells = np.floor((verts - lo) / h).astype(np.int64)
+        dims = cells.max(axis=0) + 1
+        _, inverse = np.unique(np.ravel_multi_index(cells.T, dims), return_inverse=True)
+        f = inverse.reshape(-1)[faces]
+        f = f[(f[:, 0] != f[:, 1]) & (f[:, 1] != f[:, 2]) & (f[:, 0] != f[:, 2])]
+        _, keep = np.unique(np.sort(f, axis=1), axis=0, return_index=True)
+        return inverse.reshape(-1), f[np.sort(keep)]
+
+    h_lo, h_hi = 0.0, float(np.ptp(verts, axis=0).max())
+    best = None
+    for _ in range(24):
+        h = 0.5 * (h_lo + h_hi)
+        inverse, f = cluster(h)
+        if len(f) > target:
+            h_lo = h
+        else:
+            h_hi, best = h, (inverse, f)
+        if best is not None and len(best[1]) >= 0.9 * target:
+            break
+    if best is None:
+        best = cluster(h_hi)
+    inverse, f = best
+    counts = np.bincount(inverse)
+    v = np.stack([np.bincount(inverse, weights=verts[:, k]) for k in range(3)], axis=1) / counts[:, None]
+    out = trimesh.Trimesh(v, f, process=False)
+    out.remove_unreferenced_vertices()
+    return out
+
+
+@profiling.profiled()
+def simplify_hull(mesh: trimesh.Trimesh, max_faces: int) -> trimesh.Trimesh:
+    """A convex mesh of at most `max_faces` faces that still encloses
+    `mesh` (typically one of a CollisionProxy's hulls). The hull of a
+    decimated copy's vertices is scaled about its centroid by the least
+    factor that puts every vertex of the original hull back inside it --
+    so the result trades a little volume excess for fewer faces, and
+    keeps the proxy guarantee of never missing a contact."""
+    hull = mesh.convex_hull
+    max_faces = max(int(max_faces), 4)
+    if len(hull.faces) <= max_faces:
+        return hull
+    ratio = 0.9 * max_faces / len(hull.faces)
+    small = decimate(hull, ratio).convex_hull
+    while len(small.faces) > max_faces and ratio > 1e-3:
+        ratio *= 0.8
+        small = decimate(hull, ratio).convex_hull
+    if len(small.faces) > max_faces or small.volume <= 0:
+        return hull
+    c = small.centroid
+    normals = small.face_normals
+    offsets = np.einsum("ij,ij->i", normals, small.triangles[:, 0] - c)
+    scale = max(1.0, float(((hull.vertices - c) @ normals.T / offsets).max()))
+    return trimesh.Trimesh(c + (small.vertices - c) * scale, small.faces, process=False)
+
+
+@profiling.profiled()
+def export_mesh(mesh: trimesh.Trimesh, path: str, file_type: str = "stl"):
+    """Write `mesh` as STL, OBJ (shared, indexed vertices; no normals or
+    materials) or binary glTF (GLB). Both index shared vertices instead
+    of repeating each one per triangle; a GLB is about a third the size
+    of the STL, a (text) OBJ about three quarters."""
+    if file_type == "stl":
+        return export_stl(mesh, path)
+    if file_type == "obj":
+        data = trimesh.exchange.obj.export_obj(mesh, include_normals=False, include_color=False,
+                                               include_texture=False, header=None)
+    elif file_type == "glb":
+        data = trimesh.exchange.gltf.export_glb(trimesh.Scene(mesh), include_normals=False)
+    else:
+        raise ValueError(f"Unsupported mesh file type '{file_type}' (stl, obj or glb)")
+    with open(path, "wb") as fh:
+        fh.write(data.encode("utf-8") if isinstance(data, str) else data)
+    return path
+
+
 def export_stl(mesh: trimesh.Trimesh, path: str):
     mesh.export(path, file_type="stl")
     return path
@@ -128,6 +788,7 @@ def load_stl(path: str) -> trimesh.Trimesh:
     return trimesh.load(path, file_type="stl", process=True)
 
 
+@profiling.profiled()
 def union_watertight(meshes: list[trimesh.Trimesh]) -> trimesh.Trimesh:
     """Boolean-union a list of already-watertight trimesh meshes into one
     solid, via manifold3d (imported lazily to avoid a hard dependency loop
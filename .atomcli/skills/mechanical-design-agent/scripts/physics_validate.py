@@ -2,7 +2,7 @@
 physics_validate.py
 ====================
 A lightweight, code-only "does this kinematic assembly actually work"
-checker, run BEFORE anything reaches Gazebo. It answers two questions no
+checker, run BEFORE anything reaches Gazebo. It answers questions no
 amount of staring at a static render can answer:
 
   1. As each revolute/prismatic joint moves through its range of motion,
@@ -10,19 +10,41 @@ amount of staring at a static render can answer:
      (sweep_test)
   2. At rest, are any two unrelated parts already interpenetrating -- a
      sure sign of a placement mistake? (static_clearance_check)
-  3. For gear pairs specifically: is the center distance between the two
+  3. With ALL joints moving together, do two links that no single joint
+     sweep brings together (an elbow folding into a wrist) ever collide?
+     (config_space_sweep)
+  4. For gear pairs specifically: is the center distance between the two
      shafts exactly the sum of their pitch radii, the one number that
      actually determines whether teeth mesh correctly? (gear_mesh_check)
 
 METHOD: this is not a full rigid-body physics engine -- it doesn't need to
 be one to catch the overwhelming majority of "I got a sign or an offset
 wrong" bugs. It samples points on a moving part's surface and asks a static
-part's watertight mesh "do you contain this point?" (trimesh's ray-casting
-`contains`, backed by rtree). A joint's own shaft/socket region is expected
+part's watertight mesh "do you contain this point?". That question is asked
+in the static link's own frame, against a signed-distance grid computed
+once per link and cached on it (kinematics.Link.sdf_grid): a vectorised
+trilinear lookup, with an exact closest-point/pseudo-normal test only for
+the few points within the grid's error band of the surface. A joint's own shaft/socket region is expected
 to overlap its mating part by design, so every check excludes a small
 sphere around the joint origin -- anything CS outside that sphere overlapping
 is a genuine collision, not a modeling artifact of how the joint was drawn.
 
+Pairs are culled before any of that: static_clearance_check runs an AABB
+sweep-and-prune broad phase (kinematics.sweep_and_prune), then a GJK
+distance between the two links' cached convex hulls
+(mesh_utils.gjk_distance), and only sends pairs that overlap under both
+to the narrow phase; sweep_test applies the same hull test to the moving
+links' hulls over the whole sweep, and in adaptive mode the hull gap also
+bounds the step. The narrow phase itself only ray-casts the sample points
+that land inside the static mesh's local AABB.
+
+Besides the fraction of points inside, every sweep and clearance result
+carries the exact signed distance of its closest sample point
+(min_clearance; penetration_depth when negative) -- how close a near miss
+came, or how far a collision went in -- found with closest-point queries
+refined only where the SDF grid's lower bound says the minimum can be
+(mesh_utils.SignedDistanceGrid.min_signed_distance).
+
 This is intentionally conservative: it flags real problems with points
 sampled at joint-typical resolution (a few hundred points per part). It is
 not a substitute for Gazebo's own contact solver once the model is loaded
@@ -30,12 +52,15 @@ there, but it turns "did I connect this backwards" from a runtime surprise
 into a build-time error report.
 """
 from __future__ import annotations
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
+import hashlib
+import json
+import os
 import numpy as np
 import networkx as nx
-import trimesh
 
 import kinematics as kin
+import profiling
 
 
 @dataclass
@@ -48,13 +73,23 @@ class SweepResult:
     worst_at_deg: float
     checked_against: list = field(default_factory=list)
     notes: str = ""
+    adaptive: bool = False
+    first_contact_at: float | None = None
+    min_clearance: float | None = None      # m, exact signed: < 0 means overlap
+    penetration_depth: float = 0.0          # m, deepest counted sample point
+    closest_link: str | None = None         # static link attaining min_clearance
+    closest_at_deg: float | None = None     # joint value attaining it
 
     def __str__(self):
         status = "PASS" if self.passed else "FAIL"
+        steps = f"adaptive, {self.n_steps} evaluations" if self.adaptive else f"{self.n_steps} steps"
+        contact = (f", first contact at {self.first_contact_at:.4g} deg"
+                   if self.first_contact_at is not None else "")
         return (f"[{status}] sweep '{self.joint_name}' over {self.angle_range_deg[0]:.0f}"
-                f"..{self.angle_range_deg[1]:.0f} deg ({self.n_steps} steps): "
+                f"..{self.angle_range_deg[1]:.0f} deg ({steps}): "
                 f"worst interpenetration {self.worst_penetration_fraction*100:.2f}% "
-                f"of sample points at {self.worst_at_deg:.1f} deg"
+                f"of sample points at {self.worst_at_deg:.1f} deg{contact}"
+                f"{_distance_summary(self.min_clearance, self.penetration_depth, self.closest_link, self.closest_at_deg)}"
                 f"{' -- ' + self.notes if self.notes else ''}")
 
 
@@ -64,10 +99,22 @@ class ClearanceResult:
     link_b: str
     passed: bool
     penetration_fraction: float
+    broad_phase_culled: bool = False    # bounds or hulls disjoint -> no narrow-phase test needed
+    min_clearance: float | None = None  # m, exact signed (< 0 = overlap); the AABB or hull
+                                        # gap (a lower bound) when broad_phase_culled
+    penetration_depth: float = 0.0      # m, deepest sample point of link_a inside link_b
+    hull_separated: bool = False        # culled by the convex-hull GJK test, not the AABBs
 
     def __str__(self):
         status = "PASS" if self.passed else "FAIL"
-        return f"[{status}] rest-pose clearance {self.link_a} vs {self.link_b}: {self.penetration_fraction*100:.2f}%"
+        if self.broad_phase_culled:
+            detail = (f", min clearance >= {self.min_clearance:.4f} m"
+                      if self.min_clearance is not None else "") + \
+                (" (convex hulls disjoint)" if self.hull_separated else " (bounds disjoint)")
+        else:
+            detail = _distance_summary(self.min_clearance, self.penetration_depth)
+        return (f"[{status}] rest-pose clearance {self.link_a} vs {self.link_b}: "
+                f"{self.penetration_fraction*100:.2f}%{detail}")
 
 
 @dataclass
@@ -87,7 +134,81 @@ class GearMeshResult:
                 f"error {self.error:.2e})")
 
 
-def _sample_points(mesh: trimesh.Trimesh, n=350, seed=0):
+@dataclass
+class PoseCollision:
+    link_a: str
+    link_b: str
+    penetration_fraction: float
+    actuation: dict                     # joint name -> value (rad or m) of the pose
+
+    def __str__(self):
+        pose = ", ".join(f"{j}={v:.3f}" for j, v in self.actuation.items())
+        return (f"{self.link_a} vs {self.link_b}: {self.penetration_fraction*100:.2f}% "
+                f"at ({pose})")
+
+
+@dataclass
+class ConfigSpaceResult:
+    passed: bool
+    method: str
+    n_poses: int
+    joint_names: list
+    n_pairs: int                        # link pairs whose relative pose >= 2 joints move
+    worst_penetration_fraction: float
+    worst_configurations: list = field(default_factory=list)   # PoseCollision, worst first
+
+    def __str__(self):
+        status = "PASS" if self.passed else "FAIL"
+        head = (f"[{status}] configuration-space sweep over {len(self.joint_names)} joints "
+                f"({self.n_poses} {self.method} poses, {self.n_pairs} link pairs): "
+                f"worst interpenetration {self.worst_penetration_fraction*100:.2f}% of sample points")
+        return "\n".join([head] + [f"    {c}" for c in self.worst_configurations])
+
+
+@dataclass
+class ValidationResult:
+    """What validate() found: the full_report text plus enough to tell
+    whether it still applies -- gazebo_export.export_model(validation=...)
+    reuses it instead of re-validating while the fingerprint and the
+    settings it was run with match."""
+    report: str
+    passed: bool
+    fingerprint: str                    # kinematics.Assembly.fingerprint() it was run on
+    watertight: dict = field(default_factory=dict)   # link name -> bool
+    joint_sweep_kwargs: dict = field(default_factory=dict)   # validate()'s settings
+    config_space: bool = True
+    config_space_kwargs: dict = field(default_factory=dict)
+
+    def matches(self, assembly: kin.Assembly, joint_sweep_kwargs=None, config_space=True,
+                config_space_kwargs=None) -> bool:
+        """Whether validate(assembly, joint_sweep_kwargs,
+        config_space=config_space, config_space_kwargs=...) would give
+        this same result."""
+        if self.fingerprint != assembly.fingerprint():
+            return False
+        if (joint_sweep_kwargs or {}) != self.joint_sweep_kwargs or bool(config_space) != self.config_space:
+            return False
+        return not config_space or (config_space_kwargs or {}) == self.config_space_kwargs
+
+    def __str__(self):
+        return self.report
+
+
+def _distance_summary(min_clearance, penetration_depth, link=None, at_deg=None) -> str:
+    if min_clearance is None:
+        return ""
+    where = (f" {'into' if penetration_depth > 0 else 'to'} '{link}'" if link else "") + \
+        (f" at {at_deg:.1f} deg" if at_deg is not None else "")
+    if penetration_depth > 0:
+        return f", penetration depth {penetration_depth:.4f} m{where}"
+    return f", min clearance {min_clearance:.4f} m{where}"
+
+
+def _sample_points(mesh, n=350, seed=0):
+    if isinstance(mesh, kin.PosedMesh):
+        # Sample in the local frame and move only the samples, rather than
+        # transforming every vertex of the view just to keep a few hundred.
+        return mesh.to_world(_sample_points(mesh.mesh, n, seed))
     if len(mesh.vertices) <= n:
         return mesh.vertices
     rng = np.random.default_rng(seed)
@@ -95,39 +216,125 @@ def _sample_points(mesh: trimesh.Trimesh, n=350, seed=0):
     return mesh.vertices[idx]
 
 
-def _penetration_fraction(moving_pts, static_mesh, exclude_point=None, exclude_radius=0.0):
-    pts = moving_pts
+def _world_aabb(link: kin.Link, T: np.ndarray) -> np.ndarray:
+    """World-frame AABB of a posed link: the 8 corners of its (trimesh-
+    cached) local AABB pushed through T. Slightly looser than the AABB of
+    the transformed vertices, but costs 8 points instead of every vertex."""
+    lo, hi = link.mesh.bounds
+    corners = np.array([[x, y, z] for x in (lo[0], hi[0]) for y in (lo[1], hi[1]) for z in (lo[2], hi[2])])
+    world = corners @ T[:3, :3].T + T[:3, 3]
+    return np.array([world.min(axis=0), world.max(axis=0)])
+
+
+def _penetration_fraction(moving_pts, static_link: kin.Link, static_T: np.ndarray,
+                          exclude_point=None, exclude_radius=0.0):
+    keep = np.ones(len(moving_pts), dtype=bool)
     if exclude_point is not None and exclude_radius > 0:
-        d = np.linalg.norm(pts - np.asarray(exclude_point), axis=1)
-        pts = pts[d > exclude_radius]
-    if len(pts) == 0:
-        return 0.0
-    inside = static_mesh.contains(pts)
-    return float(np.mean(inside))
+        keep = np.linalg.norm(moving_pts - np.asarray(exclude_point), axis=1) > exclude_radius
+    return float(_penetration_fractions(moving_pts[None], keep[None], static_link, static_T)[0])
+
+
+def _penetration_fractions(world_pts: np.ndarray, keep: np.ndarray, static_link: kin.Link,
+                           static_T: np.ndarray) -> np.ndarray:
+    """Batched narrow phase: (S,P,3) sample points for S poses, (S,P) mask
+    of points that count (outside the joint's clearance sphere) -> (S,)
+    fraction of counted points inside `static_link` posed at `static_T`
+    (one (4,4) pose for all S, or an (S,4,4) pose per step).
+
+    Works in the static link's OWN frame, where its geometry (and the
+    signed-distance grid cached on it) never changes: the points move,
+    never the mesh, and all S poses go through in one call. A point
+    outside the link's local AABB can't be inside it; the rest are
+    answered by a trilinear SDF lookup, with an exact closest-point test
+    only near the surface."""
+    S, P, _ = world_pts.shape
+    inv = np.linalg.inv(static_T)
+    if inv.ndim == 3:
+        local = np.matmul(world_pts, inv[:, :3, :3].transpose(0, 2, 1)) + inv[:, None, :3, 3]
+    else:
+        local = (world_pts.reshape(-1, 3) @ inv[:3, :3].T + inv[:3, 3]).reshape(S, P, 3)
+    return _local_penetration_fractions(local, keep, static_link)
+
+
+def _local_penetration_fractions(local: np.ndarray, keep: np.ndarray,
+                                 static_link: kin.Link) -> np.ndarray:
+    """_penetration_fractions for points already in the static link's frame."""
+    S, P, _ = local.shape
+    n_kept = keep.sum(axis=1)
+    out = np.zeros(S)
+    lo, hi = static_link.mesh.bounds
+    candidates = keep & np.all((local >= lo) & (local <= hi), axis=2)
+    if not candidates.any():
+        return out
+    inside = np.zeros((S, P), dtype=bool)
+    inside[candidates] = static_link.sdf_grid().contains(local[candidates])
+    np.divide(inside.sum(axis=1), n_kept, out=out, where=n_kept > 0)
+    return out
+
+
+def _closest_approach(world_pts: np.ndarray, static_link: kin.Link, static_T: np.ndarray,
+                      upper=np.inf) -> tuple:
+    """Exact minimum signed distance from (N,3) world points to
+    `static_link` posed at `static_T` -> (distance, point index), or
+    (upper, -1) if no point gets below `upper`. Negative is penetration
+    depth. A link whose local AABB is already farther than `upper` from
+    every point is skipped without touching its grid; otherwise this is
+    SignedDistanceGrid.min_signed_distance in the link's own frame."""
+    if len(world_pts) == 0:
+        return upper, -1
+    inv = np.linalg.inv(static_T)
+    local = world_pts @ inv[:3, :3].T + inv[:3, 3]
+    lo, hi = static_link.mesh.bounds
+    floor = np.linalg.norm(np.maximum(np.maximum(lo - local, local - hi), 0.0), axis=1).min()
+    if floor > 0 and floor >= upper:
+        return upper, -1
+    return static_link.sdf_grid().min_signed_distance(local, upper=upper)
 
 
+def _hull_gap(moving_link: kin.Link, moving_T: np.ndarray, static_link: kin.Link,
+              static_T: np.ndarray) -> float:
+    """Lower bound on the distance between two posed links: GJK between
+    their cached convex hulls (mesh_utils.gjk_distance), in the static
+    link's frame. `moving_T` may be an (S,4,4) stack of poses, in which
+    case the moving hull is every one of them at once -- the convex hull
+    of that union contains every sample point of every pose, so one GJK
+    call bounds a whole sweep. > 0 proves no point of the moving link is
+    inside the static one, and that none is closer than the gap."""
+    import mesh_utils
+    rel = np.linalg.inv(static_T) @ moving_T
+    pts = moving_link.hull_points()
+    moved = np.einsum("...ij,pj->...pi", rel[..., :3, :3], pts) + rel[..., None, :3, 3]
+    return mesh_utils.gjk_distance(moved.reshape(-1, 3), static_link.hull_points())
+
+
+@profiling.profiled()
 def sweep_test(assembly: kin.Assembly, joint_name: str, n_steps=13,
                 angle_range_deg=None, exclude_radius=0.03,
-                fraction_tolerance=0.01, n_samples=350) -> SweepResult:
+                fraction_tolerance=0.01, n_samples=350,
+                adaptive=False, resolution=None) -> SweepResult:
     """Actuate a single joint through a range while holding every other
     joint at rest, and check the moving subtree against every static link
-    for interpenetration outside the joint's own clearance sphere."""
+    for interpenetration outside the joint's own clearance sphere.
+
+    By default the range is checked at n_steps evenly spaced values, which
+    can step straight over a thin part. adaptive=True instead walks the
+    range with steps sized from each sample point's distance lower bound
+    to the static links (SignedDistanceGrid.distance_bound): large steps
+    where parts are far apart, and never a step longer than the bound
+    allows for any point to reach a surface, except for a small floor
+    (starting at `resolution`: deg, or m for prismatic; default 1e-3 deg
+    / 1e-5 m) that keeps the sweep moving as it closes in or while parts
+    slide along each other. A contact found after a floored step is
+    bisected back to `resolution`, and the sweep goes
+    through any contact region in eighth-size fixed steps. The result
+    then reports the first-contact joint value, to within `resolution`,
+    and n_steps is the number of poses actually evaluated."""
     joint = assembly.joints[joint_name]
     if joint.joint_type not in ("revolute", "continuous", "prismatic"):
         raise ValueError(f"sweep_test only applies to movable joints, got '{joint.joint_type}'")
 
     is_prismatic = joint.joint_type == "prismatic"
-    if angle_range_deg is None:
-        if joint.joint_type == "continuous":
-            lo, hi = 0.0, 360.0
-        elif is_prismatic:
-            lo = joint.lower if joint.lower is not None else -0.05
-            hi = joint.upper if joint.upper is not None else 0.05
-        else:
-            lo = np.degrees(joint.lower) if joint.lower is not None else -30.0
-            hi = np.degrees(joint.upper) if joint.upper is not None else 30.0
-    else:
-        lo, hi = angle_range_deg
+    lo, hi = _sweep_range(joint, angle_range_deg)
 
     moving_subtree = list(nx.descendants(assembly.graph, joint.child)) + [joint.child]
     static_links = [l for l in assembly.links if l not in moving_subtree]
@@ -135,55 +342,431 @@ def sweep_test(assembly: kin.Assembly, joint_name: str, n_steps=13,
     rest_T = assembly.forward_kinematics()
     joint_origin_world = (rest_T[joint.parent] @ np.append(joint.origin_xyz, 1.0))[:3]
 
+    if adaptive:
+        fixed_step = (hi - lo) / max(n_steps - 1, 1)
+        n_evals, worst_frac, worst_val, first_contact, closest = _adaptive_sweep(
+            assembly, joint, moving_subtree, static_links, rest_T, joint_origin_world,
+            lo, hi, is_prismatic, exclude_radius, n_samples, fixed_step,
+            resolution if resolution is not None else (1e-5 if is_prismatic else 1e-3))
+        passed = worst_frac <= fraction_tolerance
+        return SweepResult(joint_name, passed, n_evals, (lo, hi), worst_frac, worst_val,
+                           checked_against=static_links, notes="" if passed else _SWEEP_FAIL_NOTE,
+                           adaptive=True, first_contact_at=first_contact,
+                           **_closest_fields(*closest))
+
+    # Static links don't move during a single-joint sweep, so they stay at
+    # rest_T for every step and are only ever queried in their own frames
+    # (their SDF grids are built once, ever). Only the moving subtree's
+    # sample points -- drawn once, in each moving link's local frame --
+    # are pushed through all n_steps poses, as one (steps, points, 3) batch.
     values = np.linspace(lo, hi, n_steps)
-    worst_frac, worst_val = 0.0, lo
-    for v in values:
-        actuation_value = v if is_prismatic else np.radians(v)
-        T = assembly.forward_kinematics({joint_name: actuation_value})
-        moving_meshes = [assembly.world_mesh(l, T) for l in moving_subtree]
-        moving_samples = [_sample_points(m, n_samples) for m in moving_meshes]
+    actuation = values if is_prismatic else np.radians(values)
+    with profiling.stage("poses"):
+        T_steps = assembly.batch_forward_kinematics({joint_name: actuation}, n=n_steps,
+                                                    links=moving_subtree)
+        moving = []
+        for l in moving_subtree:
+            local = _sample_points(assembly.links[l].mesh, n_samples)
+            world = np.einsum("sij,pj->spi", T_steps[l][:, :3, :3], local) + T_steps[l][:, None, :3, 3]
+            keep = np.linalg.norm(world - joint_origin_world, axis=2) > exclude_radius \
+                if exclude_radius > 0 else np.ones(world.shape[:2], dtype=bool)
+            moving.append((l, world, keep))
+
+    # Every (static, moving) link pair gets a floor under its distance
+    # before any grid is touched: the gap from its counted points to the
+    # static link's world AABB, and where that is zero, the GJK gap
+    # between the static link's hull and the moving link's hull at all
+    # n_steps poses at once. A positive floor proves the pair never
+    # interpenetrates, so only pairs with a zero floor reach the grid.
+    with profiling.stage("broad_phase"):
+        pairs = []
         for stat_name in static_links:
-            stat_mesh = assembly.world_mesh(stat_name, T)
-            if not stat_mesh.is_watertight:
+            stat_link = assembly.links[stat_name]
+            if not stat_link.mesh.is_watertight:
                 continue
-            for pts in moving_samples:
-                frac = _penetration_fraction(pts, stat_mesh, joint_origin_world, exclude_radius)
-                if frac > worst_frac:
-                    worst_frac, worst_val = frac, v
+            lo_b, hi_b = _world_aabb(stat_link, rest_T[stat_name])
+            for l, world, keep in moving:
+                pts = world[keep]
+                if not len(pts):
+                    continue
+                gap = np.maximum(np.maximum(lo_b - pts, pts - hi_b), 0.0)
+                floor = float(np.linalg.norm(gap, axis=1).min())
+                if floor == 0.0:
+                    floor = _hull_gap(assembly.links[l], T_steps[l], stat_link, rest_T[stat_name])
+                pairs.append((floor, stat_name, world, keep))
+
+    with profiling.stage("penetration"):
+        step_worst = np.zeros(n_steps)
+        for floor, stat_name, world, keep in pairs:
+            if floor == 0.0:
+                step_worst = np.maximum(step_worst, _penetration_fractions(
+                    world, keep, assembly.links[stat_name], rest_T[stat_name]))
+    worst_i = int(np.argmax(step_worst))
+    worst_frac, worst_val = float(step_worst[worst_i]), float(values[worst_i])
+
+    # Closest approach (or deepest penetration) over every counted point
+    # of every step, exact. Pairs go nearest-floor-first so the best
+    # distance tightens early: a pair whose floor is farther away than
+    # that is never even gridded, and the rest only refine the few points
+    # whose grid lower bound can still beat it.
+    with profiling.stage("closest_approach"):
+        best, best_link, best_at = np.inf, None, None
+        for floor, stat_name, world, keep in sorted(pairs, key=lambda t: t[0]):
+            if floor > 0 and floor >= best:
+                break
+            d, i = _closest_approach(world[keep], assembly.links[stat_name], rest_T[stat_name], upper=best)
+            if i >= 0:
+                best, best_link = d, stat_name
+                best_at = float(values[np.nonzero(keep)[0][i]])
 
     passed = worst_frac <= fraction_tolerance
-    notes = "" if passed else (
-        "Points from the moving subtree fell inside a link it isn't jointed "
-        "to, beyond the joint's own clearance sphere -- increase spacing, "
-        "widen the joint limit, or re-check the origin offset."
-    )
+    notes = "" if passed else _SWEEP_FAIL_NOTE
     return SweepResult(joint_name, passed, n_steps, (lo, hi), worst_frac, worst_val,
-                        checked_against=static_links, notes=notes)
+                        checked_against=static_links, notes=notes,
+                        **_closest_fields(best, best_link, best_at))
+
+
+def _sweep_range(joint: kin.Joint, angle_range_deg=None) -> tuple:
+    """(lo, hi) sweep_test covers for `joint`: `angle_range_deg` if given,
+    else the joint's limits (deg, or m for prismatic), else a default."""
+    if angle_range_deg is not None:
+        lo, hi = angle_range_deg
+        return lo, hi
+    if joint.joint_type == "continuous":
+        return 0.0, 360.0
+    if joint.joint_type == "prismatic":
+        return (joint.lower if joint.lower is not None else -0.05,
+                joint.upper if joint.upper is not None else 0.05)
+    return (np.degrees(joint.lower) if joint.lower is not None else -30.0,
+            np.degrees(joint.upper) if joint.upper is not None else 30.0)
+
+
+def _closest_fields(best, link, at) -> dict:
+    if not np.isfinite(best):
+        return {}
+    return {"min_clearance": best, "penetration_depth": max(0.0, -best),
+            "closest_link": link, "closest_at_deg": at}
+
+
+_SWEEP_FAIL_NOTE = (
+    "Points from the moving subtree fell inside a link it isn't jointed "
+    "to, beyond the joint's own clearance sphere -- increase spacing, "
+    "widen the joint limit, or re-check the origin offset."
+)
+
 
+def _adaptive_sweep(assembly, joint, moving_subtree, static_links, rest_T, joint_origin_world,
+                    lo, hi, is_prismatic, exclude_radius, n_samples, fixed_step, resolution):
+    """Conservative-advancement sweep for sweep_test(adaptive=True).
+    Returns (n_evaluations, worst_fraction, worst_at, first_contact_at,
+    (min_clearance, closest_link, closest_at)) with joint values in
+    sweep_test's units (deg, or m for prismatic).
 
+    A sample point at distance r from a revolute axis moves at most
+    r*|dtheta| for a rotation dtheta (a prismatic point moves exactly
+    |dd|), so from a pose where every counted point has signed distance
+    >= lb to every static link, no point can reach a surface before the
+    joint has moved min(lb / r). That is the step taken in free space,
+    floored at `resolution` so that the sweep can't stall as the bound
+    shrinks towards a surface. The floor doubles with each consecutive
+    floored step that stays free (up to an eighth of the fixed-grid
+    spacing), so a point sliding along a face it touches -- coincident
+    faces, bound 0 throughout -- costs a logarithmic number of poses
+    rather than one per `resolution`; it drops back to `resolution` at
+    the next unfloored step. A pose reached by an unfloored step that is
+    in contact is the first contact itself (nothing before it can be);
+    after a floored step, the bracket back to the last free pose is
+    bisected to `resolution`. The sweep then continues through the
+    contact region at an eighth of the fixed-grid spacing so its worst
+    pose isn't stepped over either."""
+    statics = [(s, assembly.links[s], np.linalg.inv(rest_T[s])) for s in static_links
+               if assembly.links[s].mesh.is_watertight]
+    locals_ = [_sample_points(assembly.links[l].mesh, n_samples) for l in moving_subtree]
+    parent_frame = rest_T[joint.parent] @ assembly._joint_local_transform(joint, 0.0)
+    axis = parent_frame[:3, :3] @ (np.asarray(joint.axis, dtype=float) / np.linalg.norm(joint.axis))
+    to_native = (lambda v: v) if is_prismatic else np.radians
+    evaluated = {}
+    closest = [np.inf, None, None]
+
+    def evaluate(v):
+        T = assembly.batch_forward_kinematics({joint.name: [to_native(v)]}, n=1,
+                                              links=moving_subtree)
+        worst, safe = 0.0, np.inf
+        for l, local in zip(moving_subtree, locals_):
+            world = local @ T[l][0, :3, :3].T + T[l][0, :3, 3]
+            rel = world - joint_origin_world
+            dist = np.linalg.norm(rel, axis=1)
+            keep = dist > exclude_radius if exclude_radius > 0 else np.ones(len(world), dtype=bool)
+            if is_prismatic:
+                # Sliding changes which points are inside the clearance
+                # sphere, so bound every point that could leave it before hi.
+                bounded = dist > exclude_radius - (hi - v)
+                rate = np.ones(len(world))
+            else:
+                # Rotation about an axis through the joint origin preserves
+                # each point's distance to it: the counted set is fixed.
+                bounded = keep
+                rate = np.radians(np.linalg.norm(np.cross(rel, axis), axis=1))
+            if not keep.any() and not bounded.any():
+                continue
+            # Hull-vs-hull GJK first, nearest static link first: a link
+            # whose hull is farther away than the closest approach found
+            # so far can neither be penetrated nor become the closest, so
+            # its grid isn't queried -- the step it allows is its gap over
+            # the fastest hull point's rate.
+            hull = assembly.links[l].hull_points() @ T[l][0, :3, :3].T + T[l][0, :3, 3]
+            hull_rate = 1.0 if is_prismatic else \
+                float(np.radians(np.linalg.norm(np.cross(hull - joint_origin_world, axis), axis=1).max()))
+            gaps = [_hull_gap(assembly.links[l], T[l][0], stat_link, rest_T[stat_name])
+                    for stat_name, stat_link, _ in statics]
+            for k in np.argsort(gaps, kind="stable"):
+                stat_name, stat_link, inv = statics[k]
+                if gaps[k] > 0 and gaps[k] >= closest[0]:
+                    if hull_rate > 0:
+                        safe = min(safe, gaps[k] / hull_rate)
+                    continue
+                pts = world @ inv[:3, :3].T + inv[:3, 3]
+                grid = stat_link.sdf_grid()
+                lower, inside = grid.distance_bound(pts)
+                if keep.any():
+                    worst = max(worst, float(inside[keep].sum()) / keep.sum())
+                    d, i = grid.min_signed_distance(pts[keep], upper=closest[0], lower=lower[keep])
+                    if i >= 0:
+                        closest[:] = [d, stat_name, v]
+                moving = bounded & (rate > 0)
+                if moving.any():
+                    safe = min(safe, _step_bound(grid, pts, lower, rate, moving))
+        evaluated[v] = worst
+        return worst, safe
+
+    v, last_free, first_contact, floored, floor = lo, None, None, False, resolution
+    while True:
+        frac, safe = evaluate(v)
+        if frac > 0:
+            if first_contact is None:
+                if last_free is None or not floored:
+                    first_contact = v
+                else:
+                    a, b = last_free, v
+                    while b - a > resolution:
+                        mid = 0.5 * (a + b)
+                        if evaluate(mid)[0] > 0:
+                            b = mid
+                        else:
+                            a = mid
+                    first_contact = b
+            step = fixed_step / 8.0
+        else:
+            last_free = v
+            floored = safe < floor
+            step = max(safe, floor)
+            floor = min(2.0 * floor, max(fixed_step / 8.0, resolution)) if floored else resolution
+        if v >= hi:
+            break
+        v = min(v + step, hi)
+
+    values = np.array(sorted(evaluated))
+    fracs = np.array([evaluated[x] for x in values])
+    worst_i = int(np.argmax(fracs))
+    return len(values), float(fracs[worst_i]), float(values[worst_i]), \
+        None if first_contact is None else float(first_contact), tuple(closest)
+
+
+def _step_bound(grid, pts, lower, rate, mask, batch=64) -> float:
+    """min(lower / rate) over the points in `mask`: how far the joint can
+    move before any of them can reach the grid's surface. A point just
+    outside the grid's exact band has a lower bound near zero that would
+    pin the step to almost nothing, so the points limiting the step are
+    refined to their exact distance, a batch at a time, until the one
+    setting it is exact."""
+    idx = np.flatnonzero(mask)
+    lower = np.maximum(lower[idx], 0.0)
+    loose = grid.query(pts[idx]) >= grid.band
+    while True:
+        bound = lower / rate[idx]
+        k = int(np.argmin(bound))
+        if not loose[k]:
+            return float(bound[k])
+        open_ = np.flatnonzero(loose)
+        todo = open_[np.argsort(bound[open_])[:batch]]
+        lower[todo] = np.maximum(grid.exact_signed_distance(pts[idx[todo]]), 0.0)
+        loose[todo] = False
+
+
+def _clearance_pairs(assembly: kin.Assembly) -> list:
+    """Every (a, b) link pair static_clearance_check considers -- not
+    directly joined, in link order."""
+    names = list(assembly.links.keys())
+    joined_pairs = {frozenset((a, b)) for a, b in assembly.graph.edges()}
+    return [(a, b) for i, a in enumerate(names) for b in names[i + 1:]
+            if frozenset((a, b)) not in joined_pairs]
+
+
+@profiling.profiled()
 def static_clearance_check(assembly: kin.Assembly, exclude_radius=0.03,
-                            fraction_tolerance=0.01, n_samples=350) -> list:
+                            fraction_tolerance=0.01, n_samples=350, pairs=None) -> list:
     """At the rest configuration, check every pair of links that are NOT
     directly joined (parent<->child) for interpenetration. Catches
     placement mistakes -- e.g. a wheel that overlaps the chassis, or two
     non-meshing gears placed too close -- that a sweep test wouldn't catch
-    because nothing ever moves relative to them."""
+    because nothing ever moves relative to them. `pairs` restricts the
+    check to a subset of those (a, b) pairs; results stay in link order."""
     T = assembly.forward_kinematics()
     names = list(assembly.links.keys())
-    joined_pairs = {frozenset((a, b)) for a, b in assembly.graph.edges()}
     results = []
     meshes = {n: assembly.world_mesh(n, T) for n in names}
-    samples = {n: _sample_points(meshes[n], n_samples) for n in names}
-    for i, a in enumerate(names):
-        for b in names[i + 1:]:
-            if frozenset((a, b)) in joined_pairs:
+    # Broad phase: sweep-and-prune over world AABBs, then GJK between the
+    # links' convex hulls for the pairs whose boxes do overlap. Every pair
+    # separated by either passes outright, so a robot's far-apart parts
+    # -- and the near ones whose boxes merely clip corners -- never reach
+    # the narrow phase at all.
+    aabbs = {n: _world_aabb(assembly.links[n], T[n]) for n in names}
+    overlapping = set(kin.sweep_and_prune(aabbs))
+    wanted = None if pairs is None else set(map(tuple, pairs))
+    samples = {}
+    for a, b in _clearance_pairs(assembly):
+        if wanted is not None and (a, b) not in wanted:
+            continue
+        if not meshes[b].is_watertight:
+            continue
+        if (a, b) not in overlapping:
+            gap = np.maximum(np.maximum(aabbs[b][0] - aabbs[a][1], aabbs[a][0] - aabbs[b][1]), 0.0)
+            results.append(ClearanceResult(a, b, True, 0.0, broad_phase_culled=True,
+                                           min_clearance=float(np.linalg.norm(gap))))
+            continue
+        gap = _hull_gap(assembly.links[a], T[a], assembly.links[b], T[b])
+        if gap > 0:
+            results.append(ClearanceResult(a, b, True, 0.0, broad_phase_culled=True,
+                                           min_clearance=gap, hull_separated=True))
+            continue
+        if a not in samples:
+            samples[a] = _sample_points(meshes[a], n_samples)
+        frac_ab = _penetration_fraction(samples[a], assembly.links[b], T[b], exclude_radius=0.0)
+        passed = frac_ab <= fraction_tolerance
+        d, _ = _closest_approach(samples[a], assembly.links[b], T[b])
+        results.append(ClearanceResult(a, b, passed, frac_ab, min_clearance=d,
+                                       penetration_depth=max(0.0, -d)))
+    return results
+
+
+def _pair_path_joints(assembly: kin.Assembly, a: str, b: str) -> list:
+    """The joints on the kinematic-tree path between links a and b."""
+    path = nx.shortest_path(assembly.graph.to_undirected(as_view=True), a, b)
+    return [assembly.joint_between(u, v) or assembly.joint_between(v, u)
+            for u, v in zip(path[:-1], path[1:])]
+
+
+@profiling.profiled()
+def config_space_sweep(assembly: kin.Assembly, n_poses=512, method="sobol", joint_names=None,
+                       exclude_radius=0.03, fraction_tolerance=0.01, n_samples=200,
+                       batch_size=256, early_exit=True, top_k=5, seed=0) -> ConfigSpaceResult:
+    """Move every movable joint AT ONCE through `n_poses` poses spread over
+    the joints' ranges (kinematics.joint_range) and check link pairs for
+    interpenetration -- the folded-elbow-into-wrist collisions sweep_test
+    can't see because it moves one joint with the rest at zero.
+
+    Poses come from scipy.stats.qmc: method="sobol" (n_poses rounded up to
+    a power of two, which Sobol balance needs) or "lhs" (Latin hypercube).
+    Only pairs whose relative pose depends on >= 2 of the sampled joints
+    are checked; with one, sweep_test already covered it exactly, and with
+    none, static_clearance_check did. Each pair's sample points (drawn in
+    its own frame, as sweep_test does) are excluded within exclude_radius
+    of every joint origin on the path between the two links.
+
+    All poses go through one batched forward-kinematics pass. Each pair is
+    tested in both directions, and per direction a bounding-sphere-vs-AABB
+    test over every pose drops most of the work before any sample point
+    moves; the surviving poses are tested in batches of `batch_size`, and
+    with early_exit a pair stops at the first batch that proves it FAILs.
+    The result keeps the worst pose of every pair with any penetration,
+    worst first, up to top_k."""
+    from scipy.stats import qmc
+
+    movable = {j.name: j for j in assembly.movable_joints()}
+    names = list(movable) if joint_names is None else list(joint_names)
+    if not names:
+        return ConfigSpaceResult(True, method, 0, [], 0, 0.0)
+    if method == "sobol":
+        m = int(np.ceil(np.log2(max(n_poses, 2))))
+        unit = qmc.Sobol(len(names), scramble=True, seed=seed).random_base2(m)
+    elif method == "lhs":
+        unit = qmc.LatinHypercube(len(names), seed=seed).random(n_poses)
+    else:
+        raise ValueError(f"unknown sampling method '{method}' (expected 'sobol' or 'lhs')")
+    ranges = np.array([kin.joint_range(movable[n]) for n in names])
+    q = qmc.scale(unit, ranges[:, 0], ranges[:, 1]) if len(unit) else unit
+    n = len(q)
+    transforms, joint_frames = assembly._batch_fk({j: q[:, i] for i, j in enumerate(names)}, n)
+
+    sampled = set(names)
+    pairs = []
+    for a, b in _clearance_pairs(assembly):
+        path = _pair_path_joints(assembly, a, b)
+        if sum(j.name in sampled for j in path) >= 2:
+            pairs.append((a, b, [j.name for j in path]))
+
+    # Bounding spheres (local AABB centre + vertex radius) moved into the
+    # other link's frame by every pose at once and tested against its local
+    # AABB: an (n,) overlap mask per direction before any sample point moves.
+    spheres = {}
+    for link_name in {x for a, b, _ in pairs for x in (a, b)}:
+        verts = assembly.links[link_name].mesh.vertices
+        centre = verts.min(axis=0) / 2 + verts.max(axis=0) / 2
+        spheres[link_name] = (centre, float(np.linalg.norm(verts - centre, axis=1).max()))
+    inverses = {}
+
+    def _inverse(link_name):
+        if link_name not in inverses:
+            inverses[link_name] = np.linalg.inv(transforms[link_name])
+        return inverses[link_name]
+
+    samples = {}
+    best_per_pair = []
+    for a, b, path in pairs:
+        worst, worst_pose = 0.0, -1
+        for src, dst in ((a, b), (b, a)):
+            dst_link = assembly.links[dst]
+            if not dst_link.mesh.is_watertight:
                 continue
-            if not meshes[b].is_watertight:
+            rel = _inverse(dst) @ transforms[src]                       # src -> dst frame, (n,4,4)
+            centre, radius = spheres[src]
+            c = rel[:, :3, :3] @ centre + rel[:, :3, 3]
+            lo, hi = dst_link.mesh.bounds
+            gap = np.linalg.norm(np.maximum(np.maximum(lo - c, c - hi), 0.0), axis=1)
+            poses = np.flatnonzero(gap < radius)
+            if len(poses) == 0:
                 continue
-            frac_ab = _penetration_fraction(samples[a], meshes[b], exclude_radius=0.0)
-            passed = frac_ab <= fraction_tolerance
-            results.append(ClearanceResult(a, b, passed, frac_ab))
-    return results
+            if src not in samples:
+                samples[src] = _sample_points(assembly.links[src].mesh, n_samples)
+            # Joint origins on the path, in dst's frame too (distances are
+            # frame-independent): (n, J, 3).
+            origins = np.stack([joint_frames[j][:, :3, 3] for j in path], axis=1)
+            inv_dst = _inverse(dst)
+            origins = np.matmul(origins, inv_dst[:, :3, :3].transpose(0, 2, 1)) + inv_dst[:, None, :3, 3]
+            for start in range(0, len(poses), batch_size):
+                idx = poses[start:start + batch_size]
+                local = np.matmul(samples[src], rel[idx, :3, :3].transpose(0, 2, 1)) + rel[idx, None, :3, 3]
+                if exclude_radius > 0:
+                    d = np.linalg.norm(local[:, :, None, :] - origins[idx][:, None, :, :], axis=3)
+                    keep = d.min(axis=2) > exclude_radius
+                else:
+                    keep = np.ones(local.shape[:2], dtype=bool)
+                fracs = _local_penetration_fractions(local, keep, dst_link)
+                i = int(np.argmax(fracs))
+                if fracs[i] > worst:
+                    worst, worst_pose = float(fracs[i]), int(idx[i])
+                if early_exit and worst > fraction_tolerance:
+                    break
+            if early_exit and worst > fraction_tolerance:
+                break
+        if worst > 0:
+            best_per_pair.append(PoseCollision(a, b, worst, {j: float(q[worst_pose, k])
+                                                             for k, j in enumerate(names)}))
+
+    best_per_pair.sort(key=lambda c: -c.penetration_fraction)
+    worst = best_per_pair[0].penetration_fraction if best_per_pair else 0.0
+    return ConfigSpaceResult(worst <= fraction_tolerance, method, n, names, len(pairs), worst,
+                             best_per_pair[:top_k])
 
 
 def gear_mesh_check(pitch_radius_a: float, pitch_radius_b: float,
@@ -200,38 +783,392 @@ def gear_mesh_check(pitch_radius_a: float, pitch_radius_b: float,
     return GearMeshResult("gear_a", "gear_b", err <= tolerance, expected, center_distance, err)
 
 
-def full_report(assembly: kin.Assembly, joint_sweep_kwargs=None) -> str:
+def full_report(assembly: kin.Assembly, joint_sweep_kwargs=None, workers=None,
+                config_space=True, config_space_kwargs=None, cache_path=None) -> str:
     """Run every applicable check and return a human-readable report string.
     Intended to be printed to stdout and/or saved next to the exported
-    Gazebo model as VALIDATION.txt."""
+    Gazebo model as VALIDATION.txt. Same arguments as validate(), which
+    returns the report together with the fingerprint it holds for.
+    """
+    return validate(assembly, joint_sweep_kwargs, workers, config_space,
+                    config_space_kwargs, cache_path).report
+
+
+@profiling.profiled()
+def validate(assembly: kin.Assembly, joint_sweep_kwargs=None, workers=None,
+             config_space=True, config_space_kwargs=None, cache_path=None) -> ValidationResult:
+    """Run every applicable check -> ValidationResult (report text, overall
+    pass, per-link watertightness and the assembly fingerprint).
+
+    `workers` > 1 fans the (independent) checks out over a process pool --
+    see _run_checks_parallel. The report is identical either way.
+    config_space=False skips the multi-joint config_space_sweep (run with
+    config_space_kwargs) that otherwise follows the single-joint sweeps.
+
+    `cache_path` names a JSON file of previous results keyed by link and
+    joint fingerprints (see ValidationCache). Only checks whose inputs
+    changed since the run that wrote it are recomputed; everything else
+    is reused, and the file is rewritten for next time."""
     joint_sweep_kwargs = joint_sweep_kwargs or {}
+    config_space_kwargs = config_space_kwargs or {}
+    sweep_joints = [jname for jname, joint in assembly.joints.items()
+                    if joint.joint_type in ("revolute", "continuous", "prismatic")]
+    run_config_space = config_space and len(sweep_joints) >= 2
+    pairs = _clearance_pairs(assembly)
+
+    cache = ValidationCache(assembly, cache_path, joint_sweep_kwargs,
+                            config_space_kwargs if run_config_space else None)
+    watertight, clearance, sweeps, cspace_result = cache.reusable(pairs, sweep_joints)
+    todo_links = [n for n in assembly.links if n not in watertight]
+    todo_pairs = [pair for pair in pairs if pair not in clearance]
+    todo_joints = [j for j in sweep_joints if j not in sweeps]
+    todo_cspace = config_space_kwargs if run_config_space and cspace_result is None else None
+    fresh = _run_checks(assembly, todo_links, todo_pairs, todo_joints, joint_sweep_kwargs,
+                        todo_cspace, workers)
+    watertight.update(fresh[0])
+    clearance.update(fresh[1])
+    sweeps.update(fresh[2])
+    if todo_cspace is not None:
+        cspace_result = fresh[3]
+    cache.save(watertight, clearance, sweeps, cspace_result)
+
+    watertight_reports = [watertight[n] for n in assembly.links]
+    clearance_results = [clearance[pair] for pair in pairs if clearance[pair] is not None]
+    sweep_results = [sweeps[j] for j in sweep_joints]
+
     lines = [f"Physics/kinematics validation report for assembly '{assembly.name}'", "=" * 70]
 
     lines.append("\n-- Watertightness (per link) --")
-    import mesh_utils
     all_watertight = True
-    for name, link in assembly.links.items():
-        rep = mesh_utils.check_watertight(link.mesh, name)
+    for rep in watertight_reports:
         all_watertight &= rep.is_watertight
         lines.append(str(rep))
 
     lines.append("\n-- Rest-pose static clearance (non-jointed link pairs) --")
-    clearance_results = static_clearance_check(assembly)
     if not clearance_results:
         lines.append("(no non-jointed link pairs to check)")
+    else:
+        n_narrow = sum(not r.broad_phase_culled for r in clearance_results)
+        n_hull = sum(r.hull_separated for r in clearance_results)
+        lines.append(f"(broad phase: {len(clearance_results)} pairs, {n_narrow + n_hull} with "
+                     f"overlapping bounds, {n_narrow} of those with overlapping convex hulls "
+                     f"sent to the narrow phase)")
     for r in clearance_results:
         lines.append(str(r))
 
     lines.append("\n-- Joint range-of-motion sweep tests --")
-    sweep_results = []
-    for jname, joint in assembly.joints.items():
-        if joint.joint_type not in ("revolute", "continuous", "prismatic"):
-            continue
-        res = sweep_test(assembly, jname, **joint_sweep_kwargs)
-        sweep_results.append(res)
+    for res in sweep_results:
         lines.append(str(res))
 
+    if cspace_result is not None:
+        lines.append("\n-- Multi-joint configuration-space sweep --")
+        lines.append(str(cspace_result))
+
     all_pass = all_watertight and all(r.passed for r in clearance_results) and all(r.passed for r in sweep_results)
+    all_pass = all_pass and (cspace_result is None or cspace_result.passed)
     lines.append("\n" + "=" * 70)
     lines.append(f"OVERALL: {'PASS' if all_pass else 'FAIL'}")
-    return "\n".join(lines)
+    return ValidationResult("\n".join(lines), all_pass, assembly.fingerprint(),
+                            {n: watertight[n].is_watertight for n in assembly.links},
+                            dict(joint_sweep_kwargs), bool(config_space), dict(config_space_kwargs))
+
+
+def _run_checks(assembly: kin.Assembly, links: list, pairs: list, sweep_joints: list,
+                joint_sweep_kwargs: dict, config_space_kwargs, workers):
+    """Run the given subset of full_report's checks -> ({link: report},
+    {(a, b): ClearanceResult or None if skipped}, {joint: SweepResult},
+    ConfigSpaceResult or None), serially or on a process pool."""
+    if workers is not None and workers > 1 and (links or pairs or sweep_joints
+                                                or config_space_kwargs is not None):
+        watertight_reports, clearance_results, sweep_results, cspace_result = _run_checks_parallel(
+            assembly, links, pairs, sweep_joints, joint_sweep_kwargs, workers, config_space_kwargs)
+    else:
+        import mesh_utils
+        watertight_reports = [mesh_utils.check_watertight(assembly.links[n].mesh, n) for n in links]
+        clearance_results = static_clearance_check(assembly, pairs=pairs) if pairs else []
+        sweep_results = [sweep_test(assembly, jname, **joint_sweep_kwargs) for jname in sweep_joints]
+        cspace_result = (None if config_space_kwargs is None
+                         else config_space_sweep(assembly, **config_space_kwargs))
+    clearance = dict.fromkeys(pairs)
+    clearance.update({(r.link_a, r.link_b): r for r in clearance_results})
+    return (dict(zip(links, watertight_reports)), clearance,
+            dict(zip(sweep_joints, sweep_results)), cspace_result)
+
+
+# ---------------------------------------------------------------------------
+# Incremental re-validation: previous results, keyed by what they depend on.
+# ---------------------------------------------------------------------------
+
+_CACHE_VERSION = 3
+
+
+def _digest(*parts) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            # Round away float noise (and -0.0) so an unchanged pose hashes
+            # the same after a round trip through FK.
+            part = (np.round(part, 9) + 0.0).tobytes()
+        elif not isinstance(part, bytes):
+            part = json.dumps(part, sort_keys=True, default=str).encode("utf-8")
+        h.update(part)
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def _aabb_sphere_gap(aabb, centre, radius) -> float:
+    lo, hi = np.asarray(aabb)
+    return float(max(0.0, np.linalg.norm(np.clip(centre, lo, hi) - centre) - radius))
+
+
+class ValidationCache:
+    """full_report's memory between runs, persisted as JSON at `path`
+    (None disables it). Every result is stored with a key built from the
+    fingerprints (kinematics.Link.fingerprint / Joint.fingerprint) of
+    exactly the inputs it depends on:
+
+      watertight   the link's own fingerprint.
+      clearance    both links' fingerprints and their relative rest pose.
+      sweep        `own`: the joint, its moving subtree's links and joints
+                   and the sweep kwargs; plus one entry per static partner
+                   (fingerprint + pose in the joint's parent frame, with
+                   its AABB there). A change to `own` recomputes. Changed,
+                   added or removed partners only recompute the sweep if,
+                   old or new, their AABB comes within the cached min
+                   clearance of the sphere the moving subtree sweeps
+                   through -- otherwise they can neither penetrate nor
+                   become the closest link, and the cached result stands.
+      config space every link and joint fingerprint, plus its kwargs.
+    """
+
+    def __init__(self, assembly: kin.Assembly, path, joint_sweep_kwargs: dict,
+                 config_space_kwargs):
+        self.assembly = assembly
+        self.path = path
+        self.joint_sweep_kwargs = joint_sweep_kwargs
+        self.config_space_kwargs = config_space_kwargs
+        self.link_fp = {n: l.fingerprint() for n, l in assembly.links.items()} if path else {}
+        self.joint_fp = {n: j.fingerprint() for n, j in assembly.joints.items()} if path else {}
+        self.rest_T = assembly.forward_kinematics() if path else {}
+        self.old = {}
+        if path:
+            try:
+                with open(path) as fh:
+                    old = json.load(fh)
+                if old.get("version") == _CACHE_VERSION:
+                    self.old = old
+            except (OSError, ValueError):
+                pass
+        self.entries = {"watertight": {}, "clearance": {}, "sweeps": {}, "config_space": None}
+
+    # -- keys ---------------------------------------------------------------
+    def _clearance_key(self, a: str, b: str) -> str:
+        rel = np.linalg.inv(self.rest_T[a]) @ self.rest_T[b]
+        return _digest(self.link_fp[a], self.link_fp[b], rel)
+
+    def _sweep_inputs(self, jname: str):
+        asm, joint = self.assembly, self.assembly.joints[jname]
+        subtree = set(nx.descendants(asm.graph, joint.child)) | {joint.child}
+        sub_joints = sorted(self.joint_fp[asm.graph.edges[p, c]["joint"]]
+                            for p, c in asm.graph.edges() if c in subtree and p in subtree)
+        own = _digest(self.joint_fp[jname], sorted(self.link_fp[l] for l in subtree),
+                      sub_joints, self.joint_sweep_kwargs)
+        to_parent = np.linalg.inv(self.rest_T[joint.parent])
+        partners = {}
+        for name in asm.links:
+            if name in subtree:
+                continue
+            T = to_parent @ self.rest_T[name]
+            partners[name] = [_digest(self.link_fp[name], T),
+                              _world_aabb(asm.links[name], T).tolist()]
+        # Sphere about the joint origin containing every pose of the moving
+        # subtree: rotation about an axis through the origin keeps each
+        # point's distance to it; sliding adds at most the travel, measured
+        # from the rest pose (q = 0, which may lie outside the swept range).
+        centre = np.asarray(joint.origin_xyz, dtype=float)
+        radius = 0.0
+        for name in subtree:
+            corners = _world_aabb(asm.links[name], to_parent @ self.rest_T[name])
+            box = np.array([[x, y, z] for x in corners[:, 0] for y in corners[:, 1] for z in corners[:, 2]])
+            radius = max(radius, float(np.linalg.norm(box - centre, axis=1).max()))
+        if joint.joint_type == "prismatic":
+            lo, hi = _sweep_range(joint, self.joint_sweep_kwargs.get("angle_range_deg"))
+            radius += max(abs(lo), abs(hi))
+        return own, partners, centre, radius
+
+    def _cspace_key(self) -> str:
+        return _digest(self.link_fp, self.joint_fp, self.config_space_kwargs)
+
+    # -- lookup -------------------------------------------------------------
+    def reusable(self, pairs: list, sweep_joints: list):
+        """Cached results still valid for the current assembly ->
+        ({link: report}, {(a, b): result or None}, {joint: result},
+        ConfigSpaceResult or None). Also stages the current keys."""
+        import mesh_utils
+        watertight, clearance, sweeps, cspace = {}, {}, {}, None
+        if not self.path:
+            return watertight, clearance, sweeps, cspace
+        old = self.old.get("watertight", {})
+        for name in self.assembly.links:
+            key = self.link_fp[name]
+            self.entries["watertight"][name] = {"key": key}
+            if name in old and old[name]["key"] == key:
+                watertight[name] = mesh_utils.WatertightReport(**old[name]["result"])
+
+        old = self.old.get("clearance", {})
+        for a, b in pairs:
+            key, label = self._clearance_key(a, b), f"{a}|{b}"
+            self.entries["clearance"][label] = {"key": key, "pair": [a, b]}
+            if label in old and old[label]["key"] == key:
+                res = old[label]["result"]
+                clearance[(a, b)] = None if res is None else ClearanceResult(**res)
+
+        old = self.old.get("sweeps", {})
+        for jname in sweep_joints:
+            own, partners, centre, radius = self._sweep_inputs(jname)
+            self.entries["sweeps"][jname] = {"own": own, "partners": partners,
+                                             "centre": centre.tolist(), "radius": radius}
+            prev = old.get(jname)
+            if prev is None or prev["own"] != own:
+                continue
+            res = SweepResult(**prev["result"])
+            if self._partners_unchanged_in_reach(prev, partners, res, centre, radius):
+                # Partners added or removed out of reach don't change the
+                # result, but they do change what it was checked against.
+                res.checked_against = list(partners)
+                sweeps[jname] = res
+
+        if self.config_space_kwargs is not None:
+            key = self._cspace_key()
+            self.entries["config_space"] = {"key": key}
+            prev = self.old.get("config_space")
+            if prev is not None and prev["key"] == key:
+                res = dict(prev["result"])
+                res["worst_configurations"] = [PoseCollision(**c) for c in res["worst_configurations"]]
+                cspace = ConfigSpaceResult(**res)
+        return watertight, clearance, sweeps, cspace
+
+    @staticmethod
+    def _partners_unchanged_in_reach(prev, partners, res, centre, radius) -> bool:
+        old_partners = prev["partners"]
+        changed = [n for n in set(old_partners) | set(partners)
+                   if old_partners.get(n, [None])[0] != partners.get(n, [None])[0]]
+        if not changed:
+            return True
+        if res.min_clearance is None or res.closest_link in changed:
+            return False
+        margin = max(res.min_clearance, 0.0)
+        for name in changed:
+            for version in (old_partners.get(name), partners.get(name)):
+                if version is not None and _aabb_sphere_gap(version[1], centre, radius) <= margin:
+                    return False
+        return True
+
+    # -- store --------------------------------------------------------------
+    def save(self, watertight: dict, clearance: dict, sweeps: dict, cspace) -> None:
+        if not self.path:
+            return
+        for name, entry in self.entries["watertight"].items():
+            entry["result"] = asdict(watertight[name])
+        for label, entry in self.entries["clearance"].items():
+            res = clearance[tuple(entry["pair"])]
+            entry["result"] = None if res is None else asdict(res)
+        for jname, entry in self.entries["sweeps"].items():
+            entry["result"] = asdict(sweeps[jname])
+        if self.entries["config_space"] is not None:
+            self.entries["config_space"]["result"] = asdict(cspace)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump({"version": _CACHE_VERSION, **self.entries}, fh,
+                      default=lambda o: o.item() if isinstance(o, np.generic) else str(o))
+        os.replace(tmp, self.path)
+
+
+# Worker-process state for _run_checks_parallel: the Assembly each pool
+# process has mapped from a snapshot, keyed by snapshot path.
+_WORKER_ASSEMBLIES = {}
+
+
+def _snapshot_assembly(path: str) -> kin.Assembly:
+    asm = _WORKER_ASSEMBLIES.get(path)
+    if asm is None:
+        _WORKER_ASSEMBLIES.clear()
+        asm = _WORKER_ASSEMBLIES[path] = kin.Assembly.load(path)
+    return asm
+
+
+def _link_task(path: str, name: str):
+    import mesh_utils
+    link = _snapshot_assembly(path).links[name]
+    report = mesh_utils.check_watertight(link.mesh, name)
+    if not link.mesh.is_watertight:
+        return report, None
+    grid = link.sdf_grid()
+    return report, (grid.origin, grid.spacing, grid.values, grid.band, grid.mesh_bounds)
+
+
+def _clearance_task(path: str, pairs: list) -> list:
+    return static_clearance_check(_snapshot_assembly(path), pairs=pairs)
+
+
+def _sweep_task(path: str, joint_name: str, kwargs: dict) -> SweepResult:
+    return sweep_test(_snapshot_assembly(path), joint_name, **kwargs)
+
+
+def _config_space_task(path: str, kwargs: dict) -> ConfigSpaceResult:
+    return config_space_sweep(_snapshot_assembly(path), **kwargs)
+
+
+def _run_checks_parallel(assembly: kin.Assembly, links: list, pairs: list, sweep_joints: list,
+                         joint_sweep_kwargs: dict, workers: int, config_space_kwargs=None):
+    """_run_checks on a `workers`-process pool.
+
+    Meshes are never pickled per task: the assembly is written once as an
+    Assembly.save snapshot (on /dev/shm where it exists, i.e. in shared
+    memory) and every worker memory-maps it, so all processes read the
+    same physical pages. Two rounds run on the one pool: per-link
+    watertightness + signed-distance grid builds, whose grids are then
+    cached on `assembly` and re-snapshotted so no worker rebuilds them;
+    then clearance pairs (in contiguous chunks), joint sweeps and (unless
+    config_space_kwargs is None) the configuration-space sweep. Results
+    are collected in submission order, which is the serial order."""
+    import tempfile
+    import mesh_utils
+    from concurrent.futures import ProcessPoolExecutor
+
+    tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    paths = []
+
+    def _snapshot():
+        fd, path = tempfile.mkstemp(suffix=".mdasnap", dir=tmp_dir)
+        os.close(fd)
+        paths.append(path)
+        return assembly.save(path)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            path = _snapshot()
+            link_futures = [pool.submit(_link_task, path, name) for name in links]
+            watertight_reports = []
+            for name, fut in zip(links, link_futures):
+                report, grid = fut.result()
+                watertight_reports.append(report)
+                link = assembly.links[name]
+                if grid is not None and link._sdf_cache is None:
+                    link._sdf_cache = mesh_utils.SignedDistanceGrid(*grid, link.mesh)
+
+            path = _snapshot() if links else path
+            chunk = max(1, -(-len(pairs) // (2 * workers)))
+            clearance_futures = [pool.submit(_clearance_task, path, pairs[i:i + chunk])
+                                 for i in range(0, len(pairs), chunk)]
+            cspace_future = (None if config_space_kwargs is None else
+                             pool.submit(_config_space_task, path, config_space_kwargs))
+            sweep_futures = [pool.submit(_sweep_task, path, jname, joint_sweep_kwargs)
+                             for jname in sweep_joints]
+            clearance_results = [r for fut in clearance_futures for r in fut.result()]
+            sweep_results = [fut.result() for fut in sweep_futures]
+            cspace_result = None if cspace_future is None else cspace_future.result()
+    finally:
+        for path in paths:
+            os.unlink(path)
+    return watertight_reports, clearance_results, sweep_results, cspace_result
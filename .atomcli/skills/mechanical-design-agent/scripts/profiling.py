@@ -0,0 +1,329 @@
+"""
+profiling.py
+============
+Opt-in instrumentation for the whole pipeline: where a build, a
+validation and an export spend their time and memory, stage by stage.
+
+The expensive entry points of every module are wrapped with @profiled
+(sdf_core.sdf_to_mesh, the csg_core booleans, mesh_utils' checks and
+mass properties, physics_validate's sweeps, gazebo_export.export_model,
+...), and the interesting phases inside them are marked with
+stage(...) blocks -- sdf_to_mesh's sampling vs. marching cubes,
+sweep_test's pose batch, broad phase and grid queries, export_model's
+file writes. While no Profile is active, each of those costs a global
+lookup (a fraction of a microsecond per call) and nothing is recorded.
+
+    import profiling
+    with profiling.Profile("trace.json") as prof:
+        ...build, validate, export...
+    print(prof.summary())
+
+or, without touching any code, set MDA_PROFILE=trace.json in the
+environment: the whole process is profiled and the trace is written at
+exit (MDA_PROFILE_MEMORY=0 turns memory tracing off).
+
+Stages nest: a stage entered while another is running is recorded under
+it, and repeated calls along the same path are merged into one node with
+a call count, total/mean time, the peak Python-heap growth above the
+stage's starting point (tracemalloc, numpy buffers included) and the
+largest mesh seen (faces/vertices of a stage's mesh argument or result).
+Stages run on worker threads (export_model's writes) are recorded at the
+top level of the tree, and stages in worker processes are not recorded.
+Memory peaks are process-wide, so they are approximate while worker
+threads are allocating alongside a stage.
+
+Memory tracing slows allocation-heavy code down noticeably; pass
+memory=False for timings closer to an unprofiled run. While a Profile is
+active, export_model appends its summary table to VALIDATION.txt.
+"""
+from __future__ import annotations
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+_active = None
+
+
+def active():
+    """The running Profile, or None."""
+    return _active
+
+
+class _Node:
+    __slots__ = ("name", "calls", "total_s", "peak_bytes", "faces", "vertices", "children")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.total_s = 0.0
+        self.peak_bytes = 0
+        self.faces = 0
+        self.vertices = 0
+        self.children = {}
+
+    def to_dict(self, open_s: dict = None) -> dict:
+        running = (open_s or {}).get(id(self))
+        out = {"name": self.name, "calls": self.calls + (running is not None),
+               "total_s": self.total_s + (running or 0.0),
+               "peak_mb": self.peak_bytes / 2**20, "faces": self.faces, "vertices": self.vertices,
+               "children": [c.to_dict(open_s) for c in self.children.values()]}
+        if running is not None:
+            out["running"] = True
+        return out
+
+
+class Profile:
+    """Collects stage timings while active -- as a context manager, or
+    between start() and stop(). With `path`, the JSON trace (to_dict) is
+    written there on exit. One Profile can be active at a time."""
+
+    def __init__(self, path: str = None, memory: bool = True):
+        self.path = path
+        self.memory = memory
+        self.root = _Node("total")
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._t0 = None
+        self._own_trace = False
+        self._start_bytes = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        if self.path:
+            self.save(self.path)
+        return False
+
+    def start(self) -> "Profile":
+        global _active
+        if _active is not None:
+            raise RuntimeError("another Profile is already active")
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._own_trace = True
+        if self.memory and tracemalloc.is_tracing():
+            self._start_bytes = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self._t0 = time.perf_counter()
+        _active = self
+        return self
+
+    def stop(self) -> "Profile":
+        global _active
+        if _active is self:
+            _active = None
+        if self._t0 is not None:
+            self.root.total_s += time.perf_counter() - self._t0
+            self.root.calls += 1
+            self._t0 = None
+        if self.memory and tracemalloc.is_tracing():
+            self._root_peak(tracemalloc.get_traced_memory()[1])
+        if self._own_trace:
+            tracemalloc.stop()
+            self._own_trace = False
+        return self
+
+    # -- recording ----------------------------------------------------------
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self, name: str) -> list:
+        stack = self._stack()
+        parent = stack[-1][0] if stack else self.root
+        with self._lock:
+            node = parent.children.get(name)
+            if node is None:
+                node = parent.children[name] = _Node(name)
+        frame = [node, time.perf_counter(), 0, 0]      # node, t0, start bytes, running peak
+        if self.memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1][3] = max(stack[-1][3], peak)
+            else:
+                self._root_peak(peak)
+            tracemalloc.reset_peak()
+            frame[2] = frame[3] = current
+        stack.append(frame)
+        return frame
+
+    def _exit(self, frame: list, size=None) -> None:
+        node, t0, start_bytes, peak = frame
+        elapsed = time.perf_counter() - t0
+        stack = self._stack()
+        stack.pop()
+        if self.memory and tracemalloc.is_tracing():
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            if stack:
+                stack[-1][3] = max(stack[-1][3], peak)
+            else:
+                self._root_peak(peak)
+        with self._lock:
+            node.calls += 1
+            node.total_s += elapsed
+            node.peak_bytes = max(node.peak_bytes, peak - start_bytes)
+            if size is not None:
+                node.faces = max(node.faces, size[0])
+                node.vertices = max(node.vertices, size[1])
+
+    def _root_peak(self, peak: int) -> None:
+        with self._lock:
+            self.root.peak_bytes = max(self.root.peak_bytes, peak - self._start_bytes)
+
+    # -- output ---------------------------------------------------------------
+    def to_dict(self) -> dict:
+        """The stage tree as nested dicts ({name, calls, total_s, peak_mb,
+        faces, vertices, children}). Stages still running in this thread
+        (and the profile itself, if active) are included up to now and
+        flagged "running"."""
+        now = time.perf_counter()
+        open_s = {id(node): now - t0 for node, t0, _, _ in self._stack()}
+        if self._t0 is not None:
+            open_s[id(self.root)] = now - self._t0
+        with self._lock:
+            tree = self.root.to_dict(open_s)
+        return {"memory": self.memory, "stages": tree}
+
+    def save(self, path: str) -> str:
+        with open(path, "w") as fh:
+            json.dump(self.to_dict(), fh, indent=1)
+        return path
+
+    def summary(self) -> str:
+        """Indented table of the stage tree -- what export_model appends
+        to VALIDATION.txt."""
+        tree = self.to_dict()["stages"]
+        total = tree["total_s"] or 1e-12
+        lines = ["-- Profile (stage timings) --",
+                 f"{'stage':50s} {'calls':>6s} {'total ms':>10s} {'mean ms':>9s} {'%':>6s} "
+                 f"{'peak MB':>8s} {'max faces':>10s}"]
+        running = []
+
+        def walk(node, depth):
+            label = ("  " * depth + node["name"] + (" *" if node.get("running") else ""))[:50]
+            running.extend([node["name"]] if node.get("running") else [])
+            calls = max(node["calls"], 1)
+            mem = f"{node['peak_mb']:8.1f}" if self.memory else f"{'-':>8s}"
+            lines.append(f"{label:50s} {node['calls']:6d} {node['total_s'] * 1e3:10.1f} "
+                         f"{node['total_s'] * 1e3 / calls:9.2f} {100 * node['total_s'] / total:6.1f} "
+                         f"{mem} {node['faces'] or '':>10}")
+            for child in sorted(node["children"], key=lambda c: -c["total_s"]):
+                walk(child, depth + 1)
+
+        walk(tree, 0)
+        if running:
+            lines.append("(* = still running when this table was made)")
+        return "\n".join(lines) + "\n"
+
+
+def _mesh_size(obj):
+    """(faces, vertices) of a trimesh or manifold3d mesh, else None."""
+    if hasattr(obj, "faces") and hasattr(obj, "vertices"):
+        return len(obj.faces), len(obj.vertices)
+    if hasattr(obj, "num_tri") and hasattr(obj, "num_vert"):
+        return obj.num_tri(), obj.num_vert()
+    return None
+
+
+class _Stage:
+    __slots__ = ("profile", "name", "frame", "size")
+
+    def __init__(self, profile: Profile, name: str):
+        self.profile = profile
+        self.name = name
+        self.size = None
+
+    def __enter__(self):
+        self.frame = self.profile._enter(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        self.profile._exit(self.frame, self.size)
+        return False
+
+    def mesh(self, obj) -> None:
+        """Record `obj`'s size (if it's a mesh) against this stage."""
+        size = _mesh_size(obj)
+        if size is not None:
+            self.size = size if self.size is None else (max(self.size[0], size[0]), max(self.size[1], size[1]))
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def mesh(self, obj) -> None:
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name: str):
+    """Context manager timing a block as stage `name` of the running
+    Profile (a shared no-op while none is). `as st` gives st.mesh(m) to
+    record a mesh's size against the stage."""
+    return _NULL_STAGE if _active is None else _Stage(_active, name)
+
+
+def profiled(name: str = None):
+    """Decorator recording every call of a function as a stage (named
+    `module.function` unless `name` is given), with the size of its mesh
+    result -- or of its first argument, if that's the mesh -- attached.
+    Disabled, it adds one call and a global lookup (~0.2 us)."""
+    def decorate(fn):
+        label = name or f"{fn.__module__}.{fn.__name__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return fn(*args, **kwargs)
+            with _Stage(_active, label) as st:
+                out = fn(*args, **kwargs)
+                first = out[0] if isinstance(out, tuple) and out else out
+                st.mesh(first if _mesh_size(first) is not None else (args[0] if args else None))
+            return out
+        return wrapper
+    return decorate
+
+
+def _after_fork() -> None:
+    # A forked pool worker inherits the parent's Profile; drop it rather
+    # than record into a copy nobody reads (and trace its allocations).
+    global _active
+    if _active is not None:
+        if _active._own_trace:
+            tracemalloc.stop()
+        _active = None
+
+
+def _from_environment() -> None:
+    path = os.environ.get("MDA_PROFILE")
+    if not path:
+        return
+    prof = Profile(path, memory=os.environ.get("MDA_PROFILE_MEMORY", "1") != "0").start()
+
+    def finish():
+        prof.stop()
+        prof.save(path)
+    atexit.register(finish)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+_from_environment()
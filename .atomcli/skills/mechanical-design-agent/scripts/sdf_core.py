@@ -39,6 +39,8 @@ import numpy as np
 import trimesh
 from skimage import measure
 
+import profiling
+
 
 class SDFError(RuntimeError):
     pass
@@ -233,6 +235,7 @@ def sdf_from_mesh_proxy(mesh: trimesh.Trimesh):
 # Meshing
 # ---------------------------------------------------------------------------
 
+@profiling.profiled()
 def sdf_to_mesh(sdf_fn, bounds, resolution=0.02, name="sdf_part") -> trimesh.Trimesh:
     """Sample `sdf_fn` on a regular grid spanning `bounds = (lo_xyz,
     hi_xyz)` at `resolution` (grid spacing, same units as the SDF/scene)
@@ -264,9 +267,10 @@ def sdf_to_mesh(sdf_fn, bounds, resolution=0.02, name="sdf_part") -> trimesh.Tri
     xs = np.linspace(lo[0], hi[0], dims[0]) + jitter
     ys = np.linspace(lo[1], hi[1], dims[1]) + jitter * 0.7
     zs = np.linspace(lo[2], hi[2], dims[2]) + jitter * 1.3
-    gx, gy, gz = np.meshgrid(xs, ys, zs, indexing="ij")
-    pts = np.stack([gx.ravel(), gy.ravel(), gz.ravel()], axis=-1)
-    vals = sdf_fn(pts).reshape(dims)
+    with profiling.stage("sample"):
+        gx, gy, gz = np.meshgrid(xs, ys, zs, indexing="ij")
+        pts = np.stack([gx.ravel(), gy.ravel(), gz.ravel()], axis=-1)
+        vals = sdf_fn(pts).reshape(dims)
 
     if vals.min() > 0 or vals.max() < 0:
         raise SDFError(f"'{name}': SDF never crosses zero within bounds "
@@ -274,9 +278,11 @@ def sdf_to_mesh(sdf_fn, bounds, resolution=0.02, name="sdf_part") -> trimesh.Tri
                         "bounds or check the shape is actually centered inside them")
 
     spacing = tuple((hi - lo) / (np.array(dims) - 1))
-    verts, faces, normals, _values = measure.marching_cubes(vals, level=0.0, spacing=spacing)
-    verts = verts + lo
-    mesh = trimesh.Trimesh(vertices=verts, faces=faces, process=True)
+    with profiling.stage("marching_cubes") as st:
+        verts, faces, normals, _values = measure.marching_cubes(vals, level=0.0, spacing=spacing)
+        verts = verts + lo
+        mesh = trimesh.Trimesh(vertices=verts, faces=faces, process=True)
+        st.mesh(mesh)
 
     if not mesh.is_watertight:
         raise SDFError(f"'{name}' meshed to a non-watertight surface "
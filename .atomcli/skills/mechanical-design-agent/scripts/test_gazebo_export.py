@@ -0,0 +1,90 @@
+"""
+test_gazebo_export.py
+=====================
+Checks for gazebo_export that a refactor could quietly break. Run from
+this directory with `python -m pytest test_gazebo_export.py`, or
+`python test_gazebo_export.py`.
+"""
+from __future__ import annotations
+import io
+import xml.dom.minidom as minidom
+import xml.etree.ElementTree as ET
+
+import csg_core as csg
+import kinematics as kin
+import mesh_utils
+import gazebo_export as ge
+
+
+def _minidom_pretty(elem) -> str:
+    """What gazebo_export wrote before its streaming writer: a round trip
+    through minidom."""
+    return minidom.parseString(ET.tostring(elem, encoding="unicode")).toprettyxml(indent="  ")
+
+
+def _streamed(elem) -> str:
+    buf = io.StringIO()
+    ge._write_document(elem, buf)
+    return buf.getvalue()
+
+
+def _arm() -> kin.Assembly:
+    """Base plus two identical (congruent) segments and a gear pair whose
+    plugin has an empty <joint2>."""
+    asm = kin.Assembly("arm & <gears>")
+    asm.add_link(kin.Link("base", csg.to_trimesh(csg.box((0.3, 0.3, 0.05)))), is_root=True)
+    segment = csg.to_trimesh(csg.translate(csg.box((0.04, 0.04, 0.2)), (0, 0, 0.11)))
+    asm.add_link(kin.Link("upper", segment))
+    asm.add_link(kin.Link("lower", segment.copy()))
+    asm.add_joint(kin.Joint("shoulder", "base", "upper", "revolute", origin_xyz=(0, 0, 0.025),
+                            lower=-1.0, upper=1.0))
+    asm.add_joint(kin.Joint("elbow", "upper", "lower", "continuous", origin_xyz=(0, 0, 0.22),
+                            axis=(0, 1, 0)))
+    gear = csg.to_trimesh(csg.cylinder(0.02, 0.05, segments=32))
+    asm.add_link(kin.Link("gear", gear))
+    asm.add_joint(kin.Joint("drive", "base", "gear", "gear", origin_xyz=(0.1, 0.1, 0.05)))
+    return asm
+
+
+def _check(elem) -> None:
+    assert _streamed(elem) == _minidom_pretty(elem)
+
+
+def test_sdf_matches_minidom():
+    asm = _arm()
+    _check(ge._sdf_element(asm, asm.name))
+
+
+def test_sdf_with_proxies_lod_and_shared_meshes_matches_minidom():
+    asm = _arm()
+    shared = ge._shared_meshes(asm)
+    assert shared, "the two segments should share a mesh"
+    proxies = {name: mesh_utils.fit_collision_proxy(link.mesh)
+               for name, link in asm.links.items() if name not in shared}
+    _check(ge._sdf_element(asm, asm.name, proxies, shared, "glb", (1.0, 0.25), 1, {"base": 0.5}))
+
+
+def test_model_config_matches_minidom():
+    _check(ge._model_config_element("rover \"mk2\"", "Wheels & <rockers>: a 6-wheel 'test' rover",
+                                     author="A & B", email="<a@b.c>"))
+
+
+def test_empty_and_mixed_content_match_minidom():
+    root = ET.Element("root", {"b": "2", "xmlns:x": "urn:x", "a": "1 > 0"})
+    ET.SubElement(root, "empty")
+    ET.SubElement(root, "blank").text = ""
+    ET.SubElement(root, "text").text = "a < b & c"
+    root.text = "lead"
+    mixed = ET.SubElement(root, "mixed")
+    mixed.text = "before"
+    ET.SubElement(mixed, "inner").text = "x"
+    mixed[0].tail = "after"
+    mixed.tail = "tail"
+    _check(root)
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_"):
+            fn()
+    print("ok")
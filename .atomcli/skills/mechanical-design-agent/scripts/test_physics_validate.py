@@ -0,0 +1,99 @@
+"""
+test_physics_validate.py
+========================
+Checks for physics_validate that a refactor could quietly break. Run from
+this directory with `python -m pytest test_physics_validate.py`, or
+`python test_physics_validate.py`.
+"""
+from __future__ import annotations
+import numpy as np
+
+import csg_core as csg
+import sdf_core as sdf
+import kinematics as kin
+import physics_validate as pv
+
+
+def _thin_plate_assembly(thickness: float = 0.0015, at_deg: float = 45.0) -> kin.Assembly:
+    """An arm sweeping 0..90 deg about z into a `thickness`-thick radial
+    plate standing at `at_deg` -- thin enough for a coarse fixed sweep to
+    step straight over the moment of first contact."""
+    asm = kin.Assembly("thin_plate")
+    asm.add_link(kin.Link("base", csg.to_trimesh(csg.translate(csg.box((0.04, 0.04, 0.02)), (0, 0, -0.03)))),
+                 is_root=True)
+    arm = sdf.sdf_to_mesh(sdf.sd_capsule((0.04, 0, 0.05), (0.27, 0, 0.05), 0.012),
+                          ((0.0, -0.03, 0.02), (0.3, 0.03, 0.08)), 0.004)
+    asm.add_link(kin.Link("arm", arm))
+    asm.add_joint(kin.Joint("swing", "base", "arm", "revolute", axis=(0, 0, 1),
+                            lower=0.0, upper=np.radians(90.0)))
+    plate = csg.rotate(csg.translate(csg.box((0.2, thickness, 0.1)), (0.15, 0, 0.05)), (0, 0, at_deg))
+    asm.add_link(kin.Link("plate", csg.to_trimesh(plate)))
+    asm.add_joint(kin.Joint("bolt", "base", "plate", "fixed"))
+    return asm
+
+
+def test_adaptive_first_contact_matches_dense_sweep():
+    asm = _thin_plate_assembly()
+    resolution = 1e-3
+    result = pv.sweep_test(asm, "swing", adaptive=True, resolution=resolution)
+    assert result.first_contact_at is not None
+
+    def touching(v):
+        return pv.sweep_test(asm, "swing", n_steps=1, angle_range_deg=(v, v)).worst_penetration_fraction > 0
+
+    dense = np.arange(0.0, 90.0 + 1e-9, 0.1)
+    dense_first = next(v for v in dense if touching(v))
+    # No pose of the dense sweep is in contact before the reported value,
+    # the reported value is in contact, and it's within `resolution` of
+    # the last free pose.
+    assert result.first_contact_at <= dense_first + 1e-9
+    assert touching(result.first_contact_at)
+    assert not touching(result.first_contact_at - resolution)
+
+    fixed = pv.sweep_test(asm, "swing", n_steps=13)
+    assert result.first_contact_at <= fixed.worst_at_deg
+
+
+def _slider_assembly(wall_x: float) -> kin.Assembly:
+    """A block sliding 0..0.6 m along x from a base, and a wall across its
+    path at `wall_x`."""
+    asm = kin.Assembly("slider")
+    asm.add_link(kin.Link("base", csg.to_trimesh(csg.translate(csg.box((0.2, 0.2, 0.05)), (0, 0, -0.1)))),
+                 is_root=True)
+    asm.add_link(kin.Link("block", csg.to_trimesh(csg.box((0.1, 0.1, 0.1)))))
+    asm.add_joint(kin.Joint("rail", "base", "block", "prismatic", axis=(1, 0, 0), lower=0.0, upper=0.6))
+    asm.add_link(kin.Link("wall", csg.to_trimesh(csg.box((0.05, 0.4, 0.4)))))
+    asm.add_joint(kin.Joint("bolt", "base", "wall", "fixed", origin_xyz=(wall_x, 0, 0)))
+    return asm
+
+
+def test_cached_prismatic_sweep_sees_partner_moved_into_travel(tmp_path):
+    cache_path = str(tmp_path / "validation_cache.json")
+    assert pv.validate(_slider_assembly(1.5), cache_path=cache_path).passed
+    moved = _slider_assembly(0.4)
+    cached = pv.validate(moved, cache_path=cache_path)
+    fresh = pv.validate(moved)
+    assert not fresh.passed
+    assert cached.report == fresh.report
+
+
+def test_cached_sweep_lists_current_partners(tmp_path):
+    cache_path = str(tmp_path / "validation_cache.json")
+    asm = _slider_assembly(1.5)
+    pv.validate(asm, cache_path=cache_path)
+    asm.add_link(kin.Link("far", csg.to_trimesh(csg.box((0.1, 0.1, 0.1)))))
+    asm.add_joint(kin.Joint("far_bolt", "base", "far", "fixed", origin_xyz=(0, 5.0, 0)))
+    cache = pv.ValidationCache(asm, cache_path, {}, None)
+    sweeps = cache.reusable(pv._clearance_pairs(asm), ["rail"])[2]
+    assert sweeps["rail"].checked_against == ["base", "wall", "far"]
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_adaptive_first_contact_matches_dense_sweep()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_cached_prismatic_sweep_sees_partner_moved_into_travel(pathlib.Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_cached_sweep_lists_current_partners(pathlib.Path(tmp))
+    print("ok")